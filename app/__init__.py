@@ -6,7 +6,15 @@ from flask import Flask
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
 from .domain.services.auth_service import AuthService
+from .domain.services.password_hasher import set_password_hasher
 from .infrastructure.database import db
+from .infrastructure.database.metrics import install_commit_counter
+from .infrastructure.database.profiles import apply_database_profile, install_profile_events
+from .infrastructure.database.routing import REPLICA_ENGINE_KEY, create_replica_session
+from .infrastructure.database.types import configure_user_id_storage
+from .infrastructure.repositories.caching_user_repository import clear_identity_map
+from .api.auth import clear_request_auth
+from .api.json_provider import create_json_provider
 from .container import Container
 
 # グローバルなインスタンスを作成
@@ -22,13 +30,51 @@ def create_app(test_config=None):
         SECRET_KEY='dev',
         SQLALCHEMY_DATABASE_URI='sqlite:///app.db',
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TOKEN_REVOCATION_STORE='memory',
+        PASSWORD_HASH_WORKERS=0,
+        PASSWORD_HASH_ALGORITHM='scrypt',
+        PASSWORD_HASH_COST=None,
+        RATE_LIMIT_ENABLED=True,
+        DB_METRICS_HEADER=False,
+        USER_CACHE_TTL_SECONDS=0,
+        SQLALCHEMY_REPLICA_URI=None,
+        # 'production' の場合はSQLiteのWALなどのPRAGMAと接続プールの設定を行う
+        DATABASE_PROFILE='default',
+        # 'imperative' の場合は orm.start_mappers で User エンティティを直接マッピングして読み込む
+        USER_REPOSITORY_MAPPING='declarative',
+        # 'memory' の場合はユーザーをデータベースではなくプロセス内のストアに保存する（テスト・ベンチマーク用）
+        USER_REPOSITORY='sqlalchemy',
+        # 'binary' の場合はユーザーIDを16バイトで保存する（既存の行は `flask users convert-ids binary` で変換する）
+        USER_ID_STORAGE='string',
+        # 'outbox' の場合、確認メールはアウトボックスに書き込み `flask outbox dispatch` で送信する
+        # （'direct' の場合は登録の処理中に送信する）
+        EMAIL_DELIVERY='outbox',
+        OUTBOX_BATCH_SIZE=100,
+        OUTBOX_MAX_ATTEMPTS=5,
+        OUTBOX_BACKOFF_SECONDS=30.0,
+        OUTBOX_MAX_BACKOFF_SECONDS=3600.0,
+        # 取り出したメッセージを他のディスパッチャーが取り出さない秒数（送信が途中で止まった場合の再送までの時間）
+        OUTBOX_LEASE_SECONDS=300.0,
+        # 'smtp' の場合は SMTP_HOST への接続をプールして送信する（'console' は標準出力に表示）
+        EMAIL_SENDER='console',
+        SMTP_HOST='localhost',
+        SMTP_PORT=25,
+        SMTP_POOL_SIZE=4,
+        SMTP_BATCH_SIZE=50,
+        MAIL_FROM='no-reply@example.com',
+        # レスポンスのJSONの変換（'auto' は orjson がインストールされていれば orjson を使う）
+        JSON_PROVIDER='auto',
     )
 
     if test_config is not None:
         # テスト用の設定で上書き
         app.config.update(test_config)
 
+    # JSONプロバイダーの設定
+    app.json = create_json_provider(app)
+
     # 拡張機能の初期化
+    apply_database_profile(app)
     db.init_app(app)
     migrate.init_app(app, db)
 
@@ -36,12 +82,44 @@ def create_app(test_config=None):
     if not app.config.get('TESTING', False):
         csrf.init_app(app)
 
+    # コミット数の計測
+    install_commit_counter(app, db.session)
+
+    # リクエストごとのユーザーの識別子マップを破棄
+    app.teardown_request(clear_identity_map)
+    # リクエストごとの認証結果を破棄
+    app.teardown_request(clear_request_auth)
+
     with app.app_context():
+        # 読み取り用レプリカのセッションと、接続ごとのPRAGMAの設定
+        read_session = create_replica_session(app)
+        install_profile_events(app, db.engine)
+        configure_user_id_storage(db.engine, app.config['USER_ID_STORAGE'])
+        if read_session is not None:
+            install_profile_events(app, app.extensions[REPLICA_ENGINE_KEY])
+            configure_user_id_storage(app.extensions[REPLICA_ENGINE_KEY], app.config['USER_ID_STORAGE'])
+
         # コンテナの初期化
-        app.container = Container(db.session)
+        app.container = Container(db.session, app.config, read_session=read_session)
+
+        # パスワードハッシュ化サービスの設定
+        set_password_hasher(app.container.password_hasher())
 
         # 認証サービスの初期化
-        app.auth_service = AuthService(user_repository=app.container.user_repository())
+        app.auth_service = AuthService(
+            user_repository=app.container.user_repository(),
+            revocation_store=app.container.token_revocation_store(),
+            token_cache=app.container.verified_token_cache(),
+            security_versions=app.container.security_version_registry(),
+            rehash_executor=app.container.password_rehash_executor()
+        )
+
+        # レートリミッターの初期化
+        app.rate_limiter = app.container.rate_limiter()
+
+        # CLIコマンドの登録
+        from .cli import register_commands
+        register_commands(app)
 
         # Blueprintの登録
         from .api.routes import user_routes, auth_routes, admin_routes
@@ -0,0 +1,90 @@
+"""
+認証のデコレーター
+"""
+from dataclasses import dataclass
+from functools import wraps
+from http import HTTPStatus
+from typing import Optional
+from flask import current_app, g, jsonify, request
+
+from ..domain.exceptions import AuthenticationError, ValidationError
+from ..domain.value_objects.auth_token import AuthToken
+from ..domain.value_objects.principal import Principal
+from ..domain.value_objects.role import RoleType
+
+# 管理者向けのエンドポイントで許可するロール
+ADMIN_ROLES = (RoleType.SUPER_ADMIN, RoleType.ADMIN)
+
+
+@dataclass(frozen=True)
+class RequestAuth:
+    """リクエストの認証結果"""
+    token: AuthToken
+    # 署名を検証済みのペイロード（失効の登録などで再びデコードしない）
+    claims: dict
+    principal: Principal
+
+
+def authenticate_request() -> RequestAuth:
+    """
+    Authorizationヘッダーのトークンを検証し、結果を g に保持する
+
+    同じリクエストで2回目以降に呼び出した場合は保持した結果を返し、ヘッダーの解析と署名の検証を繰り返さない
+
+    Raises:
+        AuthenticationError: トークンがない、または無効な場合
+    """
+    auth = g.get('auth')
+    if auth is not None:
+        return auth
+
+    auth_header = request.headers.get('Authorization', '')
+    scheme, _, value = auth_header.partition(' ')
+    if scheme != 'Bearer' or not value:
+        raise AuthenticationError("認証が必要です")
+
+    token = AuthToken(value.strip())
+    try:
+        principal, claims = current_app.auth_service.verify_claims(token)
+    except ValidationError as e:
+        raise AuthenticationError(str(e))
+    g.auth = RequestAuth(token=token, claims=claims, principal=principal)
+    return g.auth
+
+
+def clear_request_auth(exc=None) -> None:
+    """
+    リクエストの終了時に認証結果を破棄する
+
+    既にアプリケーションコンテキストがある場合（テストやCLI）、g はリクエストをまたいで共有されるため
+    """
+    g.pop('auth', None)
+
+
+def current_auth() -> Optional[RequestAuth]:
+    """このリクエストの認証結果（require_auth を通っていない場合はNone）"""
+    return g.get('auth')
+
+
+def require_auth(*roles: RoleType):
+    """
+    認証を必須にするデコレーター
+
+    トークンがない・無効な場合は401、roles を指定した場合にいずれのロールでもない場合は403で拒否する。
+    ビューでは current_auth() で Principal と検証済みのクレームを取得できる
+
+    Args:
+        roles: 許可するロール（省略時は認証済みであればよい）
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            try:
+                auth = authenticate_request()
+            except AuthenticationError as e:
+                return jsonify({'error': str(e)}), HTTPStatus.UNAUTHORIZED
+            if roles and auth.principal.role.role_type not in roles:
+                return jsonify({'error': '権限がありません'}), HTTPStatus.FORBIDDEN
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
@@ -0,0 +1,83 @@
+"""
+FlaskのJSONプロバイダー
+"""
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+# JSON_PROVIDER に指定できる値
+#   default: Flask標準（json モジュール）
+#   orjson: orjson で変換する（orjson パッケージが必要）
+#   auto: orjson がインストールされていれば orjson、なければ default
+JSON_PROVIDERS = ('default', 'orjson', 'auto')
+
+
+def _import_orjson():
+    """orjsonを遅延インポート"""
+    try:
+        import orjson
+    except ImportError as e:
+        raise RuntimeError("JSON_PROVIDER='orjson' を使用するには orjson パッケージが必要です") from e
+    return orjson
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    orjson でレスポンスを変換するJSONプロバイダー
+
+    キーの並べ替え・日時の書式（default によるHTTP日付）・デバッグ時のインデントは Flask 標準に合わせる。
+    orjson は非ASCII文字をエスケープしないため、日本語はUTF-8のまま出力される。
+    orjson が対応しない引数（separators 以外の json.dumps の引数）が指定された場合は標準の変換を使う
+    """
+
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        self._orjson = _import_orjson()
+
+    def _option(self, indent: bool = False) -> int:
+        """orjson のオプション"""
+        orjson = self._orjson
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        indent = kwargs.pop('indent', None)
+        kwargs.pop('separators', None)
+        if kwargs or indent not in (None, 2):
+            return super().dumps(obj, indent=indent, **kwargs)
+        return self._orjson.dumps(obj, default=self.default, option=self._option(indent == 2)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._orjson.dumps(obj, default=self.default, option=self._option(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def create_json_provider(app: Flask) -> JSONProvider:
+    """
+    JSON_PROVIDER に応じたJSONプロバイダーを作成
+
+    Raises:
+        ValueError: 未対応の値の場合
+        RuntimeError: 'orjson' で orjson がインストールされていない場合
+    """
+    name = app.config.get('JSON_PROVIDER', 'default')
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"未対応のJSONプロバイダーです: {name}")
+    if name == 'auto':
+        try:
+            return OrjsonJSONProvider(app)
+        except RuntimeError:
+            return DefaultJSONProvider(app)
+    if name == 'orjson':
+        return OrjsonJSONProvider(app)
+    return DefaultJSONProvider(app)
@@ -0,0 +1,38 @@
+"""
+レート制限のデコレーター
+"""
+import math
+from functools import wraps
+from http import HTTPStatus
+from flask import current_app, jsonify, request
+
+
+def rate_limit(scope: str):
+    """
+    IPアドレスとリクエストボディのメールアドレスでレート制限するデコレーター
+
+    リポジトリやパスワードのハッシュ化よりも前に判定し、超過した要求は429で拒否する
+
+    Args:
+        scope: 制限の単位（バケットのキーの接頭辞）
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            limiter = current_app.rate_limiter
+            if limiter is not None:
+                data = request.get_json(silent=True)
+                email = data.get('email') if isinstance(data, dict) else None
+                wait = limiter.check(
+                    scope,
+                    request.remote_addr,
+                    email if isinstance(email, str) else None
+                )
+                if wait > 0:
+                    retry_after = str(max(1, math.ceil(min(wait, 3600))))
+                    return jsonify({
+                        'error': 'リクエストが多すぎます。しばらくしてから再度お試しください'
+                    }), HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': retry_after}
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
@@ -1,26 +1,41 @@
 """
 管理者関連のルートハン�ラ
 """
-from flask import Blueprint, jsonify, request, current_app
+import base64
+import json
+from datetime import datetime
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from http import HTTPStatus
 from ...application.usecases.super_admin_registration import (
     SuperAdminRegistrationUseCase,
     SuperAdminRegistrationRequest
 )
+from ...application.usecases.admin_registration import (
+    AdminRegistrationUseCase,
+    AdminRegistrationRequest
+)
 from ...application.usecases.super_admin_login import (
     SuperAdminLoginUseCase,
     SuperAdminLoginRequest
 )
+from ...domain.entities.user import User
+from ...domain.read_models.user_summary import UserSummary
+from ...domain.value_objects.role import RoleType
+from ...infrastructure.services.user_records import FORMATS, MIMETYPES, write_user_records
+from ..auth import ADMIN_ROLES, current_auth, require_auth
+from ..rate_limit import rate_limit
+from ..serializers import parse_fields, serialize, serialize_many
 from ...domain.exceptions import (
     UserAlreadyExistsError,
     ValidationError,
-    AuthenticationError,
-    UnauthorizedError
+    UnauthorizedError,
+    ServiceUnavailableError
 )
 
 bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
 @bp.route('/super-admin/register', methods=['POST'])
+@rate_limit('admin.super_admin_register')
 def register_super_admin():
     """スーパー管理者登録エンドポイント"""
     try:
@@ -33,9 +48,11 @@ def register_super_admin():
             }), HTTPStatus.BAD_REQUEST
 
         # ユースケースの実行
+        unit_of_work = current_app.container.unit_of_work()
         usecase = SuperAdminRegistrationUseCase(
-            user_repository=current_app.container.user_repository(),
-            email_service=current_app.container.email_service()
+            user_repository=unit_of_work.users,
+            email_service=current_app.container.email_service(),
+            unit_of_work=unit_of_work
         )
         
         user = usecase.execute(
@@ -48,13 +65,7 @@ def register_super_admin():
         
         return jsonify({
             'message': 'スーパー管理者を登録しました',
-            'user': {
-                'id': user.id,
-                'email': str(user.email),
-                'name': user.name,
-                'role': user.role.role_type.value,
-                'is_active': user.is_active
-            }
+            'user': serialize(user)
         }), HTTPStatus.CREATED
         
     except UserAlreadyExistsError as e:
@@ -65,6 +76,10 @@ def register_super_admin():
         return jsonify({
             'error': str(e)
         }), HTTPStatus.BAD_REQUEST
+    except ServiceUnavailableError as e:
+        return jsonify({
+            'error': str(e)
+        }), HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"スーパー管理者登録中にエラーが発生しました: {str(e)}")
         return jsonify({
@@ -72,47 +87,220 @@ def register_super_admin():
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 @bp.route('/admin/register', methods=['POST'])
+@rate_limit('admin.admin_register')
+@require_auth(RoleType.SUPER_ADMIN)
 def register_admin():
-    """管理者登録エンドポイント"""
+    """管理者登録エンドポイント（スーパー管理者のみ）"""
     try:
-        # 認証チェック
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': '認証が必要です'}), HTTPStatus.UNAUTHORIZED
-            
-        token = auth_header.split(' ')[1]
-        
-        # スーパー管理者の認証
-        current_user = current_app.auth_service.verify_token(token)
-        
-        if not current_user.is_super_admin():
-            return jsonify({'error': '権限がありません'}), HTTPStatus.FORBIDDEN
-        
-        # 管理者登録
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not _has_admin_fields(data):
+            return jsonify({'error': '必須フィールドが不足しています'}), HTTPStatus.BAD_REQUEST
+
+        # 権限は検証済みのトークンのクレームで判定し、ユーザー行は読み込まない
+        unit_of_work = current_app.container.unit_of_work()
         usecase = AdminRegistrationUseCase(
-            user_repository=current_app.container.user_repository()
+            user_repository=unit_of_work.users,
+            unit_of_work=unit_of_work
         )
-        
-        user = usecase.execute(AdminRegistrationRequest(
-            email=data['email'],
-            password=data['password'],
-            name=data['name']
-        ))
-        
+        user = usecase.execute(_admin_request(data), requested_by=current_auth().principal)
+
         return jsonify({
             'message': '管理者を登録しました',
-            'user': {
-                'id': user.id,
-                'email': user.email.value,
-                'name': user.name,
-                'role': user.role.role_type.value,
-                'is_active': user.is_active
-            }
+            'user': serialize(user)
         }), HTTPStatus.CREATED
-        
-    except ValueError as e:
+
+    except UserAlreadyExistsError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.CONFLICT
+    except ValidationError as e:
         return jsonify({'error': str(e)}), HTTPStatus.BAD_REQUEST
+    except UnauthorizedError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.FORBIDDEN
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"管理者登録中にエラーが発生しました: {str(e)}")
-        return jsonify({'error': '予期せぬエラーが発生しました'}), HTTPStatus.INTERNAL_SERVER_ERROR 
\ No newline at end of file
+        return jsonify({'error': '予期せぬエラーが発生しました'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+# 一括登録の1リクエストあたりの上限
+MAX_BULK_ADMINS = 100
+
+@bp.route('/admin/register/bulk', methods=['POST'])
+@rate_limit('admin.admin_register_bulk')
+@require_auth(RoleType.SUPER_ADMIN)
+def register_admins():
+    """
+    管理者一括登録エンドポイント（スーパー管理者のみ）
+
+    {"admins": [{"email": ..., "password": ..., "name": ...}, ...]} を1つのトランザクションで登録する。
+    1件でも不正・重複があれば1件も登録しない
+    """
+    try:
+        data = request.get_json(silent=True)
+        admins = data.get('admins') if isinstance(data, dict) else None
+        if not isinstance(admins, list) or not admins or not all(_has_admin_fields(item) for item in admins):
+            return jsonify({'error': '必須フィールドが不足しています'}), HTTPStatus.BAD_REQUEST
+        if len(admins) > MAX_BULK_ADMINS:
+            raise ValidationError(f"一度に登録できる管理者は{MAX_BULK_ADMINS}件までです")
+
+        unit_of_work = current_app.container.unit_of_work()
+        usecase = AdminRegistrationUseCase(
+            user_repository=unit_of_work.users,
+            unit_of_work=unit_of_work,
+            password_hasher=current_app.container.password_hasher()
+        )
+        users = usecase.execute_many(
+            [_admin_request(item) for item in admins], requested_by=current_auth().principal
+        )
+
+        return jsonify({
+            'message': f'{len(users)}件の管理者を登録しました',
+            'users': serialize_many(users, User)
+        }), HTTPStatus.CREATED
+
+    except UserAlreadyExistsError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.CONFLICT
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.BAD_REQUEST
+    except UnauthorizedError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.FORBIDDEN
+    except ServiceUnavailableError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'}
+    except Exception as e:
+        current_app.logger.error(f"管理者一括登録中にエラーが発生しました: {str(e)}")
+        return jsonify({'error': '予期せぬエラーが発生しました'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+def _has_admin_fields(data):
+    """管理者登録に必要な項目が文字列で揃っているかどうか"""
+    return isinstance(data, dict) and all(
+        isinstance(data.get(field), str) for field in ('email', 'password', 'name')
+    )
+
+def _admin_request(data):
+    """リクエストの項目から管理者登録リクエストを生成"""
+    return AdminRegistrationRequest(email=data['email'], password=data['password'], name=data['name'])
+
+# 一覧の1ページあたりの件数の既定値と上限
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+@bp.route('/users', methods=['GET'])
+@require_auth(*ADMIN_ROLES)
+def list_users():
+    """
+    ユーザー一覧エンドポイント（作成日時の新しい順）
+
+    クエリパラメーター:
+        limit: 1ページの件数（既定50、最大200）
+        cursor: 前のページの next_cursor
+        role: 絞り込むロール
+        is_active: 'true' または 'false'
+        fields: 含める項目（カンマ区切り。既定はすべて）
+    """
+    try:
+        role, is_active = _parse_user_filters(request.args)
+        limit = request.args.get('limit', str(DEFAULT_PAGE_SIZE))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+            raise ValidationError(f"limitには1から{MAX_PAGE_SIZE}の整数を指定してください")
+        after = None
+        if request.args.get('cursor'):
+            after = _decode_cursor(request.args['cursor'])
+
+        page = current_app.container.user_repository().list_page(
+            role=role, is_active=is_active, limit=int(limit), after=after
+        )
+        return jsonify({
+            'users': serialize_many(page.items, UserSummary, fields=parse_fields(request.args.get('fields'))),
+            'next_cursor': _encode_cursor(page.next_key) if page.next_key else None
+        }), HTTPStatus.OK
+
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"ユーザー一覧の取得中にエラーが発生しました: {str(e)}")
+        return jsonify({'error': '予期せぬエラーが発生しました'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@bp.route('/cache-stats', methods=['GET'])
+@require_auth(*ADMIN_ROLES)
+def cache_stats():
+    """このプロセスのキャッシュのヒット率を取得するエンドポイント"""
+    token_cache = current_app.container.verified_token_cache()
+    return jsonify({
+        'user_cache': current_app.container.user_cache_stats().snapshot(),
+        'token_cache': token_cache.stats() if token_cache else None
+    }), HTTPStatus.OK
+
+@bp.route('/users/export', methods=['GET'])
+@require_auth(*ADMIN_ROLES)
+def export_users():
+    """
+    ユーザーエクスポートエンドポイント
+
+    クエリパラメーター:
+        format: 'ndjson'（既定）または 'csv'
+        role: 絞り込むロール
+        is_active: 'true' または 'false'
+    """
+    try:
+        file_format = request.args.get('format', 'ndjson')
+        if file_format not in FORMATS:
+            raise ValidationError("formatには csv または ndjson を指定してください")
+        role, is_active = _parse_user_filters(request.args)
+
+        # 1行ずつ取り出しながら書き出すため、件数によらずメモリ使用量は一定
+        summaries = current_app.container.user_repository().iter_summaries(
+            role=role, is_active=is_active
+        )
+        return Response(
+            stream_with_context(write_user_records(summaries, file_format)),
+            mimetype=MIMETYPES[file_format],
+            headers={'Content-Disposition': f'attachment; filename=users.{file_format}'}
+        )
+
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"ユーザーのエクスポート中にエラーが発生しました: {str(e)}")
+        return jsonify({'error': '予期せぬエラーが発生しました'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+def _parse_user_filters(args):
+    """
+    ユーザーの絞り込み条件をクエリパラメーターから取得
+
+    Returns:
+        tuple: (ロール, 有効状態)。指定がない条件はNone
+
+    Raises:
+        ValidationError: 値が不正な場合
+    """
+    role = None
+    if args.get('role'):
+        try:
+            role = RoleType(args['role'])
+        except ValueError:
+            raise ValidationError("無効なロールです")
+    is_active = None
+    if args.get('is_active'):
+        if args['is_active'] not in ('true', 'false'):
+            raise ValidationError("is_activeには true または false を指定してください")
+        is_active = args['is_active'] == 'true'
+    return role, is_active
+
+def _encode_cursor(key):
+    """(created_at, id) をURLに含められる不透明なカーソル文字列に変換"""
+    created_at, user_id = key
+    raw = json.dumps([created_at.isoformat(), user_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor):
+    """
+    カーソル文字列を (created_at, id) に戻す
+
+    Raises:
+        ValidationError: カーソルが不正な場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(user_id)
+    except (ValueError, TypeError):
+        raise ValidationError("無効なカーソルです")
@@ -12,13 +12,22 @@ from ...application.usecases.user_registration import UserRegistrationUseCase, U
 from ...application.usecases.user_login import UserLoginUseCase, LoginRequest
 from ...application.usecases.user_logout import UserLogoutUseCase, LogoutRequest
 from ...domain.services.auth_service import AuthService
+from ..auth import current_auth, require_auth
+from ..rate_limit import rate_limit
+from ..serializers import serialize
 from ...domain.value_objects.email import Email
 from ...domain.value_objects.auth_token import AuthToken
-from ...domain.exceptions import UserAlreadyExistsError, ValidationError, AuthenticationError
+from ...domain.exceptions import (
+    UserAlreadyExistsError,
+    ValidationError,
+    AuthenticationError,
+    ServiceUnavailableError
+)
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 @bp.route('/register', methods=['POST'])
+@rate_limit('auth.register')
 def register():
     """ユーザー登録エンドポイント"""
     try:
@@ -31,9 +40,11 @@ def register():
             }), HTTPStatus.BAD_REQUEST
 
         # ユースケースの実行
+        unit_of_work = current_app.container.unit_of_work()
         usecase = UserRegistrationUseCase(
-            user_repository=current_app.container.user_repository(),
-            email_service=current_app.container.email_service()
+            user_repository=unit_of_work.users,
+            email_service=current_app.container.email_service(),
+            unit_of_work=unit_of_work
         )
         
         user = usecase.execute(
@@ -45,17 +56,12 @@ def register():
         )
 
         # トークンの生成
-        token = AuthToken.create(user.id, current_app.config['SECRET_KEY'])
+        token = current_app.auth_service.generate_token(user)
 
         return jsonify({
             'message': 'ユーザー登録が完了しました',
             'token': str(token),
-            'user': {
-                'id': user.id,
-                'email': str(user.email),
-                'name': user.name,
-                'role': user.role.role_type.value
-            }
+            'user': serialize(user)
         }), HTTPStatus.CREATED
         
     except UserAlreadyExistsError as e:
@@ -66,6 +72,10 @@ def register():
         return jsonify({
             'error': str(e)
         }), HTTPStatus.BAD_REQUEST
+    except ServiceUnavailableError as e:
+        return jsonify({
+            'error': str(e)
+        }), HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"ユーザー登録中にエラーが発生しました: {str(e)}")
         return jsonify({
@@ -73,6 +83,7 @@ def register():
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 @bp.route('/login', methods=['POST'])
+@rate_limit('auth.login')
 def login():
     """ログインエンドポイント"""
     try:
@@ -99,18 +110,17 @@ def login():
         return jsonify({
             'message': 'ログインに成功しました',
             'token': str(result.token),
-            'user': {
-                'id': result.user.id,
-                'email': str(result.user.email),
-                'name': result.user.name,
-                'role': result.user.role.role_type.value
-            }
+            'user': serialize(result.user)
         }), HTTPStatus.OK
         
     except AuthenticationError as e:
         return jsonify({
             'error': str(e)
         }), HTTPStatus.UNAUTHORIZED
+    except ServiceUnavailableError as e:
+        return jsonify({
+            'error': str(e)
+        }), HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"ログイン中にエラーが発生しました: {str(e)}")
         return jsonify({
@@ -118,28 +128,19 @@ def login():
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 @bp.route('/logout', methods=['POST'])
+@require_auth()
 def logout():
     """ログアウトエンドポイント"""
     try:
-        # トークンの取得
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({
-                'error': '認証トークンが必要です'
-            }), HTTPStatus.UNAUTHORIZED
-        
-        token = auth_header.split(' ')[1]
-        auth_token = AuthToken(token)
-        
-        # トークンの検証
-        current_app.auth_service.verify_token(auth_token)
+        # 認証時に検証したトークンとクレームをそのまま使い、再びデコードしない
+        auth = current_auth()
         
         # ユースケースの実行
         usecase = UserLogoutUseCase(
             auth_service=current_app.auth_service
         )
         
-        usecase.execute(LogoutRequest(token=auth_token))
+        usecase.execute(LogoutRequest(token=auth.token, claims=auth.claims))
         
         return jsonify({
             'message': 'ログアウトに成功しました'
@@ -153,6 +154,10 @@ def logout():
         return jsonify({
             'error': str(e)
         }), HTTPStatus.UNAUTHORIZED
+    except ServiceUnavailableError as e:
+        return jsonify({
+            'error': str(e)
+        }), HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"ログアウト中にエラーが発生しました: {str(e)}")
         return jsonify({
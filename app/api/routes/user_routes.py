@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app
 from http import HTTPStatus
 from ...application.usecases.user_registration import UserRegistrationUseCase
+from ..serializers import serialize
 
 bp = Blueprint("user", __name__, url_prefix="/api/users")
 
@@ -26,11 +27,7 @@ def register():
         return (
             jsonify({
                 "message": "ユーザー登録が完了しました。確認メールをご確認ください。",
-                "user": {
-                    "id": user.id,
-                    "email": user.email.value,
-                    "name": user.name,
-                }
+                "user": serialize(user),
             }),
             HTTPStatus.CREATED,
         )
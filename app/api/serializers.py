@@ -0,0 +1,181 @@
+"""
+APIレスポンスのシリアライザー
+
+エンティティ・読み取りモデルの型ごとにレスポンスの項目を宣言し、辞書への変換はここに集約する
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..domain.entities.user import User
+from ..domain.exceptions import ValidationError
+from ..domain.read_models.user_summary import UserSummary
+
+
+@dataclass(frozen=True)
+class Field:
+    """レスポンスの1項目"""
+    name: str
+    # 値を取り出す属性のパス（'email.value' のようにドットで区切る）
+    path: str
+    # 取り出した値の変換（Noneの場合はそのまま）
+    convert: Optional[Callable[[Any], Any]] = None
+
+    def __post_init__(self):
+        """初期化後の検証（パスは生成するコードにそのまま埋め込むため、識別子に限る）"""
+        if not all(part.isidentifier() for part in self.path.split('.')):
+            raise ValueError(f"属性のパスが不正です: {self.path}")
+
+
+class Serializer:
+    """
+    オブジェクトをJSONに変換できる辞書にするシリアライザー
+
+    項目の組み合わせ（?fields= の指定）ごとに、属性を取り出して辞書を作る関数を初回に1度だけ生成し、
+    以降は項目の定義をたどらずにその関数を呼び出す
+    """
+
+    def __init__(self, fields: Sequence[Field], default_fields: Optional[Sequence[str]] = None):
+        """
+        初期化
+
+        Args:
+            fields: 指定できるすべての項目（レスポンスでの順）
+            default_fields: 項目の指定がない場合の項目（省略時はすべて）
+        """
+        self.fields = {field.name: field for field in fields}
+        self.default_fields = self._normalize(default_fields) if default_fields else tuple(self.fields)
+        self._plans: Dict[Tuple[str, ...], Callable[[Any], dict]] = {}
+
+    def plan(self, fields: Optional[Iterable[str]] = None) -> Callable[[Any], dict]:
+        """
+        指定した項目の辞書を作る関数を取得
+
+        Args:
+            fields: 含める項目（Noneの場合は既定の項目）
+
+        Raises:
+            ValidationError: 指定できない項目が含まれる場合
+        """
+        names = self.default_fields if fields is None else self._normalize(fields)
+        plan = self._plans.get(names)
+        if plan is None:
+            plan = self._plans[names] = _compile([self.fields[name] for name in names])
+        return plan
+
+    def dump(self, obj: Any, fields: Optional[Iterable[str]] = None) -> dict:
+        """1件を辞書に変換"""
+        return self.plan(fields)(obj)
+
+    def dump_many(self, objs: Iterable[Any], fields: Optional[Iterable[str]] = None) -> List[dict]:
+        """複数件を辞書のリストに変換"""
+        plan = self.plan(fields)
+        return [plan(obj) for obj in objs]
+
+    def _normalize(self, fields: Iterable[str]) -> Tuple[str, ...]:
+        """指定された項目を検証し、宣言の順に並べる（同じ組み合わせで同じ関数を使うため）"""
+        requested = set(fields)
+        unknown = requested - self.fields.keys()
+        if unknown:
+            raise ValidationError(f"指定できないフィールドです: {', '.join(sorted(unknown))}")
+        return tuple(name for name in self.fields if name in requested)
+
+
+def _compile(fields: Sequence[Field]) -> Callable[[Any], dict]:
+    """項目の一覧から、辞書リテラル1つで辞書を作る関数を生成"""
+    namespace: Dict[str, Any] = {}
+    items = []
+    for index, field in enumerate(fields):
+        expression = f"obj.{field.path}"
+        if field.convert is not None:
+            namespace[f"convert{index}"] = field.convert
+            expression = f"convert{index}({expression})"
+        items.append(f"{field.name!r}: {expression}")
+    source = f"def dump(obj):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<serializer {','.join(field.name for field in fields)}>", 'exec'), namespace)
+    return namespace['dump']
+
+
+_serializers: Dict[type, Serializer] = {}
+
+
+def register_serializer(cls: type, serializer: Serializer) -> None:
+    """型のシリアライザーを登録"""
+    _serializers[cls] = serializer
+
+
+def serializer_for(cls: type) -> Serializer:
+    """
+    型のシリアライザーを取得（未登録の場合は基底クラスのもの）
+
+    Raises:
+        LookupError: 基底クラスを含めて登録されていない場合
+    """
+    for base in cls.__mro__:
+        serializer = _serializers.get(base)
+        if serializer is not None:
+            return serializer
+    raise LookupError(f"シリアライザーが登録されていません: {cls.__name__}")
+
+
+def serialize(obj: Any, fields: Optional[Iterable[str]] = None) -> dict:
+    """オブジェクトを型に応じたシリアライザーで辞書に変換"""
+    return serializer_for(type(obj)).dump(obj, fields)
+
+
+def serialize_many(objs: Iterable[Any], cls: type, fields: Optional[Iterable[str]] = None) -> List[dict]:
+    """
+    同じ型のオブジェクトの列を辞書のリストに変換
+
+    シリアライザーは要素ではなく宣言した型から選ぶため、空の列でも項目の指定を検証する
+
+    Args:
+        objs: 変換するオブジェクト
+        cls: 要素の型
+        fields: 含める項目（Noneの場合は既定の項目）
+
+    Raises:
+        ValidationError: 指定できない項目が含まれる場合
+    """
+    return serializer_for(cls).dump_many(objs, fields)
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """
+    ?fields= の値（カンマ区切り）を項目名のリストにする
+
+    指定がない・空の場合はNone（既定の項目）
+    """
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    return fields or None
+
+
+# ユーザーのレスポンスの項目（パスワードハッシュなどの認証情報は含めない）
+USER_SERIALIZER = Serializer(
+    [
+        Field('id', 'id'),
+        Field('email', 'email.value'),
+        Field('name', 'name'),
+        Field('role', 'role.role_type.value'),
+        Field('is_active', 'is_active'),
+        Field('created_at', 'created_at', datetime.isoformat),
+        Field('updated_at', 'updated_at', datetime.isoformat),
+    ],
+    default_fields=('id', 'email', 'name', 'role', 'is_active')
+)
+
+# ユーザー一覧のレスポンスの項目（UserSummary.to_dict と同じ形）
+USER_SUMMARY_SERIALIZER = Serializer([
+    Field('id', 'id'),
+    Field('email', 'email'),
+    Field('name', 'name'),
+    Field('role', 'role.value'),
+    Field('is_active', 'is_active'),
+    Field('created_at', 'created_at', datetime.isoformat),
+    Field('updated_at', 'updated_at', datetime.isoformat),
+])
+
+register_serializer(User, USER_SERIALIZER)
+register_serializer(UserSummary, USER_SUMMARY_SERIALIZER)
@@ -1,15 +1,20 @@
 """
 管理者登録ユースケース
 """
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
-import uuid
+from typing import List, Optional, Sequence
 
 from ...domain.entities.user import User
 from ...domain.value_objects.email import Email
 from ...domain.value_objects.password import Password
+from ...domain.value_objects.principal import Principal
 from ...domain.value_objects.role import Role, RoleType
 from ...domain.repositories.user_repository import UserRepository
+from ...domain.repositories.unit_of_work import UnitOfWork
+from ...domain.services.password_hasher import PasswordHasher, get_password_hasher
+from ...domain.services.id_generator import new_id
 from ...domain.exceptions import UserAlreadyExistsError, UnauthorizedError
 
 @dataclass
@@ -20,45 +25,121 @@ class AdminRegistrationRequest:
     name: str
 
 class AdminRegistrationUseCase:
-    """管理者登録ユースケース"""
-    
-    def __init__(self, user_repository: UserRepository):
+    """
+    管理者登録ユースケース
+
+    登録を依頼したユーザーの権限は、検証済みのトークンから組み立てた Principal で判定し、
+    リポジトリには問い合わせない
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        unit_of_work: Optional[UnitOfWork] = None,
+        password_hasher: Optional[PasswordHasher] = None
+    ):
+        """
+        初期化
+
+        Args:
+            user_repository: ユーザーリポジトリ
+            unit_of_work: トランザクション境界（省略時はリポジトリの書き込みごとに確定）
+            password_hasher: 一括登録でのハッシュ化サービス（省略時はアプリケーション全体の設定）
+        """
         self.user_repository = user_repository
-    
-    def execute(self, request: AdminRegistrationRequest) -> User:
+        self.unit_of_work = unit_of_work
+        self.password_hasher = password_hasher
+
+    def execute(self, request: AdminRegistrationRequest, requested_by: Principal) -> User:
         """
         管理者を登録
-        
+
         Args:
             request: 登録リクエスト
-            
+            requested_by: 登録を依頼した認証済みの主体
+
         Returns:
             User: 作成された管理者
-            
+
         Raises:
-            UnauthorizedError: スーパー管理者による承認が得られない場合
+            UnauthorizedError: 依頼者がスーパー管理者でない場合
             UserAlreadyExistsError: メールアドレスが既に使用されている場合
+            ValidationError: 入力値が不正な場合
         """
-        # スーパー管理者の検証
-        super_admin = self.user_repository.find_by_email(Email("super.admin@example.com"))
-        if not super_admin or super_admin.role.role_type != RoleType.SUPER_ADMIN:
-            raise UnauthorizedError("スーパー管理者による承認が必要です")
+        self._authorize(requested_by)
+
+        # 入力の検証はハッシュ化より先に行い、ハッシュ化はトランザクションの外で行う
+        email = Email(request.email)
+        admin = self._new_admin(email, request.name, Password.create(request.password))
+
+        with self.unit_of_work or nullcontext():
+            # 保存（メールアドレスの重複は一意制約で検出し、UserAlreadyExistsError となる）
+            return self.user_repository.save(admin)
+
+    def execute_many(
+        self, requests: Sequence[AdminRegistrationRequest], requested_by: Principal
+    ) -> List[User]:
+        """
+        複数の管理者を1つのトランザクションでまとめて登録
+
+        すべての入力を検証してからハッシュ化し、1回の add_many で追加する。
+        1件でも不正・重複があれば1件も登録しない
 
-        # メールアドレスの重複チェック
-        if self.user_repository.find_by_email(Email(request.email)):
-            raise UserAlreadyExistsError("このメールアドレスは既に登録されています")
+        Args:
+            requests: 登録リクエスト
+            requested_by: 登録を依頼した認証済みの主体
+
+        Returns:
+            List[User]: 作成された管理者（リクエストと同じ順）
+
+        Raises:
+            UnauthorizedError: 依頼者がスーパー管理者でない場合
+            UserAlreadyExistsError: メールアドレスが既に使用されている、またはリクエスト内で重複する場合
+            ValidationError: 入力値が不正な場合
+        """
+        self._authorize(requested_by)
+
+        emails = {}
+        for request in requests:
+            email = Email(request.email)
+            Password.validate(request.password)
+            if email.normalized in emails:
+                raise UserAlreadyExistsError(f"メールアドレスが重複しています: {request.email}")
+            emails[email.normalized] = email
+
+        hasher = self.password_hasher or get_password_hasher()
+        hashed = hasher.hash_many([request.password for request in requests])
+        admins = [
+            self._new_admin(email, request.name, Password(hashed_password))
+            for email, request, hashed_password in zip(emails.values(), requests, hashed)
+        ]
+
+        with self.unit_of_work or nullcontext():
+            # 既存ユーザーとの重複は一意制約で検出し、UserAlreadyExistsError となる
+            self.user_repository.add_many(admins)
+        return admins
+
+    @staticmethod
+    def _authorize(requested_by: Principal) -> None:
+        """
+        依頼者がスーパー管理者であることを確認
+
+        Raises:
+            UnauthorizedError: スーパー管理者でない場合
+        """
+        if requested_by is None or not requested_by.is_super_admin():
+            raise UnauthorizedError("スーパー管理者による承認が必要です")
 
-        # 管理者の作成
-        admin = User(
-            id=str(uuid.uuid4()),
-            _email=Email(request.email),
-            _password=Password.create(request.password),
-            name=request.name,
+    @staticmethod
+    def _new_admin(email: Email, name: str, password: Password) -> User:
+        """管理者のエンティティを作成"""
+        return User(
+            id=new_id(),
+            _email=email,
+            _password=password,
+            name=name,
             role=Role(RoleType.ADMIN),
             is_active=True,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
-        
-        # 保存
-        return self.user_repository.save(admin) 
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+ユーザー一括登録ユースケース
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Set
+
+from ...domain.entities.user import User
+from ...domain.value_objects.email import Email
+from ...domain.value_objects.password import Password
+from ...domain.value_objects.role import Role, RoleType
+from ...domain.repositories.user_repository import UserRepository
+from ...domain.repositories.unit_of_work import UnitOfWork
+from ...domain.services.password_hasher import PasswordHasher, PasswordHashPolicy
+from ...domain.services.id_generator import new_id
+from ...domain.exceptions import ValidationError
+
+
+@dataclass
+class BulkUserImportRecord:
+    """
+    一括登録する1件分の入力
+
+    password（平文）と password_hash（移行元で生成済みのハッシュ）のどちらかを指定する。
+    ハッシュをそのまま取り込んだ場合は、現行の方針と異なればログイン時に再ハッシュされる
+    """
+    line: int
+    email: str = ''
+    name: str = ''
+    password: Optional[str] = None
+    password_hash: Optional[str] = None
+    # 読み込み時点で解析に失敗した場合の理由
+    error: Optional[str] = None
+
+
+@dataclass
+class RejectedRecord:
+    """登録しなかった入力とその理由"""
+    line: int
+    email: str
+    reason: str
+
+
+@dataclass
+class BulkUserImportResult:
+    """一括登録の進捗・結果"""
+    processed: int = 0
+    imported: int = 0
+    rejected: int = 0
+
+
+class BulkUserImportUseCase:
+    """
+    ユーザー一括登録ユースケース
+
+    入力を chunk_size 件ずつ読み進め、チャンクごとに
+    検証 → 登録済みメールアドレスの一括確認 → 並列ハッシュ化 → 一括INSERT を行う。
+    トランザクションの大きさはユニットオブワークの batch_size で決まり、
+    途中で失敗した場合も確定済みのトランザクションは残る（再実行時は重複として除外される）
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        unit_of_work: UnitOfWork,
+        password_hasher: PasswordHasher,
+        chunk_size: int = 1000,
+        on_reject: Optional[Callable[[RejectedRecord], None]] = None,
+        on_progress: Optional[Callable[[BulkUserImportResult], None]] = None
+    ):
+        """
+        初期化
+
+        Args:
+            user_repository: ユーザーリポジトリ（unit_of_work に属するもの）
+            unit_of_work: トランザクション境界
+            password_hasher: ハッシュ化サービス（hash_many で並列化される実装を想定）
+            chunk_size: 1回の問い合わせ・INSERTで扱う件数
+            on_reject: 入力を登録しなかった際に呼び出されるコールバック
+            on_progress: チャンクを処理するたびに呼び出されるコールバック
+        """
+        self.user_repository = user_repository
+        self.unit_of_work = unit_of_work
+        self.password_hasher = password_hasher
+        self.chunk_size = chunk_size
+        self.on_reject = on_reject
+        self.on_progress = on_progress
+
+    def execute(self, records: Iterable[BulkUserImportRecord]) -> BulkUserImportResult:
+        """
+        ユーザーを一括登録
+
+        Args:
+            records: 登録する入力（ストリームのまま渡してよい）
+
+        Returns:
+            BulkUserImportResult: 処理件数・登録件数・除外件数
+        """
+        result = BulkUserImportResult()
+        # ファイル内の重複を除外するため、処理済みのメールアドレスを正規化した表記で保持する
+        seen_emails: Set[str] = set()
+        records = iter(records)
+        with self.unit_of_work:
+            while True:
+                chunk = list(islice(records, self.chunk_size))
+                if not chunk:
+                    break
+                self._import_chunk(chunk, seen_emails, result)
+                if self.on_progress:
+                    self.on_progress(result)
+        return result
+
+    def _import_chunk(
+        self,
+        chunk: List[BulkUserImportRecord],
+        seen_emails: Set[str],
+        result: BulkUserImportResult
+    ) -> None:
+        """1チャンク分を検証して登録"""
+        candidates = []
+        for record in chunk:
+            result.processed += 1
+            try:
+                email = self._validate(record)
+            except ValidationError as e:
+                self._reject(record, str(e), result)
+                continue
+            if email.normalized in seen_emails:
+                self._reject(record, "ファイル内でメールアドレスが重複しています", result)
+                continue
+            seen_emails.add(email.normalized)
+            candidates.append((record, email))
+
+        existing = self.user_repository.find_existing_emails(
+            email.normalized for _, email in candidates
+        )
+        accepted = []
+        for record, email in candidates:
+            if email.normalized in existing:
+                self._reject(record, "このメールアドレスは既に登録されています", result)
+            else:
+                accepted.append((record, email))
+        if not accepted:
+            return
+
+        # 検証・重複確認を通過したものだけをまとめてハッシュ化する
+        plain_passwords = [record.password for record, _ in accepted if not record.password_hash]
+        hashed = iter(self.password_hasher.hash_many(plain_passwords))
+        now = datetime.utcnow()
+        users = [
+            User(
+                id=new_id(),
+                _email=email,
+                _password=Password(record.password_hash or next(hashed)),
+                name=record.name,
+                role=Role(RoleType.USER),
+                is_active=True,
+                created_at=now,
+                updated_at=now
+            )
+            for record, email in accepted
+        ]
+        self.user_repository.add_many(users)
+        self.unit_of_work.checkpoint(len(users))
+        result.imported += len(users)
+
+    @staticmethod
+    def _validate(record: BulkUserImportRecord) -> Email:
+        """
+        入力を検証してメールアドレスを取得
+
+        Raises:
+            ValidationError: 入力が不正な場合
+        """
+        if record.error:
+            raise ValidationError(record.error)
+        email = Email(record.email)
+        if not record.name:
+            raise ValidationError("名前は必須です")
+        if record.password_hash:
+            if not PasswordHashPolicy.is_supported_hash(record.password_hash):
+                raise ValidationError("未対応の形式のパスワードハッシュです")
+        elif record.password:
+            Password.validate(record.password)
+        else:
+            raise ValidationError("パスワードは必須です")
+        return email
+
+    def _reject(self, record: BulkUserImportRecord, reason: str, result: BulkUserImportResult) -> None:
+        """入力を除外として記録"""
+        result.rejected += 1
+        if self.on_reject:
+            self.on_reject(RejectedRecord(line=record.line, email=record.email, reason=reason))
@@ -1,16 +1,19 @@
 """
 スーパー管理者登録ユースケース
 """
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
-import uuid
+from typing import Optional
 
 from ...domain.entities.user import User
 from ...domain.value_objects.email import Email
 from ...domain.value_objects.password import Password
 from ...domain.value_objects.role import Role, RoleType
 from ...domain.repositories.user_repository import UserRepository
+from ...domain.repositories.unit_of_work import UnitOfWork
 from ...domain.services.email_service import EmailService
+from ...domain.services.id_generator import new_id
 from ...domain.exceptions import UserAlreadyExistsError, ValidationError
 
 @dataclass
@@ -23,16 +26,23 @@ class SuperAdminRegistrationRequest:
 class SuperAdminRegistrationUseCase:
     """スーパー管理者登録ユースケース"""
 
-    def __init__(self, user_repository: UserRepository, email_service: EmailService):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        email_service: EmailService,
+        unit_of_work: Optional[UnitOfWork] = None
+    ):
         """
         初期化
 
         Args:
             user_repository: ユーザーリポジトリ
             email_service: メールサービス
+            unit_of_work: トランザクション境界（省略時はリポジトリの書き込みごとに確定）
         """
         self.user_repository = user_repository
         self.email_service = email_service
+        self.unit_of_work = unit_of_work
 
     def execute(self, request: SuperAdminRegistrationRequest) -> User:
         """
@@ -45,33 +55,34 @@ class SuperAdminRegistrationUseCase:
             User: 作成されたスーパー管理者
 
         Raises:
-            UserAlreadyExistsError: スーパー管理者が既に存在する場合
+            UserAlreadyExistsError: スーパー管理者またはメールアドレスが既に登録されている場合
             ValidationError: 入力値が不正な場合
         """
-        # スーパー管理者の存在チェック
-        if self.user_repository.exists_super_admin():
-            raise UserAlreadyExistsError("スーパー管理者は既に登録されています")
+        # 入力の検証は問い合わせ・ハッシュ化より先に行う
+        email = Email(request.email)
+        Password.validate(request.password)
 
-        # メールアドレスの重複チェック
-        if self.user_repository.find_by_email(Email(request.email)):
-            raise UserAlreadyExistsError("このメールアドレスは既に登録されています")
+        with self.unit_of_work or nullcontext():
+            # スーパー管理者の存在チェック
+            if self.user_repository.exists_super_admin():
+                raise UserAlreadyExistsError("スーパー管理者は既に登録されています")
 
-        # スーパー管理者の作成
-        user = User(
-            id=str(uuid.uuid4()),
-            _email=Email(request.email),
-            _password=Password.create(request.password),
-            name=request.name,
-            role=Role(RoleType.SUPER_ADMIN),
-            is_active=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
+            # スーパー管理者の作成
+            user = User(
+                id=new_id(),
+                _email=email,
+                _password=Password.create(request.password),
+                name=request.name,
+                role=Role(RoleType.SUPER_ADMIN),
+                is_active=True,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )
 
-        # スーパー管理者の保存
-        saved_user = self.user_repository.save(user)
+            # スーパー管理者の保存（メールアドレスの重複は一意制約で検出し、UserAlreadyExistsError となる）
+            saved_user = self.user_repository.save(user)
 
-        # 確認メールの送信
-        self.email_service.send_confirmation_email(saved_user)
+            # 確認メールの送信（アウトボックスの場合はユーザーと同じトランザクションで送信を依頼する）
+            self.email_service.send_confirmation_email(saved_user)
 
         return saved_user 
\ No newline at end of file
@@ -1,10 +1,14 @@
 from dataclasses import dataclass
+from typing import Optional
 from ...domain.services.auth_service import AuthService
+from ...domain.exceptions import ValidationError
 
 @dataclass
 class LogoutRequest:
     """ログアウトリクエスト"""
     token: str
+    # 認証時に検証済みのクレーム（ある場合はトークンを再びデコードしない）
+    claims: Optional[dict] = None
 
 class UserLogoutUseCase:
     """ユーザーログアウトユースケース"""
@@ -20,9 +24,7 @@ class UserLogoutUseCase:
             request: ログアウトリクエスト
             
         Raises:
-            ValueError: 
-                - トークンが指定されていない場合
-                - トークンが無効な場合
+            ValueError: トークンが指定されていない場合
         """
         # ログアウト時はトークンが無効でもエラーにしない
         
@@ -31,4 +33,8 @@ class UserLogoutUseCase:
             raise ValueError("トークンが指定されていません")
             
         # トークンの無効化
-        self.auth_service.invalidate_token(request.token) 
\ No newline at end of file
+        try:
+            self.auth_service.invalidate_token(request.token, claims=request.claims)
+        except ValidationError:
+            # 期限切れ・改ざん済みのトークンは失効登録の必要がない
+            pass 
\ No newline at end of file
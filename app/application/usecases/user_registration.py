@@ -1,17 +1,19 @@
 """
 ユーザー登録ユースケース
 """
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
-import uuid
+from typing import Optional
 
 from ...domain.entities.user import User
 from ...domain.value_objects.email import Email
 from ...domain.value_objects.password import Password
 from ...domain.value_objects.role import Role, RoleType
 from ...domain.repositories.user_repository import UserRepository
+from ...domain.repositories.unit_of_work import UnitOfWork
 from ...domain.services.email_service import EmailService
-from ...domain.exceptions import UserAlreadyExistsError
+from ...domain.services.id_generator import new_id
 
 @dataclass
 class UserRegistrationRequest:
@@ -23,18 +25,25 @@ class UserRegistrationRequest:
 class UserRegistrationUseCase:
     """ユーザー登録ユースケース"""
 
-    def __init__(self, user_repository: UserRepository, email_service: EmailService):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        email_service: EmailService,
+        unit_of_work: Optional[UnitOfWork] = None
+    ):
         """
         初期化
 
         Args:
             user_repository: ユーザーリポジトリ
             email_service: メールサービス
+            unit_of_work: トランザクション境界（省略時はリポジトリの書き込みごとに確定）
         """
         # インフラ層のレポジトリ
         self.user_repository = user_repository
         # インフラ層のサービス
         self.email_service = email_service
+        self.unit_of_work = unit_of_work
 
     def execute(self, request: UserRegistrationRequest) -> User:
         """
@@ -48,16 +57,17 @@ class UserRegistrationUseCase:
 
         Raises:
             UserAlreadyExistsError: メールアドレスが既に登録されている場合
+            ValidationError: 入力値が不正な場合
         """
-        # メールアドレスの重複チェック
-        if self.user_repository.find_by_email(Email(request.email)):
-            raise UserAlreadyExistsError("このメールアドレスは既に登録されています")
+        # 入力の検証はハッシュ化より先に行い、ハッシュ化はトランザクションの外で行う
+        email = Email(request.email)
+        password = Password.create(request.password)
 
         # ユーザーの作成 (本来はFactoryの役割?)
         user = User(
-            id=str(uuid.uuid4()),
-            _email=Email(request.email),
-            _password=Password.create(request.password),
+            id=new_id(),
+            _email=email,
+            _password=password,
             name=request.name,
             role=Role(RoleType.USER),
             is_active=True,
@@ -65,10 +75,11 @@ class UserRegistrationUseCase:
             updated_at=datetime.utcnow()
         )
 
-        # ユーザーの保存
-        saved_user = self.user_repository.save(user)
+        with self.unit_of_work or nullcontext():
+            # ユーザーの保存（メールアドレスの重複は一意制約で検出し、UserAlreadyExistsError となる）
+            saved_user = self.user_repository.save(user)
 
-        # 確認メールの送信
-        self.email_service.send_confirmation_email(saved_user)
+            # 確認メールの送信（アウトボックスの場合はユーザーと同じトランザクションで送信を依頼する）
+            self.email_service.send_confirmation_email(saved_user)
 
         return saved_user 
\ No newline at end of file
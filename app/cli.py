@@ -0,0 +1,221 @@
+"""
+CLIコマンド
+"""
+import json
+import os
+import time
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from .domain.services.password_hasher import DEFAULT_COSTS
+
+
+def register_commands(app: Flask) -> None:
+    """アプリケーションにCLIコマンドを登録"""
+    app.cli.add_command(password_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(replica_cli)
+    app.cli.add_command(outbox_cli)
+
+
+@click.group('password', help='パスワードハッシュ関連のコマンド')
+def password_cli():
+    pass
+
+
+@password_cli.command('calibrate')
+@click.option('--algorithm', type=click.Choice(sorted(DEFAULT_COSTS)), default='scrypt',
+              help='ハッシュアルゴリズム')
+@click.option('--target-ms', type=float, default=250.0, help='1回のハッシュ化の目標時間（ミリ秒）')
+def calibrate_password_cost(algorithm: str, target_ms: float):
+    """このマシンで目標時間に収まる最大のハッシュコストを求める"""
+    from .infrastructure.services.password_hasher import calibrate_cost
+
+    cost, elapsed = calibrate_cost(algorithm, target_ms / 1000)
+    click.echo(f"{algorithm}: cost={cost} ({elapsed * 1000:.1f} ms/hash)")
+    click.echo(f"設定例: PASSWORD_HASH_ALGORITHM='{algorithm}', PASSWORD_HASH_COST={cost}")
+
+
+users_cli = AppGroup('users', help='ユーザー関連のコマンド')
+
+
+@users_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), default=None,
+              help='ファイル形式（省略時は拡張子から判定）')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=1000,
+              help='1回の問い合わせ・INSERTで扱う件数')
+@click.option('--transaction-size', type=click.IntRange(min=1), default=10_000,
+              help='1トランザクションで確定する件数')
+@click.option('--workers', type=click.IntRange(min=1), default=os.cpu_count() or 1,
+              help='パスワードをハッシュ化するワーカープロセス数')
+@click.option('--rejects', 'rejects_path', type=click.Path(dir_okay=False), default=None,
+              help='登録しなかった行と理由を書き出すNDJSONファイル')
+def import_users(path, file_format, chunk_size, transaction_size, workers, rejects_path):
+    """CSV / NDJSON ファイルからユーザーを一括登録する"""
+    from .application.usecases.bulk_user_import import BulkUserImportUseCase
+    from .infrastructure.services.password_hasher import ProcessPoolPasswordHasher
+    from .infrastructure.services.user_records import detect_format, read_user_records
+
+    if file_format is None:
+        try:
+            file_format = detect_format(path)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--format')
+
+    container = current_app.container
+    owns_hasher = workers > 1
+    if owns_hasher:
+        password_hasher = ProcessPoolPasswordHasher(
+            max_workers=workers, policy=container.password_hash_policy()
+        )
+    else:
+        password_hasher = container.password_hasher()
+    rejects_file = open(rejects_path, 'w', encoding='utf-8') if rejects_path else None
+    started = time.perf_counter()
+
+    def on_reject(rejected):
+        if rejects_file:
+            rejects_file.write(json.dumps(rejected.__dict__, ensure_ascii=False) + '\n')
+
+    def on_progress(result):
+        rate = result.processed / max(time.perf_counter() - started, 1e-9)
+        click.echo(
+            f"processed={result.processed} imported={result.imported} "
+            f"rejected={result.rejected} ({rate:.0f} rows/s)",
+            err=True
+        )
+
+    unit_of_work = container.unit_of_work(batch_size=transaction_size)
+    use_case = BulkUserImportUseCase(
+        user_repository=unit_of_work.users,
+        unit_of_work=unit_of_work,
+        password_hasher=password_hasher,
+        chunk_size=chunk_size,
+        on_reject=on_reject,
+        on_progress=on_progress
+    )
+    try:
+        with open(path, newline='', encoding='utf-8') as stream:
+            result = use_case.execute(
+                read_user_records(stream, file_format)
+            )
+    finally:
+        if rejects_file:
+            rejects_file.close()
+        if owns_hasher:
+            password_hasher.shutdown()
+
+    elapsed = time.perf_counter() - started
+    click.echo(
+        f"完了: {result.imported}件を登録、{result.rejected}件を除外 "
+        f"（{result.processed}件 / {elapsed:.1f}秒）"
+    )
+
+
+@users_cli.command('export')
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), default='ndjson',
+              help='ファイル形式')
+@click.option('--role', type=click.Choice(['super_admin', 'admin', 'user']), default=None,
+              help='絞り込むロール')
+@click.option('--active/--inactive', 'is_active', default=None, help='絞り込む有効状態')
+@click.option('--output', type=click.File('w', encoding='utf-8', lazy=True), default='-',
+              help='書き出し先（省略時は標準出力）')
+@click.option('--batch-size', type=click.IntRange(min=1), default=1000,
+              help='データベースから1回に取り出す件数')
+def export_users(file_format, role, is_active, output, batch_size):
+    """ユーザーを CSV / NDJSON で書き出す（パスワードハッシュは含めない）"""
+    from .domain.value_objects.role import RoleType
+    from .infrastructure.services.user_records import write_user_records
+
+    summaries = current_app.container.user_repository().iter_summaries(
+        role=RoleType(role) if role else None,
+        is_active=is_active,
+        batch_size=batch_size
+    )
+    for chunk in write_user_records(summaries, file_format):
+        output.write(chunk)
+
+
+@users_cli.command('convert-ids')
+@click.argument('storage', type=click.Choice(['string', 'binary']))
+@click.option('--batch-size', type=click.IntRange(min=1), default=1000,
+              help='1回に読み出して更新する件数（SQLite）')
+def convert_user_ids(storage, batch_size):
+    """既存のユーザーIDを指定した保存形式（36文字の文字列 / 16バイト）に変換する"""
+    from .infrastructure.database import db
+    from .infrastructure.database.user_ids import convert_user_ids as convert
+
+    try:
+        converted = convert(db.engine, storage, batch_size=batch_size)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if converted >= 0:
+        click.echo(f"{converted}件のユーザーIDを変換しました")
+    else:
+        click.echo("users.id の列の型を変換しました")
+    if current_app.config.get('USER_ID_STORAGE', 'string') != storage:
+        click.echo(f"USER_ID_STORAGE='{storage}' を設定してアプリケーションを再起動してください")
+
+
+replica_cli = AppGroup('replica', help='読み取り用レプリカ関連のコマンド')
+
+
+@replica_cli.command('sync')
+@click.option('--interval', type=float, default=None,
+              help='指定した秒数ごとに複製を繰り返す（省略時は1回のみ）')
+def sync_replica(interval):
+    """プライマリのSQLiteファイルをレプリカのファイルに複製する（ローカル開発用）"""
+    from .infrastructure.database import db
+    from .infrastructure.database.routing import REPLICA_ENGINE_KEY
+    from .infrastructure.database.sqlite_replica import SQLiteReplicaCopier, sqlite_path
+
+    if not current_app.config.get('SQLALCHEMY_REPLICA_URI'):
+        raise click.UsageError("SQLALCHEMY_REPLICA_URI が設定されていません")
+    try:
+        # 相対パスはFlask-SQLAlchemyがインスタンスフォルダー基準に解決するため、プライマリはエンジンのURLを使う
+        copier = SQLiteReplicaCopier(
+            sqlite_path(db.engine.url),
+            sqlite_path(current_app.extensions[REPLICA_ENGINE_KEY].url),
+            interval_seconds=interval or 1.0
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    if interval is None:
+        copier.sync()
+        click.echo("レプリカに複製しました")
+        return
+    click.echo(f"{interval}秒ごとにレプリカへ複製します（Ctrl+Cで終了）")
+    try:
+        copier.run()
+    except KeyboardInterrupt:
+        pass
+
+
+outbox_cli = AppGroup('outbox', help='アウトボックス（送信待ちのメール）関連のコマンド')
+
+
+@outbox_cli.command('dispatch')
+@click.option('--interval', type=float, default=None,
+              help='指定した秒数ごとに送信待ちを確認し続ける（省略時は送信待ちがなくなるまで1回のみ）')
+@click.option('--batch-size', type=click.IntRange(min=1), default=None,
+              help='1回に取り出す件数（省略時は OUTBOX_BATCH_SIZE）')
+def dispatch_outbox(interval, batch_size):
+    """アウトボックスの送信待ちのメールを送信する"""
+    dispatcher = current_app.container.outbox_dispatcher()
+    if batch_size is not None:
+        dispatcher.batch_size = batch_size
+
+    if interval is None:
+        result = dispatcher.drain()
+        click.echo(f"送信: {result.sent} 件 / 再試行待ち: {result.retried} 件 / 失敗: {result.failed} 件")
+        return
+    dispatcher.interval_seconds = interval
+    click.echo(f"{interval}秒ごとに送信待ちのメールを送信します（Ctrl+Cで終了）")
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        pass
@@ -1,26 +1,300 @@
 """
 依存性注入のためのコンテナ
 """
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
+from .infrastructure.database.routing import SessionRouter
 from .infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from .infrastructure.repositories.caching_user_repository import CachingUserRepository
+from .infrastructure.repositories.in_memory_user_repository import (
+    InMemoryUnitOfWork,
+    InMemoryUserRepository,
+    InMemoryUserStore
+)
+from .infrastructure.repositories.unit_of_work import SQLAlchemyUnitOfWork
 from .infrastructure.services.email_service import ConsoleEmailService
+from .infrastructure.services.outbox import OutboxDispatcher, OutboxEmailService
+from .infrastructure.services.smtp_email_service import EmailTemplates, SMTPConnectionPool, SMTPEmailService
+from .infrastructure.services.token_cache import VerifiedTokenCache
+from .infrastructure.services.user_cache import UserCacheStats, UserEntityCache
+from .infrastructure.services.password_hasher import ProcessPoolPasswordHasher
+from .infrastructure.services.rate_limiter import (
+    InMemoryTokenBucketStore,
+    RateLimiter,
+    RateLimitRule,
+    SQLiteTokenBucketStore
+)
+from .domain.services.password_hasher import InlinePasswordHasher, PasswordHashPolicy
+from .infrastructure.services.security_version_registry import SecurityVersionRegistry
+from .infrastructure.services.token_revocation_store import (
+    InMemoryTokenRevocationStore,
+    SQLiteTokenRevocationStore
+)
 
 class Container:
     """依存性注入のためのコンテナ"""
 
-    def __init__(self, db_session):
+    def __init__(self, db_session, config=None, read_session=None):
         """
         初期化
 
         Args:
-            db_session: データベースセッション
+            db_session: データベースセッション（書き込み用のプライマリ）
+            config: アプリケーション設定
+            read_session: 読み取り用のレプリカのセッション（省略時は db_session で読み取る）
         """
         self._db_session = db_session
+        self._session_router = None
+        if read_session is not None:
+            self._session_router = SessionRouter(db_session, read_session)
+        self._config = config or {}
+        self._token_revocation_store = None
+        self._password_hasher = None
+        self._password_rehash_executor = None
+        self._security_version_registry = SecurityVersionRegistry(
+            max_age_seconds=self._config.get('TOKEN_CLAIMS_MAX_AGE_SECONDS', 300.0),
+            max_entries=self._config.get('SECURITY_VERSION_MAX_ENTRIES', 100_000)
+        )
+        self._verified_token_cache = None
+        if self._config.get('TOKEN_CACHE_ENABLED', True):
+            self._verified_token_cache = VerifiedTokenCache(
+                max_entries=self._config.get('TOKEN_CACHE_MAX_ENTRIES', 10_000),
+                ttl_seconds=self._config.get('TOKEN_CACHE_TTL_SECONDS', 60.0)
+            )
+        self._user_cache_stats = UserCacheStats()
+        self._user_cache = None
+        if self._config.get('USER_CACHE_TTL_SECONDS', 0) > 0:
+            self._user_cache = UserEntityCache(
+                max_entries=self._config.get('USER_CACHE_MAX_ENTRIES', 10_000),
+                ttl_seconds=self._config['USER_CACHE_TTL_SECONDS']
+            )
+        self._smtp_email_service = None
+        self._in_memory_user_store = None
+        if self._config.get('USER_REPOSITORY', 'sqlalchemy') == 'memory':
+            self._in_memory_user_store = InMemoryUserStore()
 
     def user_repository(self):
-        """ユーザーリポジトリを取得"""
-        return SQLAlchemyUserRepository(self._db_session)
+        """
+        ユーザーリポジトリを取得
+
+        リクエスト内の識別子マップと、USER_CACHE_TTL_SECONDSが0より大きい場合は
+        プロセス内キャッシュを前段に置く。
+        SQLALCHEMY_REPLICA_URIが設定されている場合、読み取りはレプリカに振り分ける。
+        USER_REPOSITORY_MAPPINGが'imperative'の場合、User エンティティを直接マッピングして読み込む。
+        USER_REPOSITORYが'memory'の場合はデータベースを使わず、プロセス内のストアに保存する
+        """
+        if self._in_memory_user_store is not None:
+            return self._caching(
+                InMemoryUserRepository(self._in_memory_user_store, save_listeners=self._save_listeners())
+            )
+        return self._caching(
+            SQLAlchemyUserRepository(
+                self._db_session,
+                save_listeners=self._save_listeners(),
+                router=self._session_router,
+                load_entities=self._load_entities()
+            )
+        )
+
+    def unit_of_work(self, batch_size=None):
+        """
+        ユニットオブワークを取得
+
+        Args:
+            batch_size: checkpoint() で途中確定する書き込み件数（大量登録向け）
+        """
+        if self._in_memory_user_store is not None:
+            return InMemoryUnitOfWork(
+                self._in_memory_user_store,
+                user_repository_factory=lambda store, autocommit: self._caching(
+                    InMemoryUserRepository(
+                        store,
+                        save_listeners=self._save_listeners(),
+                        autocommit=autocommit
+                    )
+                ),
+                batch_size=batch_size
+            )
+        return SQLAlchemyUnitOfWork(
+            self._db_session,
+            user_repository_factory=lambda session, autocommit: self._caching(
+                SQLAlchemyUserRepository(
+                    session,
+                    save_listeners=self._save_listeners(),
+                    autocommit=autocommit,
+                    router=self._session_router,
+                    load_entities=self._load_entities()
+                )
+            ),
+            batch_size=batch_size
+        )
 
     def email_service(self):
-        """メールサービスを取得"""
-        return ConsoleEmailService() 
\ No newline at end of file
+        """
+        ユースケースが使うメールサービスを取得
+
+        EMAIL_DELIVERYが'outbox'の場合は送信依頼をユーザーと同じトランザクションでアウトボックスに書き込み、
+        送信は outbox_dispatcher() に任せる。ユーザーをメモリ内のストアに保存する場合は
+        トランザクションを共有できないため、直接送信する
+        """
+        if self._config.get('EMAIL_DELIVERY', 'outbox') == 'outbox' and self._in_memory_user_store is None:
+            return OutboxEmailService(self._db_session)
+        return self.email_sender()
+
+    def email_sender(self):
+        """
+        実際にメールを送るサービスを取得
+
+        EMAIL_SENDERが'smtp'の場合はSMTP_HOSTへの接続をプールして送信する（プロセス内で共有）
+        """
+        if self._config.get('EMAIL_SENDER', 'console') != 'smtp':
+            return ConsoleEmailService()
+        if self._smtp_email_service is None:
+            pool = SMTPConnectionPool(
+                host=self._config.get('SMTP_HOST', 'localhost'),
+                port=self._config.get('SMTP_PORT', 25),
+                size=self._config.get('SMTP_POOL_SIZE', 4),
+                timeout_seconds=self._config.get('SMTP_TIMEOUT_SECONDS', 10.0),
+                username=self._config.get('SMTP_USERNAME'),
+                password=self._config.get('SMTP_PASSWORD'),
+                use_tls=self._config.get('SMTP_USE_TLS', False)
+            )
+            self._smtp_email_service = SMTPEmailService(
+                pool,
+                sender_address=self._config.get('MAIL_FROM', 'no-reply@example.com'),
+                templates=EmailTemplates(directory=self._config.get('EMAIL_TEMPLATE_DIR')),
+                activation_url=self._config.get('EMAIL_ACTIVATION_URL', 'http://example.com/activate/{user_id}'),
+                batch_size=self._config.get('SMTP_BATCH_SIZE', 50)
+            )
+        return self._smtp_email_service
+
+    def outbox_dispatcher(self):
+        """アウトボックスの送信待ちメッセージを送信するディスパッチャーを取得"""
+        return OutboxDispatcher(
+            self._db_session,
+            self.user_repository(),
+            self.email_sender(),
+            batch_size=self._config.get('OUTBOX_BATCH_SIZE', 100),
+            max_attempts=self._config.get('OUTBOX_MAX_ATTEMPTS', 5),
+            backoff_seconds=self._config.get('OUTBOX_BACKOFF_SECONDS', 30.0),
+            max_backoff_seconds=self._config.get('OUTBOX_MAX_BACKOFF_SECONDS', 3600.0),
+            interval_seconds=self._config.get('OUTBOX_INTERVAL_SECONDS', 1.0),
+            lease_seconds=self._config.get('OUTBOX_LEASE_SECONDS', 300.0)
+        )
+
+    def token_revocation_store(self):
+        """
+        トークン失効ストアを取得
+
+        TOKEN_REVOCATION_STOREが'sqlite'の場合はTOKEN_REVOCATION_DB_PATHのファイルを使用し、
+        ワーカープロセス間で失効情報を共有する
+        """
+        if self._token_revocation_store is None:
+            if self._config.get('TOKEN_REVOCATION_STORE', 'memory') == 'sqlite':
+                self._token_revocation_store = SQLiteTokenRevocationStore(
+                    self._config.get('TOKEN_REVOCATION_DB_PATH', 'revoked_tokens.db')
+                )
+            else:
+                self._token_revocation_store = InMemoryTokenRevocationStore(
+                    max_entries=self._config.get('TOKEN_REVOCATION_MAX_ENTRIES', 100_000)
+                )
+        return self._token_revocation_store
+
+    def verified_token_cache(self):
+        """検証済みトークンのキャッシュを取得（無効化されている場合はNone）"""
+        return self._verified_token_cache
+
+    def password_hasher(self):
+        """
+        パスワードハッシュ化サービスを取得
+
+        PASSWORD_HASH_WORKERSが1以上の場合はプロセスプールで実行し、
+        0の場合はリクエストスレッドでそのまま実行する
+        """
+        if self._password_hasher is None:
+            workers = self._config.get('PASSWORD_HASH_WORKERS', 0)
+            if workers > 0:
+                self._password_hasher = ProcessPoolPasswordHasher(
+                    max_workers=workers,
+                    max_pending=self._config.get('PASSWORD_HASH_MAX_PENDING'),
+                    timeout_seconds=self._config.get('PASSWORD_HASH_TIMEOUT_SECONDS', 5.0),
+                    policy=self.password_hash_policy()
+                )
+            else:
+                self._password_hasher = InlinePasswordHasher(self.password_hash_policy())
+        return self._password_hasher
+
+    def password_hash_policy(self):
+        """PASSWORD_HASH_ALGORITHM / PASSWORD_HASH_COST からハッシュの方針を取得"""
+        return PasswordHashPolicy(
+            algorithm=self._config.get('PASSWORD_HASH_ALGORITHM', 'scrypt'),
+            cost=self._config.get('PASSWORD_HASH_COST')
+        )
+
+    def password_rehash_executor(self):
+        """
+        ログイン時のパスワード再ハッシュを実行するExecutorを取得
+
+        PASSWORD_REHASH_IN_BACKGROUNDがFalseの場合はNone（ログイン処理内で実行）
+        """
+        if not self._config.get('PASSWORD_REHASH_IN_BACKGROUND', True):
+            return None
+        if self._password_rehash_executor is None:
+            self._password_rehash_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='password-rehash'
+            )
+        return self._password_rehash_executor
+
+    def rate_limiter(self):
+        """
+        ログイン・登録エンドポイントのレートリミッターを取得
+
+        RATE_LIMIT_ENABLEDがFalseの場合はNone。
+        RATE_LIMIT_STORAGEが'sqlite'の場合はRATE_LIMIT_DB_PATHのファイルでワーカー間に共有する
+        """
+        if not self._config.get('RATE_LIMIT_ENABLED', True):
+            return None
+        if self._config.get('RATE_LIMIT_STORAGE', 'memory') == 'sqlite':
+            store = SQLiteTokenBucketStore(self._config.get('RATE_LIMIT_DB_PATH', 'rate_limit.db'))
+        else:
+            store = InMemoryTokenBucketStore()
+        return RateLimiter(
+            store,
+            ip_rule=RateLimitRule(
+                capacity=self._config.get('RATE_LIMIT_IP_CAPACITY', 30),
+                refill_per_second=self._config.get('RATE_LIMIT_IP_REFILL_PER_SECOND', 1.0)
+            ),
+            email_rule=RateLimitRule(
+                capacity=self._config.get('RATE_LIMIT_EMAIL_CAPACITY', 10),
+                refill_per_second=self._config.get('RATE_LIMIT_EMAIL_REFILL_PER_SECOND', 0.1)
+            )
+        )
+
+    def user_cache_stats(self):
+        """ユーザーキャッシュのヒット数の集計を取得"""
+        return self._user_cache_stats
+
+    def security_version_registry(self):
+        """セキュリティバージョンの記録を取得"""
+        return self._security_version_registry
+
+    def _save_listeners(self):
+        """ユーザー保存時に通知するコールバックの一覧"""
+        listeners = [self._security_version_registry.on_user_saved]
+        if self._verified_token_cache is not None:
+            listeners.append(self._verified_token_cache.on_user_saved)
+        if self._user_cache is not None:
+            listeners.append(self._user_cache.on_user_saved)
+        return listeners
+
+    def in_memory_user_store(self):
+        """USER_REPOSITORYが'memory'の場合のユーザーのストア（それ以外はNone）"""
+        return self._in_memory_user_store
+
+    def _load_entities(self):
+        """User エンティティを命令的マッピングで直接読み込むかどうか"""
+        return self._config.get('USER_REPOSITORY_MAPPING', 'declarative') == 'imperative'
+
+    def _caching(self, repository):
+        """リポジトリの前段にキャッシュを置く"""
+        return CachingUserRepository(repository, cache=self._user_cache, stats=self._user_cache_stats)
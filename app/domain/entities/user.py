@@ -3,6 +3,7 @@
 """
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 from app.domain.value_objects.email import Email
 from app.domain.value_objects.password import Password
 from app.domain.value_objects.role import Role
@@ -14,19 +15,34 @@ class User:
     id: str
     name: str
     _email: Email
-    _password: Password
+    # 認証以外の読み込みではパスワードのハッシュを読み込まずNoneになる
+    _password: Optional[Password]
     role: Role
     is_active: bool
     created_at: datetime
     updated_at: datetime
+    # 認証情報・権限が変わるたびに加算し、それ以前に発行したトークンを失効させる
+    security_version: int = 0
 
     @property
     def email(self) -> Email:
         """メールアドレスを取得する"""
         return self._email
 
+    @property
+    def has_credentials(self) -> bool:
+        """パスワードのハッシュを読み込んでいるかどうか"""
+        return self._password is not None
+
     def verify_password(self, plain_password: str) -> bool:
-        """パスワードを検証する"""
+        """
+        パスワードを検証する
+
+        Raises:
+            ValueError: パスワードのハッシュを読み込んでいない場合
+        """
+        if self._password is None:
+            raise ValueError("認証情報が読み込まれていません")
         return self._password.verify(plain_password)
 
     def update_profile(self, name: str = None, email: Email = None) -> None:
@@ -42,6 +58,35 @@ class User:
         self.is_active = True
         self.updated_at = datetime.utcnow()
 
+    def deactivate(self) -> None:
+        """アカウントを無効化する"""
+        self.is_active = False
+        self._bump_security_version()
+
+    def change_password(self, password: Password) -> None:
+        """パスワードを変更する"""
+        self._password = password
+        self._bump_security_version()
+
+    def upgrade_password_hash(self, password: Password) -> None:
+        """
+        同じパスワードを新しいハッシュ方式に置き換える
+
+        パスワード自体は変わらないため、発行済みトークンは失効させない
+        """
+        self._password = password
+        self.updated_at = datetime.utcnow()
+
+    def change_role(self, role: Role) -> None:
+        """ロールを変更する"""
+        self.role = role
+        self._bump_security_version()
+
+    def _bump_security_version(self) -> None:
+        """セキュリティバージョンを加算する"""
+        self.security_version += 1
+        self.updated_at = datetime.utcnow()
+
     def is_super_admin(self) -> bool:
         """スーパー管理者かどうかを判定する"""
         return self.role.is_super_admin()
@@ -43,3 +43,7 @@ class InvalidTokenError(DomainException):
 class UnauthorizedError(DomainException):
     """未認証エラー"""
     pass
+
+class ServiceUnavailableError(DomainException):
+    """サービス一時利用不可エラー（過負荷・タイムアウトなど）"""
+    pass
@@ -0,0 +1,46 @@
+"""
+ユーザーの読み取り専用モデル
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.domain.value_objects.role import RoleType
+
+
+@dataclass(frozen=True)
+class UserSummary:
+    """
+    一覧・エクスポート用のユーザー情報
+
+    パスワードハッシュなどの認証情報は含めない
+    """
+    id: str
+    email: str
+    name: str
+    role: RoleType
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    def to_dict(self) -> dict:
+        """JSONに変換できる辞書を返す"""
+        return {
+            'id': self.id,
+            'email': self.email,
+            'name': self.name,
+            'role': self.role.value,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+
+@dataclass(frozen=True)
+class UserPage:
+    """
+    ユーザー一覧の1ページ
+
+    next_key は次のページの取得に使う最後の要素の (created_at, id)。最終ページの場合はNone
+    """
+    items: List[UserSummary]
+    next_key: Optional[Tuple[datetime, str]] = None
@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from typing import List
+from .user_repository import UserRepository
+
+
+class TransactionParticipant(ABC):
+    """
+    ユニットオブワークの確定・取り消しの通知を受け取るインターフェース
+
+    保存後の通知などトランザクション中の書き込みに伴う処理を、確定まで保留するリポジトリが実装する
+    """
+
+    @abstractmethod
+    def after_commit(self) -> None:
+        """確定後に呼び出される（保留中の処理を実行する）"""
+        pass
+
+    @abstractmethod
+    def after_rollback(self) -> None:
+        """取り消し後に呼び出される（保留中の処理を破棄する）"""
+        pass
+
+
+class UnitOfWork(ABC):
+    """
+    トランザクション境界を表すユニットオブワークのインターフェース
+
+    with文で囲んだ範囲のリポジトリへの書き込みを1つのトランザクションにまとめ、
+    正常終了時にコミット、例外発生時にロールバックする。入れ子で使った場合は最も外側でのみ確定する。
+    コミット自体が失敗した場合（遅延評価の制約違反など）もロールバックしてから例外を送出する
+    """
+
+    users: UserRepository
+
+    def __init__(self):
+        self._depth = 0
+        self._participants: List[TransactionParticipant] = []
+
+    def enlist(self, participant: object) -> None:
+        """確定・取り消しを通知する参加者を登録（TransactionParticipant でない場合は何もしない）"""
+        if isinstance(participant, TransactionParticipant):
+            self._participants.append(participant)
+
+    def __enter__(self) -> 'UnitOfWork':
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        if exc_type is not None:
+            self.rollback()
+            return
+        try:
+            self.commit()
+        except BaseException:
+            self.rollback()
+            raise
+
+    @abstractmethod
+    def commit(self) -> None:
+        """保留中の書き込みを確定"""
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """保留中の書き込みを取り消す"""
+        pass
+
+    def _notify_committed(self) -> None:
+        """参加者に確定を通知"""
+        for participant in self._participants:
+            participant.after_commit()
+
+    def _notify_rolled_back(self) -> None:
+        """参加者に取り消しを通知"""
+        for participant in self._participants:
+            participant.after_rollback()
+
+    @abstractmethod
+    def checkpoint(self, writes: int = 1) -> None:
+        """
+        書き込み件数を記録し、バッチサイズに達していれば途中で確定する
+
+        大量登録など、1トランザクションに収めきれない処理で使用する
+        """
+        pass
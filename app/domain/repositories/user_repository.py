@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
 from ..entities.user import User
+from ..read_models.user_summary import UserPage, UserSummary
 from ..value_objects.role import RoleType
 
 class UserRepository(ABC):
@@ -8,20 +10,80 @@ class UserRepository(ABC):
 
     @abstractmethod
     def save(self, user: User) -> User:
-        """ユーザーを保存"""
+        """
+        ユーザーを保存
+
+        Raises:
+            UserAlreadyExistsError: 別のユーザーが同じメールアドレスで登録されている場合
+        """
         pass
 
     @abstractmethod
     def find_by_email(self, email: str) -> Optional[User]:
-        """メールアドレスでユーザーを検索"""
+        """
+        メールアドレスでユーザーを検索（大文字・小文字は区別しない）
+
+        パスワードのハッシュは読み込まない
+        """
         pass
 
     @abstractmethod
     def find_by_id(self, user_id: str) -> Optional[User]:
-        """IDでユーザーを検索"""
+        """IDでユーザーを検索（パスワードのハッシュは読み込まない）"""
+        pass
+
+    @abstractmethod
+    def find_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        """
+        複数のIDのユーザーをまとめて検索（パスワードのハッシュは読み込まない）
+
+        Returns:
+            Dict[str, User]: 見つかったユーザー（IDごと、見つからないIDは含まない）
+        """
+        pass
+
+    @abstractmethod
+    def find_credentials_by_email(self, email: str) -> Optional[User]:
+        """パスワードのハッシュを含めてメールアドレスでユーザーを検索（認証用）"""
         pass
 
     @abstractmethod
     def exists_super_admin(self) -> bool:
         """スーパー管理者が存在するかどうかを確認"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """指定したメールアドレスのうち登録済みのものを正規化した表記で取得"""
+        pass
+
+    @abstractmethod
+    def add_many(self, users: Sequence[User]) -> None:
+        """
+        新規ユーザーをまとめて追加（既存ユーザーの更新は行わない）
+
+        Raises:
+            UserAlreadyExistsError: 既存ユーザーとメールアドレスが重複する場合
+        """
+        pass
+
+    @abstractmethod
+    def iter_summaries(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> Iterator[UserSummary]:
+        """条件に合うユーザーを認証情報を含まない形で順に取得"""
+        pass
+
+    @abstractmethod
+    def list_page(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> UserPage:
+        """作成日時の新しい順に、after の (created_at, id) より後のユーザーを最大 limit 件取得"""
+        pass
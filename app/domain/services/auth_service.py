@@ -1,29 +1,49 @@
 """
 認証サービス
 """
-import jwt
+import logging
 from flask import current_app
 from datetime import datetime, timedelta
-from typing import Optional, Set, Tuple
+from typing import Optional, Tuple, Union
 
 from ..entities.user import User
 from ..value_objects.email import Email
+from ..value_objects.password import Password
 from ..value_objects.auth_token import AuthToken
+from ..value_objects.principal import Principal
 from ..repositories.user_repository import UserRepository
 from ..exceptions import AuthenticationError, ValidationError
+from .security_version_store import SecurityVersionStore
+from .token_revocation_store import TokenRevocationStore
+
+logger = logging.getLogger(__name__)
 
 class AuthService:
     """認証サービス"""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        revocation_store: TokenRevocationStore,
+        security_versions: SecurityVersionStore,
+        token_cache=None,
+        rehash_executor=None
+    ):
         """
         初期化
         
         Args:
             user_repository: ユーザーリポジトリ
+            revocation_store: 失効済みトークンのストア
+            security_versions: ユーザーごとのセキュリティバージョンの記録
+            token_cache: 検証済みトークンのキャッシュ（省略時はキャッシュしない）
+            rehash_executor: パスワード再ハッシュを実行するExecutor（省略時はログイン処理内で実行）
         """
         self.user_repository = user_repository
-        self._invalidated_tokens: Set[str] = set()  # 無効化されたトークンを保持
+        self.revocation_store = revocation_store
+        self.security_versions = security_versions
+        self.token_cache = token_cache
+        self.rehash_executor = rehash_executor
 
     def authenticate(self, email: str, password: str) -> tuple[User, AuthToken]:
         """
@@ -39,87 +59,195 @@ class AuthService:
         Raises:
             AuthenticationError: 認証に失敗した場合
         """
-        user = self.user_repository.find_by_email(Email(email))
+        user = self.user_repository.find_credentials_by_email(Email(email))
         if user is None or not user._password.verify(password):
             raise AuthenticationError("メールアドレスまたはパスワードが間違っています")
 
         if not user.is_active:
             raise AuthenticationError("アカウントが無効化されています")
 
+        # 旧方式のハッシュは現行の方針で再ハッシュする
+        if user._password.needs_rehash():
+            self._schedule_rehash(user, password)
+
         # トークンの生成
-        token = self._generate_token(user)
+        token = self.generate_token(user)
         return user, token
 
-    def _generate_token(self, user: User) -> AuthToken:
+    def _schedule_rehash(self, user: User, plain_password: str) -> None:
+        """
+        パスワードの再ハッシュを予約
+        
+        バックグラウンド実行時は別スレッドでアプリケーションコンテキストを作り直して保存する
+        """
+        old_hash = user._password._hashed_password
+        if self.rehash_executor is None:
+            self._rehash_password(user.id, str(user.email), old_hash, plain_password)
+            return
+        app = current_app._get_current_object()
+        self.rehash_executor.submit(
+            self._rehash_password_in_context, app, user.id, str(user.email), old_hash, plain_password
+        )
+
+    def _rehash_password_in_context(
+        self, app, user_id: str, email: str, old_hash: str, plain_password: str
+    ) -> None:
+        """アプリケーションコンテキスト内で再ハッシュを実行"""
+        with app.app_context():
+            try:
+                self._rehash_password(user_id, email, old_hash, plain_password)
+            except Exception:
+                logger.exception("パスワードの再ハッシュに失敗しました: user_id=%s", user_id)
+
+    def _rehash_password(self, user_id: str, email: str, old_hash: str, plain_password: str) -> None:
+        """
+        パスワードを現行の方針で再ハッシュして保存
+        
+        検証後にパスワード（またはメールアドレス）が変更されていた場合は何もしない
+        """
+        user = self.user_repository.find_credentials_by_email(Email(email))
+        if user is None or user.id != user_id or user._password._hashed_password != old_hash:
+            return
+        user.upgrade_password_hash(Password.rehash(plain_password))
+        self.user_repository.save(user)
+
+    def generate_token(self, user: User) -> AuthToken:
         """
         JWTトークンを生成
         
+        ロール・有効フラグ・セキュリティバージョンをクレームとして埋め込む
+        
         Args:
             user: ユーザー
             
         Returns:
             AuthToken: 生成されたトークン
         """
-        payload = {
-            'user_id': user.id,
-            'exp': datetime.utcnow() + timedelta(days=1)
-        }
-        token = jwt.encode(
-            payload,
+        return AuthToken.create(
+            user.id,
             current_app.config['SECRET_KEY'],
-            algorithm='HS256'
+            expiration=datetime.utcnow() + timedelta(days=1),
+            claims=Principal.claims_for(user)
         )
-        return AuthToken(token)
 
-    def verify_token(self, token: AuthToken) -> User:
+    def verify_token(self, token: AuthToken, claims_only: bool = False) -> Union[User, Principal]:
         """
         トークンを検証してユーザーを取得
         
         Args:
             token: 検証するトークン
+            claims_only: Trueの場合はクレームから組み立てたPrincipalを返し、
+                セキュリティバージョンの確認が必要な場合だけリポジトリを参照する
             
         Returns:
-            User: トークンに紐づくユーザー
+            Union[User, Principal]: トークンに紐づくユーザー（claims_only時はPrincipal）
             
         Raises:
             AuthenticationError: トークンが無効な場合
         """
+        if claims_only:
+            return self.verify_claims(token)[0]
+
+        # 検証済みトークンのキャッシュを確認（署名検証とDBアクセスを省略）
+        if self.token_cache is not None:
+            cached = self.token_cache.get(token.value)
+            if cached is not None:
+                user, token_id = cached
+                # 他ワーカーでの失効を反映するため失効ストアは毎回確認する
+                if self.revocation_store.is_revoked(token_id):
+                    self.token_cache.invalidate_token(token.value)
+                    raise AuthenticationError("トークンは無効化されています")
+                return user
+
         try:
-            # トークンをデコードしてユーザーIDを取得
-            user_id = token.decode(current_app.config['SECRET_KEY'])
+            # トークンをデコードしてペイロードを取得
+            payload = token.decode_payload(current_app.config['SECRET_KEY'])
+            token_id = token.token_id(payload)
             
-            # トークンが無効化リストに含まれていないことを確認
-            if token.value in self._invalidated_tokens:
+            # トークンが失効済みでないことを確認
+            if self.revocation_store.is_revoked(token_id):
                 raise AuthenticationError("トークンは無効化されています")
             
             # ユーザーを取得
-            user = self.user_repository.find_by_id(user_id)
-            if user is None:
-                raise AuthenticationError("ユーザーが見つかりません")
+            user = self._load_user(payload)
+
+            if self.token_cache is not None:
+                self.token_cache.put(token.value, user, token_id, float(payload['exp']))
                 
             return user
             
         except ValidationError as e:
             raise AuthenticationError(str(e))
 
-    def invalidate_token(self, token: AuthToken) -> None:
+    def verify_claims(self, token: AuthToken) -> Tuple[Principal, dict]:
+        """
+        トークンを検証し、クレームから組み立てたPrincipalと検証済みのペイロードを取得
+        
+        記録済みのセキュリティバージョンがトークンより新しい、または記録がない場合のみ
+        リポジトリからユーザーを読み込む。ペイロードは invalidate_token に渡すことで
+        同じトークンを再びデコードせずに済む
+        
+        Returns:
+            Tuple[Principal, dict]: 認証済みの主体とペイロード
+            
+        Raises:
+            AuthenticationError: トークンが無効な場合
+        """
+        try:
+            payload = token.decode_payload(current_app.config['SECRET_KEY'])
+        except ValidationError as e:
+            raise AuthenticationError(str(e))
+
+        if self.revocation_store.is_revoked(token.token_id(payload)):
+            raise AuthenticationError("トークンは無効化されています")
+
+        if Principal.has_claims(payload):
+            known_version = self.security_versions.latest(payload['user_id'])
+            if known_version is not None and known_version <= payload['sv']:
+                principal = Principal.from_claims(payload)
+                if not principal.is_active:
+                    raise AuthenticationError("アカウントが無効化されています")
+                return principal, payload
+
+        # クレームが古い可能性がある（または旧形式のトークン）ためDBで確認する
+        user = self._load_user(payload)
+        if not user.is_active:
+            raise AuthenticationError("アカウントが無効化されています")
+        return Principal.from_user(user), payload
+
+    def _load_user(self, payload: dict) -> User:
+        """
+        ペイロードのユーザーを読み込み、セキュリティバージョンを検証
+        
+        Raises:
+            AuthenticationError: ユーザーが存在しない、またはトークン発行後に認証情報が変わった場合
+        """
+        user = self.user_repository.find_by_id(payload['user_id'])
+        if user is None:
+            raise AuthenticationError("ユーザーが見つかりません")
+        self.security_versions.record(user.id, user.security_version)
+        if user.security_version > payload.get('sv', 0):
+            raise AuthenticationError("トークンは失効しています")
+        return user
+
+    def invalidate_token(self, token: AuthToken, claims: Optional[dict] = None) -> None:
         """
         トークンを無効化
         
         Args:
             token: 無効化するトークン
+            claims: verify_claims で検証済みのペイロード（省略時はここでデコードして検証する）
             
         Raises:
             ValidationError: トークンが無効な場合
+            ServiceUnavailableError: 失効ストアに登録できない場合
         """
-        try:
-            # トークンをデコードして有効性を確認
-            token.decode(current_app.config['SECRET_KEY'])
-            # 有効なトークンを無効化リストに追加
-            self._invalidated_tokens.add(token.value)
-        except ValidationError:
-            # トークンが無効な場合は例外を再送出
-            raise
+        # トークンをデコードして有効性を確認（無効な場合はValidationErrorが送出される）
+        payload = claims if claims is not None else token.decode_payload(current_app.config['SECRET_KEY'])
+        # 有効期限まで失効ストアに登録
+        self.revocation_store.revoke(token.token_id(payload), float(payload['exp']))
+        if self.token_cache is not None:
+            self.token_cache.invalidate_token(token.value)
 
     def is_token_valid(self, token: AuthToken) -> bool:
         """
@@ -133,8 +261,8 @@ class AuthService:
         """
         try:
             # トークンをデコードして有効性を確認
-            token.decode(current_app.config['SECRET_KEY'])
-            # 無効化リストに含まれていないことを確認
-            return token.value not in self._invalidated_tokens
+            payload = token.decode_payload(current_app.config['SECRET_KEY'])
+            # 失効済みでないことを確認
+            return not self.revocation_store.is_revoked(token.token_id(payload))
         except ValidationError:
             return False
\ No newline at end of file
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Dict, Sequence
 from ..entities.user import User
 
 class EmailService(ABC):
@@ -7,4 +8,21 @@ class EmailService(ABC):
     @abstractmethod
     def send_confirmation_email(self, user: User) -> None:
         """確認メールを送信"""
-        pass
\ No newline at end of file
+        pass
+
+    def send_confirmation_emails(self, users: Sequence[User]) -> Dict[str, Exception]:
+        """
+        複数のユーザーに確認メールを送信
+
+        1件の失敗で残りの送信を止めない。既定では1件ずつ send_confirmation_email を呼び出す
+
+        Returns:
+            Dict[str, Exception]: 送信に失敗したユーザーのIDと、その例外
+        """
+        failures = {}
+        for user in users:
+            try:
+                self.send_confirmation_email(user)
+            except Exception as e:
+                failures[user.id] = e
+        return failures
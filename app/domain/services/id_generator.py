@@ -0,0 +1,94 @@
+"""
+エンティティのIDの生成
+"""
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable
+
+# UUIDv7 の各フィールドの幅
+_TIMESTAMP_MASK = (1 << 48) - 1
+_COUNTER_MAX = (1 << 12) - 1
+_RANDOM_MASK = (1 << 62) - 1
+
+
+class IdGenerator(ABC):
+    """IDの生成のインターフェース"""
+
+    @abstractmethod
+    def new_id(self) -> str:
+        """新しいIDを生成（36文字のUUID文字列）"""
+        pass
+
+
+class UUIDv7Generator(IdGenerator):
+    """
+    時刻順に並ぶUUID（RFC 9562 のバージョン7）を生成する
+
+    先頭48ビットがミリ秒単位のUNIX時刻のため、生成した順に値（文字列としても）が大きくなり、
+    主キーのB木では末尾のページへの追記になる。同じミリ秒内では12ビットのカウンター（rand_a）を加算し、
+    このインスタンスで生成したIDの単調増加を保つ（時計が戻った場合も直前の時刻を使い続ける）
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns):
+        """
+        初期化
+
+        Args:
+            clock: 現在時刻（UNIX時刻のナノ秒）を返す関数
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_millis = -1
+        self._counter = 0
+
+    def new_id(self) -> str:
+        """新しいIDを生成"""
+        return str(self.new_uuid())
+
+    def new_uuid(self) -> uuid.UUID:
+        """新しいUUIDを生成"""
+        random_bits = int.from_bytes(os.urandom(10), 'big')
+        millis = self._clock() // 1_000_000
+        with self._lock:
+            if millis > self._last_millis:
+                # ミリ秒が進んだらカウンターを乱数で始める（上位1ビットは桁あふれの余地として空ける）
+                self._last_millis = millis
+                self._counter = (random_bits >> 62) & (_COUNTER_MAX >> 1)
+            elif self._counter < _COUNTER_MAX:
+                self._counter += 1
+            else:
+                # 同じミリ秒で使い切った場合は次のミリ秒を先取りする
+                self._last_millis += 1
+                self._counter = 0
+            millis, counter = self._last_millis, self._counter
+
+        value = (
+            (millis & _TIMESTAMP_MASK) << 80
+            | 0x7 << 76
+            | counter << 64
+            | 0b10 << 62
+            | random_bits & _RANDOM_MASK
+        )
+        return uuid.UUID(int=value)
+
+
+_id_generator: IdGenerator = UUIDv7Generator()
+
+
+def get_id_generator() -> IdGenerator:
+    """エンティティの作成で使用するIDの生成を取得"""
+    return _id_generator
+
+
+def set_id_generator(generator: IdGenerator) -> None:
+    """エンティティの作成で使用するIDの生成を設定"""
+    global _id_generator
+    _id_generator = generator
+
+
+def new_id() -> str:
+    """設定されたIDの生成で新しいIDを生成"""
+    return _id_generator.new_id()
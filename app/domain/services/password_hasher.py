@@ -0,0 +1,136 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# アルゴリズムごとのコストの既定値（werkzeug/bcryptの既定値に合わせる）
+#   scrypt: N = 2 ** cost
+#   pbkdf2: 反復回数
+#   bcrypt: ラウンド数（2 ** cost 回）
+DEFAULT_COSTS = {
+    'scrypt': 15,
+    'pbkdf2': 1_000_000,
+    'bcrypt': 12,
+}
+
+
+@dataclass(frozen=True)
+class PasswordHashPolicy:
+    """パスワードハッシュのアルゴリズムとコストの方針"""
+    algorithm: str = 'scrypt'
+    cost: Optional[int] = None
+
+    def __post_init__(self):
+        """初期化後の検証"""
+        if self.algorithm not in DEFAULT_COSTS:
+            raise ValueError(f"未対応のハッシュアルゴリズムです: {self.algorithm}")
+        if self.cost is None:
+            object.__setattr__(self, 'cost', DEFAULT_COSTS[self.algorithm])
+
+    @property
+    def method(self) -> str:
+        """ハッシュ文字列の先頭に記録されるメソッド表記"""
+        if self.algorithm == 'scrypt':
+            return f"scrypt:{2 ** self.cost}:8:1"
+        if self.algorithm == 'pbkdf2':
+            return f"pbkdf2:sha256:{self.cost}"
+        return f"$2b${self.cost:02d}$"
+
+    def hash(self, plain_password: str) -> str:
+        """平文のパスワードをハッシュ化"""
+        if self.algorithm == 'bcrypt':
+            bcrypt = _import_bcrypt()
+            return bcrypt.hashpw(
+                plain_password.encode('utf-8'), bcrypt.gensalt(rounds=self.cost)
+            ).decode('ascii')
+        return generate_password_hash(plain_password, method=self.method)
+
+    @staticmethod
+    def verify(hashed_password: str, plain_password: str) -> bool:
+        """平文のパスワードがハッシュと一致するか検証（ハッシュ側の方式で判定）"""
+        if hashed_password.startswith('$2'):
+            bcrypt = _import_bcrypt()
+            return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('ascii'))
+        return check_password_hash(hashed_password, plain_password)
+
+    @staticmethod
+    def is_supported_hash(hashed_password: str) -> bool:
+        """検証に対応した形式のハッシュ文字列かどうか"""
+        return hashed_password.startswith(('scrypt:', 'pbkdf2:', '$2a$', '$2b$', '$2y$'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """ハッシュがこの方針と異なるアルゴリズム・コストで生成されているか"""
+        if self.algorithm == 'bcrypt':
+            return not hashed_password.startswith(self.method)
+        return hashed_password.split('$', 1)[0] != self.method
+
+
+def _import_bcrypt():
+    """bcryptを遅延インポート"""
+    try:
+        import bcrypt
+    except ImportError as e:
+        raise RuntimeError("bcryptを使用するには bcrypt パッケージが必要です") from e
+    return bcrypt
+
+
+class PasswordHasher(ABC):
+    """パスワードハッシュ化サービスのインターフェース"""
+
+    @abstractmethod
+    def hash(self, plain_password: str) -> str:
+        """平文のパスワードをハッシュ化"""
+        pass
+
+    @abstractmethod
+    def verify(self, hashed_password: str, plain_password: str) -> bool:
+        """平文のパスワードがハッシュと一致するか検証"""
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """ハッシュを現行の方針で再生成すべきかどうか"""
+        pass
+
+    def hash_many(self, plain_passwords: Iterable[str]) -> List[str]:
+        """複数の平文パスワードを入力順にハッシュ化"""
+        return [self.hash(plain_password) for plain_password in plain_passwords]
+
+
+class InlinePasswordHasher(PasswordHasher):
+    """呼び出し元のスレッドでそのままハッシュ化する実装"""
+
+    def __init__(self, policy: PasswordHashPolicy = None):
+        """
+        初期化
+
+        Args:
+            policy: ハッシュの方針（省略時はwerkzeugの既定値）
+        """
+        self.policy = policy or PasswordHashPolicy()
+
+    def hash(self, plain_password: str) -> str:
+        """平文のパスワードをハッシュ化"""
+        return self.policy.hash(plain_password)
+
+    def verify(self, hashed_password: str, plain_password: str) -> bool:
+        """平文のパスワードがハッシュと一致するか検証"""
+        return self.policy.verify(hashed_password, plain_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """ハッシュを現行の方針で再生成すべきかどうか"""
+        return self.policy.needs_rehash(hashed_password)
+
+
+_password_hasher: PasswordHasher = InlinePasswordHasher()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Passwordが使用するハッシュ化サービスを取得"""
+    return _password_hasher
+
+
+def set_password_hasher(hasher: PasswordHasher) -> None:
+    """Passwordが使用するハッシュ化サービスを設定"""
+    global _password_hasher
+    _password_hasher = hasher
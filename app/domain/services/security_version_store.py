@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class SecurityVersionStore(ABC):
+    """観測したユーザーの最新セキュリティバージョンを保持するストアのインターフェース"""
+
+    @abstractmethod
+    def latest(self, user_id: str) -> Optional[int]:
+        """
+        記録済みの最新バージョンを取得
+
+        Returns:
+            Optional[int]: 未記録または記録を信頼できない場合はNone（呼び出し側はDBで確認する）
+        """
+        pass
+
+    @abstractmethod
+    def record(self, user_id: str, version: int) -> None:
+        """バージョンを記録"""
+        pass
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+
+class TokenRevocationStore(ABC):
+    """失効済みトークンIDを保持するストアのインターフェース"""
+
+    @abstractmethod
+    def revoke(self, token_id: str, expires_at: float) -> None:
+        """
+        トークンIDを失効済みとして登録
+
+        Args:
+            token_id: トークンID（jti）
+            expires_at: トークンの有効期限（UNIXタイムスタンプ）
+
+        Raises:
+            ServiceUnavailableError: 登録できない場合（失効済みのトークンを有効に戻さないため、登録を省略しない）
+        """
+        pass
+
+    @abstractmethod
+    def is_revoked(self, token_id: str) -> bool:
+        """トークンIDが失効済みかどうかを確認"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """有効期限を過ぎたエントリを削除し、削除件数を返す"""
+        pass
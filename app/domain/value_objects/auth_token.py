@@ -3,6 +3,8 @@
 """
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+import hashlib
+import uuid
 import jwt
 from app.domain.exceptions import ValidationError
 
@@ -17,25 +19,52 @@ class AuthToken:
         return self.value
 
     @classmethod
-    def create(cls, user_id: str, secret_key: str, expiration: datetime = None) -> 'AuthToken':
-        """トークンを生成する"""
+    def create(
+        cls,
+        user_id: str,
+        secret_key: str,
+        expiration: datetime = None,
+        claims: dict = None
+    ) -> 'AuthToken':
+        """
+        トークンを生成する
+
+        claimsにはロールなど、トークンに埋め込む追加のクレームを指定する
+        """
         if expiration is None:
             expiration = datetime.utcnow() + timedelta(days=1)
 
-        payload = {
+        payload = dict(claims or {})
+        payload.update({
             'user_id': user_id,
-            'exp': expiration
-        }
+            'exp': expiration,
+            'iat': datetime.utcnow(),
+            'jti': uuid.uuid4().hex
+        })
 
         token = jwt.encode(payload, secret_key, algorithm='HS256')
         return cls(token)
 
     def decode(self, secret_key: str) -> str:
         """トークンをデコードしてユーザーIDを取得する"""
+        return self.decode_payload(secret_key)['user_id']
+
+    def decode_payload(self, secret_key: str) -> dict:
+        """トークンを検証し、ペイロード全体を取得する"""
         try:
-            payload = jwt.decode(self.value, secret_key, algorithms=['HS256'])
-            return payload['user_id']
+            return jwt.decode(self.value, secret_key, algorithms=['HS256'])
         except jwt.ExpiredSignatureError:
             raise ValidationError("トークンの有効期限が切れています")
         except jwt.InvalidTokenError:
-            raise ValidationError("無効なトークンです")
\ No newline at end of file
+            raise ValidationError("無効なトークンです")
+
+    def token_id(self, payload: dict) -> str:
+        """
+        失効管理に使用するトークンIDを取得する
+
+        jtiを持たない旧形式のトークンはトークン文字列のハッシュで代用する
+        """
+        jti = payload.get('jti')
+        if jti:
+            return jti
+        return hashlib.sha256(self.value.encode('utf-8')).hexdigest()[:32]
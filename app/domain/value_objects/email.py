@@ -6,16 +6,47 @@ import re
 from app.domain.exceptions import ValidationError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Email:
-    """メールアドレスの値オブジェクト"""
+    """
+    メールアドレスの値オブジェクト
+
+    value は前後の空白を除いた入力どおりの表記を保持し、同一性の判定は
+    大文字・小文字を区別しない正規化した表記（normalized）で行う
+    """
     value: str
 
     def __post_init__(self):
-        """初期化後の検証"""
+        """初期化後の正規化と検証"""
+        if isinstance(self.value, str):
+            object.__setattr__(self, 'value', self.value.strip())
         if not self._is_valid_email(self.value):
             raise ValidationError("無効なメールアドレスです")
 
+    @staticmethod
+    def normalize(value: str) -> str:
+        """
+        メールアドレスを比較・検索用の表記に正規化する
+
+        形式はASCIIに限られるため、小文字化はデータベースの lower() と同じ結果になる
+        """
+        return value.strip().lower()
+
+    @property
+    def normalized(self) -> str:
+        """比較・検索用の正規化した表記"""
+        return self.normalize(self.value)
+
+    def __eq__(self, other) -> bool:
+        """正規化した表記で比較する"""
+        if not isinstance(other, Email):
+            return NotImplemented
+        return self.normalized == other.normalized
+
+    def __hash__(self) -> int:
+        """正規化した表記のハッシュ値を返す"""
+        return hash(self.normalized)
+
     @staticmethod
     def _is_valid_email(email: str) -> bool:
         """メールアドレスの形式を検証する"""
@@ -3,8 +3,8 @@
 """
 from dataclasses import dataclass
 import re
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.domain.exceptions import ValidationError
+from app.domain.services.password_hasher import get_password_hasher
 
 
 @dataclass(frozen=True)
@@ -15,16 +15,39 @@ class Password:
     @classmethod
     def create(cls, plain_password: str) -> 'Password':
         """平文のパスワードからインスタンスを生成する"""
+        cls.validate(plain_password)
+        hashed_password = get_password_hasher().hash(plain_password)
+        return cls(_hashed_password=hashed_password)
+
+    @classmethod
+    def rehash(cls, plain_password: str) -> 'Password':
+        """
+        検証済みの平文パスワードを現行のハッシュ方針で再ハッシュする
+
+        既存パスワードの移行用のため、パスワード要件の検証は行わない
+        """
+        return cls(_hashed_password=get_password_hasher().hash(plain_password))
+
+    @classmethod
+    def validate(cls, plain_password: str) -> None:
+        """
+        平文のパスワードが要件を満たすか検証する（ハッシュ化は行わない）
+
+        Raises:
+            ValidationError: 要件を満たさない場合
+        """
         if not cls._is_valid_password(plain_password):
             raise ValidationError(
                 "パスワードは8文字以上で、大文字、小文字、数字、特殊文字を含む必要があります"
             )
-        hashed_password = generate_password_hash(plain_password)
-        return cls(_hashed_password=hashed_password)
 
     def verify(self, plain_password: str) -> bool:
         """パスワードを検証する"""
-        return check_password_hash(self._hashed_password, plain_password)
+        return get_password_hasher().verify(self._hashed_password, plain_password)
+
+    def needs_rehash(self) -> bool:
+        """現行のハッシュ方針と異なる方式でハッシュ化されているかどうか"""
+        return get_password_hasher().needs_rehash(self._hashed_password)
 
     @staticmethod
     def _is_valid_password(password: str) -> bool:
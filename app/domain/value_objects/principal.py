@@ -0,0 +1,60 @@
+"""
+認証済み主体の値オブジェクト
+"""
+from dataclasses import dataclass
+from app.domain.value_objects.role import Role, RoleType
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    トークンのクレームから組み立てる軽量な認証済み主体
+
+    認可判定に必要な情報だけを持ち、ユーザー行の読み込みを必要としない
+    """
+    user_id: str
+    role: Role
+    is_active: bool
+    security_version: int
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> 'Principal':
+        """トークンのペイロードから生成する"""
+        return cls(
+            user_id=payload['user_id'],
+            role=Role(RoleType(payload['role'])),
+            is_active=bool(payload['active']),
+            security_version=int(payload['sv'])
+        )
+
+    @classmethod
+    def from_user(cls, user) -> 'Principal':
+        """ユーザーエンティティから生成する"""
+        return cls(
+            user_id=user.id,
+            role=user.role,
+            is_active=user.is_active,
+            security_version=user.security_version
+        )
+
+    @staticmethod
+    def claims_for(user) -> dict:
+        """ユーザーからトークンに埋め込むクレームを生成する"""
+        return {
+            'role': user.role.role_type.value,
+            'active': user.is_active,
+            'sv': user.security_version
+        }
+
+    @staticmethod
+    def has_claims(payload: dict) -> bool:
+        """ペイロードが主体のクレームを含むかどうか"""
+        return all(key in payload for key in ('role', 'active', 'sv'))
+
+    def is_super_admin(self) -> bool:
+        """スーパー管理者かどうかを判定する"""
+        return self.role.is_super_admin()
+
+    def is_admin(self) -> bool:
+        """管理者かどうかを判定する"""
+        return self.role.is_admin()
@@ -0,0 +1,36 @@
+"""
+データベース操作の計測
+"""
+from flask import Flask, g, has_app_context
+from sqlalchemy import event
+
+
+def _count_commit(session) -> None:
+    """コミットごとにアプリケーションコンテキストのカウンターを加算"""
+    if has_app_context():
+        g.db_commit_count = g.get('db_commit_count', 0) + 1
+
+
+def commit_count() -> int:
+    """現在のリクエスト（アプリケーションコンテキスト）で行われたコミット数"""
+    return g.get('db_commit_count', 0)
+
+
+def install_commit_counter(app: Flask, session) -> None:
+    """
+    セッションのコミット数を計測する
+
+    DB_METRICS_HEADERが有効な場合はレスポンスヘッダー X-DB-Commit-Count に出力する
+
+    Args:
+        app: Flaskアプリケーション
+        session: 計測対象のセッション（scoped_sessionも可）
+    """
+    if not event.contains(session, 'after_commit', _count_commit):
+        event.listen(session, 'after_commit', _count_commit)
+
+    if app.config.get('DB_METRICS_HEADER', False):
+        @app.after_request
+        def add_commit_count_header(response):
+            response.headers['X-DB-Commit-Count'] = str(commit_count())
+            return response
@@ -2,20 +2,62 @@
 SQLAlchemyのデータベースモデル
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Index, Integer, Text
 from ...domain.value_objects.role import RoleType
 from . import db
+from .types import UserIdType
 
 class UserModel(db.Model):
     """ユーザーモデル"""
     
     __tablename__ = 'users'
+    __table_args__ = (
+        # 一覧のキーセットページネーション (created_at, id) 用の複合インデックス
+        # 絞り込み条件の組み合わせごとに、等価条件の列を先頭に置く
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+        Index('ix_users_role_created_at_id', 'role', 'created_at', 'id'),
+        Index('ix_users_is_active_created_at_id', 'is_active', 'created_at', 'id'),
+        Index('ix_users_role_is_active_created_at_id', 'role', 'is_active', 'created_at', 'id'),
+        Index('ux_users_email_normalized', 'email_normalized', unique=True),
+    )
     
-    id = Column(String(36), primary_key=True)
+    # 時刻順のUUID文字列（保存形式は USER_ID_STORAGE に従い、36文字の文字列または16バイト）
+    id = Column(UserIdType(), primary_key=True)
     email = Column(String(255), unique=True, nullable=False)
+    # 大文字・小文字を区別しない検索と一意性のための正規化したメールアドレス（Email.normalized）
+    email_normalized = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
     name = Column(String(255), nullable=False)
     role = Column(Enum(RoleType), nullable=False)
     is_active = Column(Boolean, nullable=False, default=True)
+    security_version = Column(Integer, nullable=False, default=0, server_default='0')
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class OutboxMessageModel(db.Model):
+    """
+    送信待ちのメッセージ（トランザクショナルアウトボックス）
+
+    業務データと同じトランザクションで書き込み、確定後にディスパッチャーが送信する
+    """
+
+    __tablename__ = 'outbox_messages'
+    __table_args__ = (
+        # 送信待ちで送信時刻を過ぎたものを古い順に取り出すためのインデックス
+        Index('ix_outbox_messages_status_available_at_id', 'status', 'available_at', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # メッセージの種類（'confirmation_email' など）
+    kind = Column(String(50), nullable=False)
+    # 種類ごとの内容（JSON）
+    payload = Column(Text, nullable=False)
+    # 'pending'（送信待ち） / 'sent'（送信済み） / 'failed'（再試行の上限に達した）
+    status = Column(String(10), nullable=False, default='pending')
+    attempts = Column(Integer, nullable=False, default=0)
+    # 次に送信を試みる時刻（再試行時は待ち時間を加えた時刻）
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
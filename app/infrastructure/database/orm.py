@@ -1,50 +1,69 @@
-from sqlalchemy.orm import registry, composite
+from sqlalchemy import inspect
+from sqlalchemy.orm import registry, composite, defer
 from ...domain.entities.user import User
 from ...domain.value_objects.email import Email
 from ...domain.value_objects.password import Password
+from ...domain.value_objects.role import Role
 from .models import UserModel
 
 # SQLAlchemyのレジストリを作成
 mapper_registry = registry()
 
+# パスワードのハッシュを読み込まないローダーオプション（マッピングごとに1度だけ生成する）
+_credentials_deferred = None
+
 def start_mappers():
-    """SQLAlchemyマッパーの設定"""
-    
-    def email_composite_factory(value):
-        """Emailコンポジットファクトリ"""
-        if value is None:
-            return None
-        if isinstance(value, Email):
-            return value
-        return Email(value)
-
-    def password_composite_factory(value):
-        """Passwordコンポジットファクトリ"""
-        if value is None:
-            return None
-        if isinstance(value, Password):
-            return value
-        return Password(value)
+    """
+    SQLAlchemyマッパーの設定
+
+    User エンティティを users テーブルに直接マッピングし、値オブジェクトはコンポジットとして組み立てる。
+    UserModel を経由しないため、読み込み時にモデルとエンティティを二重に生成しない。
+    マッピングはプロセス全体の User クラスに作用するため、複数回呼び出しても1度だけ行う
+    """
+    if is_mapped():
+        return
 
+    table = UserModel.__table__
     mapper_registry.map_imperatively(
         User,
-        UserModel.__table__,
+        table,
         properties={
-            'id': UserModel.__table__.c.id,
-            '_email': composite(
-                email_composite_factory,
-                UserModel.__table__.c.email,
-                comparator_factory=lambda *args: UserModel.__table__.c.email.comparator,
-            ),
-            'name': UserModel.__table__.c.name,
-            '_password': composite(
-                password_composite_factory,
-                UserModel.__table__.c.password_hash,
-                comparator_factory=lambda *args: UserModel.__table__.c.password_hash.comparator,
-            ),
-            'is_active': UserModel.__table__.c.is_active,
-            'is_admin': UserModel.__table__.c.is_admin,
-            'created_at': UserModel.__table__.c.created_at,
-            'updated_at': UserModel.__table__.c.updated_at,
-        }
-    ) 
\ No newline at end of file
+            'id': table.c.id,
+            # コンポジットの元の列は User の公開属性（email プロパティなど）と衝突しないよう別名で割り当てる
+            '_email_column': table.c.email,
+            '_password_hash_column': table.c.password_hash,
+            '_role_column': table.c.role,
+            # 値オブジェクトはデータクラスのため、フィールドの順に列の値を渡して生成される
+            '_email': composite(Email, table.c.email),
+            'name': table.c.name,
+            '_password': composite(Password, table.c.password_hash),
+            'role': composite(Role, table.c.role),
+            'is_active': table.c.is_active,
+            'security_version': table.c.security_version,
+            'created_at': table.c.created_at,
+            'updated_at': table.c.updated_at,
+        },
+        # 正規化したメールアドレスは Email から導出できるため、エンティティには持たせない
+        exclude_properties=[table.c.email_normalized]
+    )
+
+def stop_mappers():
+    """SQLAlchemyマッパーの設定を解除（テスト用）"""
+    global _credentials_deferred
+    _credentials_deferred = None
+    mapper_registry.dispose()
+
+def credentials_deferred() -> tuple:
+    """
+    User の読み込みでパスワードのハッシュを除くローダーオプション
+
+    オプションの生成は読み込みごとに行うと無視できない負荷になるため、生成したものを使い回す
+    """
+    global _credentials_deferred
+    if _credentials_deferred is None:
+        _credentials_deferred = (defer(User._password_hash_column), defer(User._password))
+    return _credentials_deferred
+
+def is_mapped() -> bool:
+    """User エンティティがマッピング済みかどうか"""
+    return inspect(User, raiseerr=False) is not None
@@ -0,0 +1,90 @@
+"""
+データベース接続のプロファイル
+"""
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+# 本番プロファイルでSQLiteの接続ごとに設定するPRAGMA
+#   journal_mode=WAL: 読み取りと書き込みが互いをブロックしない
+#   synchronous=NORMAL: WALではコミットごとのfsyncを省いても破損しない（電源断時に直近のコミットのみ失われうる）
+#   busy_timeout: ロック待ちを即座にエラーにせず、指定ミリ秒まで待つ
+#   mmap_size / cache_size: 読み取りをメモリマップとページキャッシュで賄う（cache_sizeの負値はKiB単位）
+#   temp_store=MEMORY: ソートなどの一時データをメモリに置く
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def apply_database_profile(app: Flask) -> None:
+    """
+    DATABASE_PROFILE に応じて接続プールの設定を SQLALCHEMY_ENGINE_OPTIONS に反映する
+
+    'production' の場合は DATABASE_POOL_* の値でプールの大きさ・生存確認・再接続間隔を設定する。
+    個別に指定された SQLALCHEMY_ENGINE_OPTIONS の値が優先される。db.init_app より前に呼び出すこと
+    """
+    if app.config.get('DATABASE_PROFILE', 'default') != 'production':
+        return
+    if _is_memory_database(app.config['SQLALCHEMY_DATABASE_URI']):
+        # メモリ内データベースは接続を1つに固定するプールのため、大きさの指定は行わない
+        return
+    options = {
+        'pool_size': app.config.get('DATABASE_POOL_SIZE', 5),
+        'max_overflow': app.config.get('DATABASE_POOL_MAX_OVERFLOW', 10),
+        'pool_timeout': app.config.get('DATABASE_POOL_TIMEOUT_SECONDS', 30),
+        'pool_recycle': app.config.get('DATABASE_POOL_RECYCLE_SECONDS', 1800),
+        'pool_pre_ping': app.config.get('DATABASE_POOL_PRE_PING', True),
+    }
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def install_profile_events(app: Flask, engine: Engine) -> None:
+    """
+    DATABASE_PROFILE が 'production' でSQLiteの場合、接続ごとにPRAGMAを設定する
+
+    SQLITE_PRAGMAS で個別の値を上書きできる
+
+    Args:
+        app: Flaskアプリケーション
+        engine: 対象のエンジン（プライマリ・レプリカ）
+    """
+    if app.config.get('DATABASE_PROFILE', 'default') != 'production':
+        return
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = dict(SQLITE_PRODUCTION_PRAGMAS)
+    pragmas.update(app.config.get('SQLITE_PRAGMAS') or {})
+    install_sqlite_pragmas(engine, pragmas)
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """
+    エンジンが新しい接続を開くたびにPRAGMAを実行する
+
+    Args:
+        engine: SQLiteのエンジン
+        pragmas: PRAGMA名と値の辞書
+    """
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+
+
+def _is_memory_database(uri: str) -> bool:
+    """SQLiteのメモリ内データベースかどうか"""
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
@@ -0,0 +1,65 @@
+"""
+読み取り・書き込みのセッションの振り分け
+"""
+from flask import Flask, g, has_app_context
+from flask.globals import app_ctx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+# レプリカのエンジンを保持する app.extensions のキー
+REPLICA_ENGINE_KEY = 'sqlalchemy_replica_engine'
+
+
+class SessionRouter:
+    """
+    書き込みをプライマリ、読み取りをレプリカのセッションに振り分ける
+
+    同じリクエスト（アプリケーションコンテキスト）で書き込みを行った後は、
+    レプリカへの反映遅れで自分の書き込みが見えなくならないよう、読み取りもプライマリに送る
+    """
+
+    def __init__(self, primary: Session, replica: Session):
+        """
+        初期化
+
+        Args:
+            primary: 書き込み用のセッション（scoped_sessionも可）
+            replica: 読み取り用のセッション（scoped_sessionも可）
+        """
+        self.primary = primary
+        self.replica = replica
+
+    def reader(self) -> Session:
+        """読み取りに使うセッションを取得"""
+        if has_app_context() and g.get('db_read_your_writes', False):
+            return self.primary
+        return self.replica
+
+    def record_write(self) -> None:
+        """書き込みを記録し、以降の読み取りをプライマリに固定する"""
+        if has_app_context():
+            g.db_read_your_writes = True
+
+
+def create_replica_session(app: Flask):
+    """
+    SQLALCHEMY_REPLICA_URI のレプリカに接続する読み取り用セッションを作成
+
+    db.session と同じくアプリケーションコンテキストごとのscoped_sessionで、
+    コンテキストの終了時に破棄する。エンジンは app.extensions に保持する。
+    レプリカが設定されていない場合はNone
+
+    Args:
+        app: Flaskアプリケーション
+    """
+    replica_uri = app.config.get('SQLALCHEMY_REPLICA_URI')
+    if not replica_uri:
+        return None
+    engine = create_engine(replica_uri, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.extensions[REPLICA_ENGINE_KEY] = engine
+    session = scoped_session(
+        sessionmaker(bind=engine),
+        scopefunc=lambda: id(app_ctx._get_current_object())
+    )
+    app.teardown_appcontext(lambda exc: session.remove())
+    return session
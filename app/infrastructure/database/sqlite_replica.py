@@ -0,0 +1,72 @@
+"""
+ローカル開発・テスト用のSQLiteレプリカ
+"""
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+
+
+def sqlite_path(url) -> str:
+    """
+    SQLiteの接続URL（文字列またはURLオブジェクト）からファイルパスを取得
+
+    Raises:
+        ValueError: SQLiteファイルのURLでない場合
+    """
+    url = make_url(url)
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        raise ValueError(f"SQLiteファイルのURIではありません: {url}")
+    return url.database
+
+
+class SQLiteReplicaCopier:
+    """
+    プライマリのSQLiteファイルをレプリカのファイルに複製する
+
+    sqlite3のオンラインバックアップAPIを使うため、プライマリへの書き込み中でも
+    一貫した時点の内容が複製される。interval_seconds ごとに繰り返し複製して、
+    反映遅れのあるレプリカを手元で再現する
+    """
+
+    def __init__(self, primary_path: str, replica_path: str, interval_seconds: float = 1.0):
+        """
+        初期化
+
+        Args:
+            primary_path: プライマリのファイルパス
+            replica_path: レプリカのファイルパス
+            interval_seconds: start() で複製を繰り返す間隔
+        """
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sync(self) -> None:
+        """プライマリの現在の内容をレプリカに複製"""
+        with closing(sqlite3.connect(self.primary_path)) as primary, \
+                closing(sqlite3.connect(self.replica_path, timeout=5.0)) as replica:
+            primary.backup(replica)
+
+    def start(self) -> None:
+        """バックグラウンドスレッドで複製を繰り返す"""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name='sqlite-replica', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """複製の繰り返しを停止"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run(self) -> None:
+        """停止されるまで呼び出し元のスレッドで一定間隔に複製"""
+        while not self._stopped.is_set():
+            self.sync()
+            self._stopped.wait(self.interval_seconds)
@@ -0,0 +1,93 @@
+"""
+データベースの独自の型
+"""
+from typing import Optional
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import TypeDecorator
+
+# ユーザーIDの保存形式
+#   string: 36文字のUUID文字列（既定。UUID以外のIDもそのまま保存できる）
+#   binary: 16バイト（PostgreSQLでは uuid 型、それ以外では16バイトのバイナリ）
+USER_ID_STORAGES = ('string', 'binary')
+
+# 保存形式をエンジンごとに記録する方言の属性
+_STORAGE_ATTRIBUTE = 'user_id_storage'
+
+
+def configure_user_id_storage(engine: Engine, storage: str) -> None:
+    """
+    エンジンでのユーザーIDの保存形式を設定する
+
+    型の変換は方言ごとに初めて使用された時点で決まるため、エンジンの作成直後（create_all やクエリの前）に呼び出すこと
+
+    Args:
+        engine: 対象のエンジン（プライマリ・レプリカ）
+        storage: 'string' または 'binary'
+    """
+    if storage not in USER_ID_STORAGES:
+        raise ValueError(f"未対応のユーザーIDの保存形式です: {storage}")
+    setattr(engine.dialect, _STORAGE_ATTRIBUTE, storage)
+
+
+def user_id_storage(dialect) -> str:
+    """方言に設定されたユーザーIDの保存形式"""
+    return getattr(dialect, _STORAGE_ATTRIBUTE, 'string')
+
+
+class UserIdType(TypeDecorator):
+    """
+    ユーザーIDの型
+
+    アプリケーションでは常に36文字のUUID文字列として扱い、保存形式はエンジンの設定
+    （configure_user_id_storage）に従う。binary の場合、文字列の比較と同じ順序でバイト列が並ぶため、
+    時刻順のIDであれば主キーへの追記の局所性は変わらない
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if user_id_storage(dialect) != 'binary':
+            return dialect.type_descriptor(String(36))
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or user_id_storage(dialect) != 'binary' or dialect.name == 'postgresql':
+            return value
+        binary = uuid_to_bytes(value)
+        if binary is None:
+            # UUIDでない値（URLで指定された不正なIDなど）は16バイト以外のバイト列にし、どの行とも一致させない
+            encoded = value.encode('utf-8')
+            return encoded if len(encoded) != 16 else encoded + b'\0'
+        return binary
+
+    def process_result_value(self, value, dialect):
+        if value is None or user_id_storage(dialect) != 'binary' or dialect.name == 'postgresql':
+            return value
+        return bytes_to_uuid(value)
+
+
+def uuid_to_bytes(value: str) -> Optional[bytes]:
+    """
+    36文字のUUID文字列を16バイトに変換（UUIDでない場合はNone）
+
+    挿入・検索のたびに呼ばれるため、uuid.UUID を経由せずに16進数を直接変換する
+    """
+    if len(value) != 36 or value[8] != '-' or value[13] != '-' or value[18] != '-' or value[23] != '-':
+        return None
+    try:
+        binary = bytes.fromhex(value.replace('-', ''))
+    except ValueError:
+        return None
+    # bytes.fromhex は空白を読み飛ばすため、長さで確認する
+    return binary if len(binary) == 16 else None
+
+
+def bytes_to_uuid(value: bytes) -> str:
+    """16バイトを36文字の小文字のUUID文字列に変換"""
+    digits = bytes(value).hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
@@ -0,0 +1,82 @@
+"""
+既存のユーザーIDの保存形式の変換
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .types import USER_ID_STORAGES, bytes_to_uuid, uuid_to_bytes
+
+
+def convert_user_ids(engine: Engine, storage: str, batch_size: int = 1000) -> int:
+    """
+    users.id の既存の値を指定した保存形式に変換する
+
+    1つのトランザクションで変換し、UUIDとして解釈できないIDが1件でもあれば何も変更しない。
+    変換済みの行は対象にしないため、繰り返し実行してもよい。変換後は USER_ID_STORAGE を同じ値に設定すること
+
+    Args:
+        engine: プライマリのエンジン
+        storage: 変換後の保存形式（'string' または 'binary'）
+        batch_size: SQLiteで1回に読み出して更新する件数
+
+    Returns:
+        int: 変換した件数（PostgreSQLでは列の型の変更のため -1）
+
+    Raises:
+        ValueError: 保存形式が不正、UUIDでないIDがある、または未対応のデータベースの場合
+    """
+    if storage not in USER_ID_STORAGES:
+        raise ValueError(f"未対応のユーザーIDの保存形式です: {storage}")
+
+    with engine.begin() as connection:
+        if engine.dialect.name == 'sqlite':
+            return _convert_sqlite(connection, storage, batch_size)
+        if engine.dialect.name == 'postgresql':
+            # 列の型ごと変換する（値の検証は型の変換で行われる）
+            if storage == 'binary':
+                connection.execute(text("ALTER TABLE users ALTER COLUMN id TYPE uuid USING id::uuid"))
+            else:
+                connection.execute(text("ALTER TABLE users ALTER COLUMN id TYPE varchar(36) USING id::text"))
+            return -1
+    raise ValueError(f"ユーザーIDの変換に未対応のデータベースです: {engine.dialect.name}")
+
+
+def _convert_sqlite(connection: Connection, storage: str, batch_size: int) -> int:
+    """
+    SQLiteの users.id を1行ずつ書き換える
+
+    SQLiteは宣言された列の型にかかわらずBLOBをそのまま保存するため、列の定義は変更しない。
+    主キーのインデックスでは TEXT が BLOB より前に並ぶので、変換前の値だけを id の順に読み進める
+    """
+    source_type = 'text' if storage == 'binary' else 'blob'
+    select = text(
+        "SELECT id FROM users WHERE id > :after AND typeof(id) = :source_type ORDER BY id LIMIT :limit"
+    )
+    update = text("UPDATE users SET id = :new_id WHERE id = :old_id")
+
+    converted = 0
+    # 型の異なる値どうしの比較のため、最初の基準は両方の型より前に並ぶ空文字列・空のBLOBにする
+    after = '' if source_type == 'text' else b''
+    while True:
+        ids = connection.execute(
+            select, {'after': after, 'source_type': source_type, 'limit': batch_size}
+        ).scalars().all()
+        if not ids:
+            return converted
+        connection.execute(update, [
+            {'old_id': old_id, 'new_id': _convert_id(old_id, storage)} for old_id in ids
+        ])
+        converted += len(ids)
+        after = ids[-1]
+
+
+def _convert_id(value, storage: str):
+    """1件のIDを変換"""
+    if storage == 'string':
+        if len(value) != 16:
+            raise ValueError(f"16バイトでないユーザーIDは変換できません: {bytes(value)!r}")
+        return bytes_to_uuid(value)
+    binary = uuid_to_bytes(value)
+    if binary is None:
+        raise ValueError(f"UUIDでないユーザーIDは変換できません: {value!r}")
+    return binary
@@ -0,0 +1,209 @@
+"""
+キャッシュ付きユーザーリポジトリ
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+from flask import g, has_request_context
+
+from ...domain.repositories.unit_of_work import TransactionParticipant
+from ...domain.repositories.user_repository import UserRepository
+from ...domain.entities.user import User
+from ...domain.read_models.user_summary import UserPage, UserSummary
+from ...domain.value_objects.email import Email
+from ...domain.value_objects.role import RoleType
+from ..services.user_cache import UserCacheStats, UserEntityCache, email_key
+
+
+class CachingUserRepository(UserRepository, TransactionParticipant):
+    """
+    別のユーザーリポジトリの前段で検索結果をキャッシュするリポジトリ
+
+    1. リクエスト内の識別子マップ（flask.g）: 同じリクエストで読み込んだユーザーは
+       同じインスタンスを返す（トークン検証とユースケースで同じユーザーを引く場合など）
+    2. プロセス内キャッシュ（任意）: 他のスレッド・リクエストで直前に読み込んだユーザーを
+       TTLの範囲で再利用する。データベースから読み込んだ際に登録し、
+       保存の確定時に保存後コールバックで最新の値に置き換える
+
+    一覧・エクスポート・一括処理はキャッシュを経由せずにそのまま委譲する
+    """
+
+    def __init__(
+        self,
+        inner: UserRepository,
+        cache: Optional[UserEntityCache] = None,
+        stats: Optional[UserCacheStats] = None
+    ):
+        """
+        初期化
+
+        Args:
+            inner: 実際にデータベースへ問い合わせるリポジトリ
+            cache: プロセス内キャッシュ（省略時は識別子マップのみ）
+            stats: ヒット数の集計先
+        """
+        self.inner = inner
+        self.cache = cache
+        self.stats = stats or UserCacheStats()
+
+    @property
+    def autocommit(self) -> bool:
+        """書き込みごとに確定するかどうか（内側のリポジトリの設定）"""
+        return self.inner.autocommit
+
+    def save(self, user: User) -> User:
+        """ユーザーを保存し、識別子マップを保存後の値に置き換える"""
+        saved_user = self.inner.save(user)
+        identity_map = self._identity_map()
+        if identity_map is not None:
+            self._remember(identity_map, saved_user)
+        return saved_user
+
+    def find_by_id(self, user_id: str) -> Optional[User]:
+        """IDでユーザーを検索（識別子マップ → プロセス内キャッシュ → データベースの順）"""
+        identity_map = self._identity_map()
+        if identity_map is not None and user_id in identity_map['id']:
+            self.stats.record('identity_map_hits')
+            return identity_map['id'][user_id]
+        user = self.cache.get_by_id(user_id) if self.cache is not None else None
+        if user is not None:
+            self.stats.record('cache_hits')
+        else:
+            self.stats.record('misses')
+            user = self._fill(self.inner.find_by_id(user_id))
+        return self._loaded(identity_map, user)
+
+    def find_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        """
+        複数のIDのユーザーをまとめて検索
+
+        識別子マップ・プロセス内キャッシュにないIDだけを1度にデータベースへ問い合わせる
+        """
+        identity_map = self._identity_map()
+        users = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            if identity_map is not None and user_id in identity_map['id']:
+                self.stats.record('identity_map_hits')
+                users[user_id] = identity_map['id'][user_id]
+                continue
+            user = self.cache.get_by_id(user_id) if self.cache is not None else None
+            if user is not None:
+                self.stats.record('cache_hits')
+                users[user_id] = self._loaded(identity_map, user)
+            else:
+                self.stats.record('misses')
+                missing.append(user_id)
+        if missing:
+            for user_id, user in self.inner.find_by_ids(missing).items():
+                users[user_id] = self._loaded(identity_map, self._fill(user))
+        return users
+
+    def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索（識別子マップ → プロセス内キャッシュ → データベースの順）"""
+        identity_map = self._identity_map()
+        user = None
+        if identity_map is not None:
+            user = identity_map['email'].get(email_key(email))
+        if user is not None:
+            self.stats.record('identity_map_hits')
+            return user
+        user = self.cache.get_by_email(email) if self.cache is not None else None
+        if user is not None:
+            self.stats.record('cache_hits')
+        else:
+            self.stats.record('misses')
+            user = self._fill(self.inner.find_by_email(email))
+        return self._loaded(identity_map, user)
+
+    def find_credentials_by_email(self, email: Email) -> Optional[User]:
+        """パスワードのハッシュを含めて検索（認証用のため常にデータベースに問い合わせる）"""
+        return self.inner.find_credentials_by_email(email)
+
+    def exists_super_admin(self) -> bool:
+        """スーパー管理者が存在するかどうかを確認"""
+        return self.inner.exists_super_admin()
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """指定したメールアドレスのうち登録済みのものを取得"""
+        return self.inner.find_existing_emails(emails)
+
+    def add_many(self, users: Sequence[User]) -> None:
+        """新規ユーザーをまとめて追加"""
+        self.inner.add_many(users)
+
+    def iter_summaries(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> Iterator[UserSummary]:
+        """条件に合うユーザーを認証情報を含まない形で順に取得"""
+        return self.inner.iter_summaries(role=role, is_active=is_active, batch_size=batch_size)
+
+    def list_page(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> UserPage:
+        """作成日時の新しい順にユーザーを1ページ分取得"""
+        return self.inner.list_page(role=role, is_active=is_active, limit=limit, after=after)
+
+    def after_commit(self) -> None:
+        """ユニットオブワークの確定後の処理を委譲"""
+        if isinstance(self.inner, TransactionParticipant):
+            self.inner.after_commit()
+
+    def after_rollback(self) -> None:
+        """
+        ユニットオブワークの取り消し後、識別子マップを破棄する
+
+        取り消したトランザクション内で読み込んだ値をキャッシュに残さないよう、
+        このリクエストで読み込んだユーザーのキャッシュも削除する
+        """
+        if isinstance(self.inner, TransactionParticipant):
+            self.inner.after_rollback()
+        identity_map = self._identity_map()
+        if self.cache is not None and identity_map is not None:
+            for user_id in identity_map['id']:
+                self.cache.invalidate(user_id)
+        clear_identity_map()
+
+    def _fill(self, user: Optional[User]) -> Optional[User]:
+        """データベースから読み込んだユーザーをプロセス内キャッシュに登録"""
+        if user is not None and self.cache is not None:
+            self.cache.put(user)
+        return user
+
+    def _loaded(self, identity_map: Optional[dict], user: Optional[User]) -> Optional[User]:
+        """読み込んだユーザーを識別子マップに登録し、登録済みのインスタンスを返す"""
+        if user is None or identity_map is None:
+            return user
+        # IDで既に読み込まれていれば、同じインスタンスを返す
+        existing = identity_map['id'].get(user.id)
+        if existing is not None:
+            return existing
+        self._remember(identity_map, user)
+        return user
+
+    @staticmethod
+    def _remember(identity_map: dict, user: User) -> None:
+        """識別子マップに登録"""
+        identity_map['id'][user.id] = user
+        identity_map['email'][email_key(user.email)] = user
+
+    @staticmethod
+    def _identity_map() -> Optional[dict]:
+        """現在のリクエストの識別子マップ（リクエスト外ではNone）"""
+        if not has_request_context():
+            return None
+        if '_user_identity_map' not in g:
+            g._user_identity_map = {'id': {}, 'email': {}}
+        return g._user_identity_map
+
+
+def clear_identity_map(exc=None) -> None:
+    """現在のリクエストの識別子マップを破棄（teardown_request にも登録する）"""
+    if has_request_context():
+        g.pop('_user_identity_map', None)
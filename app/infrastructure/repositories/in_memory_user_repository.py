@@ -0,0 +1,332 @@
+"""
+メモリ内のユーザーリポジトリ
+"""
+import dataclasses
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ...domain.entities.user import User
+from ...domain.exceptions import UserAlreadyExistsError
+from ...domain.read_models.user_summary import UserPage, UserSummary
+from ...domain.repositories.unit_of_work import TransactionParticipant, UnitOfWork
+from ...domain.repositories.user_repository import UserRepository
+from ...domain.value_objects.email import Email
+from ...domain.value_objects.role import RoleType
+
+
+class InMemoryUserStore:
+    """
+    プロセス内でユーザーを保持するストア（データベースの代わり）
+
+    ID・正規化したメールアドレス・ロールの辞書で索引を持つ。
+    複数のリポジトリ・スレッドから共有するため、操作はロックの内側で行う
+    """
+
+    def __init__(self):
+        """初期化"""
+        self.lock = threading.RLock()
+        self.by_id: Dict[str, User] = {}
+        self.ids_by_email: Dict[str, str] = {}
+        self.ids_by_role: Dict[RoleType, Set[str]] = {}
+
+    def put(self, user: User) -> None:
+        """
+        ユーザーを登録・置き換え（ロック取得済みで呼び出す）
+
+        Raises:
+            UserAlreadyExistsError: 別のユーザーが同じメールアドレスで登録されている場合
+        """
+        key = user.email.normalized
+        owner = self.ids_by_email.get(key)
+        if owner is not None and owner != user.id:
+            raise UserAlreadyExistsError("このメールアドレスは既に登録されています")
+        self.remove(user.id)
+        self.by_id[user.id] = user
+        self.ids_by_email[key] = user.id
+        self.ids_by_role.setdefault(user.role.role_type, set()).add(user.id)
+
+    def remove(self, user_id: str) -> Optional[User]:
+        """ユーザーと索引を削除し、削除したユーザーを返す（ロック取得済みで呼び出す）"""
+        user = self.by_id.pop(user_id, None)
+        if user is not None:
+            del self.ids_by_email[user.email.normalized]
+            self.ids_by_role[user.role.role_type].discard(user_id)
+        return user
+
+    def clear(self) -> None:
+        """全てのユーザーを削除"""
+        with self.lock:
+            self.by_id.clear()
+            self.ids_by_email.clear()
+            self.ids_by_role.clear()
+
+
+class InMemoryUserRepository(UserRepository, TransactionParticipant):
+    """
+    InMemoryUserStore を使用したユーザーリポジトリの実装
+
+    テストやベンチマークで、データベースを使わずにユースケースを実行するために使う。
+    保存・検索の結果は SQLAlchemyUserRepository と同じ振る舞いになるよう、
+    保持するエンティティは複製し、通常の検索ではパスワードのハッシュを含めない。
+    トランザクション中の書き込みはストアに直接反映し、取り消し時に元に戻す
+    （確定前の書き込みが他のリポジトリから見える点はデータベースと異なる）
+    """
+
+    def __init__(
+        self,
+        store: Optional[InMemoryUserStore] = None,
+        save_listeners: Iterable[Callable[[User], None]] = (),
+        autocommit: bool = True
+    ):
+        """
+        初期化
+
+        Args:
+            store: ユーザーを保持するストア（省略時は新しく作成）
+            save_listeners: 保存の確定後に保存されたユーザーを受け取るコールバック
+            autocommit: Falseの場合はユニットオブワークの確定まで保存後コールバックを保留する
+        """
+        self.store = store if store is not None else InMemoryUserStore()
+        self.save_listeners = list(save_listeners)
+        self.autocommit = autocommit
+        self._pending_saved: List[User] = []
+        # 取り消し時に戻すための (ユーザーID, 書き込み前のユーザー) の記録
+        self._undo_log: List[Tuple[str, Optional[User]]] = []
+
+    def save(self, user: User) -> User:
+        """
+        ユーザーを保存
+
+        パスワードのハッシュを読み込んでいないユーザーは、既存のハッシュを維持して更新する
+
+        Raises:
+            UserAlreadyExistsError: 別のユーザーが同じメールアドレスで登録されている場合
+        """
+        with self.store.lock:
+            previous = self.store.by_id.get(user.id)
+            stored = dataclasses.replace(user)
+            if not user.has_credentials:
+                if previous is None:
+                    raise ValueError("認証情報を読み込んでいない新規ユーザーは保存できません")
+                stored._password = previous._password
+            if previous is not None:
+                # 作成日時は初回保存時の値を維持する
+                stored.created_at = previous.created_at
+            self.store.put(stored)
+            self._record_undo(user.id, previous)
+        saved_user = self._projection(stored) if not user.has_credentials else dataclasses.replace(stored)
+        self._commit(saved_user)
+        return saved_user
+
+    def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索（大文字・小文字は区別せず、パスワードのハッシュは含めない）"""
+        user = self._get_by_email(email)
+        return self._projection(user) if user is not None else None
+
+    def find_by_id(self, user_id: str) -> Optional[User]:
+        """IDでユーザーを検索（パスワードのハッシュは含めない）"""
+        with self.store.lock:
+            user = self.store.by_id.get(user_id)
+        return self._projection(user) if user is not None else None
+
+    def find_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        """複数のIDのユーザーをまとめて検索（パスワードのハッシュは含めない）"""
+        with self.store.lock:
+            users = [self.store.by_id.get(user_id) for user_id in user_ids]
+        return {user.id: self._projection(user) for user in users if user is not None}
+
+    def find_credentials_by_email(self, email: Email) -> Optional[User]:
+        """パスワードのハッシュを含めてメールアドレスでユーザーを検索（認証用）"""
+        user = self._get_by_email(email)
+        return dataclasses.replace(user) if user is not None else None
+
+    def exists_super_admin(self) -> bool:
+        """スーパー管理者が存在するかどうかを確認"""
+        with self.store.lock:
+            return bool(self.store.ids_by_role.get(RoleType.SUPER_ADMIN))
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """指定したメールアドレスのうち登録済みのものを正規化した表記で取得"""
+        normalized = {Email.normalize(str(email)) for email in emails}
+        with self.store.lock:
+            return {email for email in normalized if email in self.store.ids_by_email}
+
+    def add_many(self, users: Sequence[User]) -> None:
+        """
+        新規ユーザーをまとめて追加
+
+        Raises:
+            UserAlreadyExistsError: 既存ユーザーとIDまたはメールアドレスが重複する場合（それまでの追加は取り消す）
+        """
+        with self.store.lock:
+            added = []
+            try:
+                for user in users:
+                    if user.id in self.store.by_id:
+                        raise UserAlreadyExistsError("このユーザーは既に登録されています")
+                    self.store.put(dataclasses.replace(user))
+                    added.append(user.id)
+            except UserAlreadyExistsError:
+                for user_id in added:
+                    self.store.remove(user_id)
+                raise
+            for user_id in added:
+                self._record_undo(user_id, None)
+        # save と同じく保存後コールバックを呼び出す（autocommitでない場合は確定まで保留）
+        for user in users:
+            self._commit(dataclasses.replace(user))
+
+    def iter_summaries(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> Iterator[UserSummary]:
+        """条件に合うユーザーを認証情報を含まない形でID順に取得（batch_size 件ずつ複製する）"""
+        ids = iter(sorted(u.id for u in self._filter(role, is_active)))
+        while True:
+            batch = list(islice(ids, batch_size))
+            if not batch:
+                return
+            with self.store.lock:
+                users = [self.store.by_id.get(user_id) for user_id in batch]
+            for user in users:
+                if user is not None:
+                    yield self._summary(user)
+
+    def list_page(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> UserPage:
+        """作成日時の新しい順に、after の (created_at, id) より後のユーザーを最大 limit 件取得"""
+        users = self._filter(role, is_active)
+        if after is not None:
+            users = [user for user in users if (user.created_at, user.id) < tuple(after)]
+        users.sort(key=lambda user: (user.created_at, user.id), reverse=True)
+        items = [self._summary(user) for user in users[:limit + 1]]
+        if len(items) <= limit:
+            return UserPage(items=items)
+        items = items[:limit]
+        return UserPage(items=items, next_key=(items[-1].created_at, items[-1].id))
+
+    def _get_by_email(self, email: Email) -> Optional[User]:
+        """正規化したメールアドレスの索引でストアのユーザーを取得"""
+        with self.store.lock:
+            user_id = self.store.ids_by_email.get(email.normalized)
+            return self.store.by_id.get(user_id) if user_id is not None else None
+
+    def _filter(self, role: Optional[RoleType], is_active: Optional[bool]) -> List[User]:
+        """ロールの索引と有効状態でユーザーを絞り込む"""
+        with self.store.lock:
+            if role is None:
+                users = list(self.store.by_id.values())
+            else:
+                users = [self.store.by_id[user_id] for user_id in self.store.ids_by_role.get(role, ())]
+        if is_active is not None:
+            users = [user for user in users if user.is_active == is_active]
+        return users
+
+    @staticmethod
+    def _projection(user: User) -> User:
+        """パスワードのハッシュを除いた複製"""
+        return dataclasses.replace(user, _password=None)
+
+    @staticmethod
+    def _summary(user: User) -> UserSummary:
+        """一覧・エクスポート用の読み取りモデルに変換"""
+        return UserSummary(
+            id=user.id,
+            email=str(user.email),
+            name=user.name,
+            role=user.role.role_type,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        )
+
+    def _record_undo(self, user_id: str, previous: Optional[User]) -> None:
+        """トランザクション中であれば書き込み前の状態を記録"""
+        if not self.autocommit:
+            self._undo_log.append((user_id, previous))
+
+    def _commit(self, saved_user: User) -> None:
+        """保存後コールバックを呼び出す（autocommitでない場合は確定まで保留）"""
+        if self.autocommit:
+            self._notify_saved(saved_user)
+        else:
+            self._pending_saved.append(saved_user)
+
+    def after_commit(self) -> None:
+        """ユニットオブワークの確定後に保留中の通知を送る"""
+        self._undo_log = []
+        pending, self._pending_saved = self._pending_saved, []
+        for user in pending:
+            self._notify_saved(user)
+
+    def after_rollback(self) -> None:
+        """ユニットオブワークの取り消し後に書き込みを元に戻し、保留中の通知を破棄する"""
+        undo_log, self._undo_log = self._undo_log, []
+        with self.store.lock:
+            for user_id, previous in reversed(undo_log):
+                self.store.remove(user_id)
+                if previous is not None:
+                    self.store.put(previous)
+        self._pending_saved = []
+
+    def _notify_saved(self, user: User) -> None:
+        """保存後コールバックを呼び出す"""
+        for listener in self.save_listeners:
+            listener(user)
+
+
+class InMemoryUnitOfWork(UnitOfWork):
+    """InMemoryUserRepository の書き込みを取り消し可能な単位にまとめるユニットオブワーク"""
+
+    def __init__(
+        self,
+        store: InMemoryUserStore,
+        user_repository_factory: Callable[..., InMemoryUserRepository] = InMemoryUserRepository,
+        batch_size: Optional[int] = None
+    ):
+        """
+        初期化
+
+        Args:
+            store: ユーザーを保持するストア
+            user_repository_factory: ストアと autocommit=False を受け取ってリポジトリを生成する関数
+            batch_size: checkpoint() で途中確定する書き込み件数（省略時は途中確定しない）
+        """
+        super().__init__()
+        self.store = store
+        self.users = user_repository_factory(store, autocommit=False)
+        self.enlist(self.users)
+        self.batch_size = batch_size
+        self.commit_count = 0
+        self._pending_writes = 0
+
+    def commit(self) -> None:
+        """保留中の書き込みを確定"""
+        self.commit_count += 1
+        self._pending_writes = 0
+        self._notify_committed()
+
+    def rollback(self) -> None:
+        """保留中の書き込みを取り消す"""
+        self._pending_writes = 0
+        self._notify_rolled_back()
+
+    def checkpoint(self, writes: int = 1) -> None:
+        """
+        書き込み件数を記録し、バッチサイズに達していれば途中で確定する
+
+        Args:
+            writes: 今回記録する書き込み件数
+        """
+        self._pending_writes += writes
+        if self.batch_size and self._pending_writes >= self.batch_size:
+            self.commit()
@@ -0,0 +1,58 @@
+"""
+SQLAlchemyを使用したユニットオブワークの実装
+"""
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+
+from ...domain.repositories.unit_of_work import UnitOfWork
+from .user_repository import SQLAlchemyUserRepository
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """SQLAlchemyのセッションのトランザクションを境界とするユニットオブワーク"""
+
+    def __init__(
+        self,
+        session: Session,
+        user_repository_factory: Callable[..., SQLAlchemyUserRepository] = SQLAlchemyUserRepository,
+        batch_size: Optional[int] = None
+    ):
+        """
+        初期化
+
+        Args:
+            session: SQLAlchemyのセッション
+            user_repository_factory: セッションと autocommit=False を受け取ってリポジトリを生成する関数
+            batch_size: checkpoint() で途中確定する書き込み件数（省略時は途中確定しない）
+        """
+        super().__init__()
+        self.session = session
+        self.users = user_repository_factory(session, autocommit=False)
+        self.enlist(self.users)
+        self.batch_size = batch_size
+        self.commit_count = 0
+        self._pending_writes = 0
+
+    def commit(self) -> None:
+        """保留中の書き込みを確定"""
+        self.session.commit()
+        self.commit_count += 1
+        self._pending_writes = 0
+        self._notify_committed()
+
+    def rollback(self) -> None:
+        """保留中の書き込みを取り消す"""
+        self.session.rollback()
+        self._pending_writes = 0
+        self._notify_rolled_back()
+
+    def checkpoint(self, writes: int = 1) -> None:
+        """
+        書き込み件数を記録し、バッチサイズに達していれば途中で確定する
+
+        Args:
+            writes: 今回記録する書き込み件数
+        """
+        self._pending_writes += writes
+        if self.batch_size and self._pending_writes >= self.batch_size:
+            self.commit()
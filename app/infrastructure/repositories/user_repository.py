@@ -1,32 +1,170 @@
 """
 SQLAlchemyを使用したユーザーリポジトリの実装
 """
-from typing import Optional
-from sqlalchemy.orm import Session
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, attributes
 
+from ...domain.repositories.unit_of_work import TransactionParticipant
 from ...domain.repositories.user_repository import UserRepository
 from ...domain.entities.user import User
+from ...domain.exceptions import UserAlreadyExistsError
+from ...domain.read_models.user_summary import UserPage, UserSummary
 from ...domain.value_objects.email import Email
 from ...domain.value_objects.password import Password
 from ...domain.value_objects.role import Role, RoleType
 from ..database.models import UserModel
+from ..database.orm import credentials_deferred, start_mappers
+from ..database.routing import SessionRouter
 
-class SQLAlchemyUserRepository(UserRepository):
+
+# メールアドレスの一意制約の名前（email は UniqueConstraint('email') のPostgreSQLでの既定の名前）
+EMAIL_UNIQUE_CONSTRAINTS = frozenset({'ux_users_email_normalized', 'users_email_key'})
+# SQLiteのメッセージに含まれる列（テーブル名.列名）
+EMAIL_UNIQUE_COLUMNS = frozenset({'users.email', 'users.email_normalized'})
+# MySQLのメッセージに含まれるキー（テーブル名.キー名、8.0.19より前はキー名のみ）
+EMAIL_UNIQUE_KEYS = frozenset({'users.email', 'users.ux_users_email_normalized'})
+
+_SQLITE_UNIQUE = re.compile(r"UNIQUE constraint failed: ([\w., ]+)")
+_POSTGRESQL_UNIQUE = re.compile(r'unique constraint "([^"]+)"')
+_MYSQL_DUPLICATE = re.compile(r"Duplicate entry '.*' for key '([^']+)'", re.DOTALL)
+
+
+def _is_email_conflict(error: IntegrityError) -> bool:
+    """
+    一意制約違反がメールアドレスの一意制約（email / email_normalized）によるものかどうか
+
+    PostgreSQLはドライバーが返す制約名（diag.constraint_name）で判定する。
+    取得できない場合はメッセージから制約名・列名を取り出し、既知の名前と完全に一致するかで判定する
+
+    - SQLite: "UNIQUE constraint failed: users.email_normalized"
+    - PostgreSQL: 'duplicate key value violates unique constraint "ux_users_email_normalized"'
+    - MySQL: "Duplicate entry 'a@example.com' for key 'users.email'"
+    """
+    constraint_name = getattr(getattr(error.orig, 'diag', None), 'constraint_name', None)
+    if constraint_name:
+        return constraint_name in EMAIL_UNIQUE_CONSTRAINTS
+
+    message = str(error.orig)
+    match = _SQLITE_UNIQUE.search(message)
+    if match:
+        return any(column.strip() in EMAIL_UNIQUE_COLUMNS for column in match.group(1).split(','))
+    match = _POSTGRESQL_UNIQUE.search(message)
+    if match:
+        return match.group(1) in EMAIL_UNIQUE_CONSTRAINTS
+    match = _MYSQL_DUPLICATE.search(message)
+    if match:
+        key = match.group(1)
+        return (key if '.' in key else f"users.{key}") in EMAIL_UNIQUE_KEYS
+    return False
+
+
+class SQLAlchemyUserRepository(UserRepository, TransactionParticipant):
     """SQLAlchemyを使用したユーザーリポジトリの実装"""
+
+    # IN句1回あたりのバインド変数の上限（SQLiteの既定の上限999を下回る値）
+    IN_CLAUSE_BATCH_SIZE = 500
     
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        save_listeners: Iterable[Callable[[User], None]] = (),
+        autocommit: bool = True,
+        router: Optional[SessionRouter] = None,
+        load_entities: bool = False
+    ):
         """
         初期化
         
         Args:
             session: SQLAlchemyのセッション
+            save_listeners: ユーザー保存後に呼び出されるコールバック（キャッシュの無効化など）
+            autocommit: Falseの場合は書き込みごとにコミットせず、ユニットオブワークに確定を任せる
+            router: 読み取りをレプリカに振り分ける場合のルーター（書き込みは常に session）
+            load_entities: Trueの場合は orm.start_mappers のマッピングで User を直接読み込み、
+                UserModel を経由しない
         """
         self.session = session
+        self.save_listeners = list(save_listeners)
+        self.autocommit = autocommit
+        self.router = router
+        self.load_entities = load_entities
+        if load_entities:
+            start_mappers()
+        self._pending_saved = []
     
     def save(self, user: User) -> User:
         """
         ユーザーを保存
         
+        SQLite・PostgreSQLでは INSERT ... ON CONFLICT DO UPDATE ... RETURNING の1文で
+        挿入・更新と保存後の行の取得を行う
+        
+        メールアドレスの重複はデータベースの一意制約で検出するため、事前の検索は不要
+        
+        Args:
+            user: 保存するユーザー
+            
+        Returns:
+            User: 保存されたユーザー
+            
+        Raises:
+            UserAlreadyExistsError: 別のユーザーが同じメールアドレスで登録されている場合
+        """
+        self._record_write()
+        statement = self._upsert_statement(self._to_row(user))
+        if statement is None:
+            return self._save_with_orm(user)
+
+        with self._translate_email_conflict():
+            row = self.session.execute(statement).one()
+        saved_user = self._to_entity(row)
+        self._commit(saved_user)
+        return saved_user
+
+    def _upsert_statement(self, values: dict):
+        """
+        方言に応じたUPSERT文を生成
+        
+        パスワードのハッシュを含まない場合は既存の行を更新するUPDATE文を生成する
+        
+        Returns:
+            UPSERT文。対応していない方言の場合はNone
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            return None
+
+        table = UserModel.__table__
+        if 'password_hash' not in values:
+            # 認証情報を読み込んでいないユーザーは既存の行のみ更新し、ハッシュはそのまま残す
+            return update(table).where(table.c.id == values['id']).values(**{
+                name: value for name, value in values.items() if name not in ('id', 'created_at')
+            }).returning(*self._columns(credentials=False))
+        statement = insert(table).values(**values)
+        # 作成日時は初回挿入時の値を維持する
+        update_columns = {
+            name: statement.excluded[name]
+            for name in values
+            if name not in ('id', 'created_at')
+        }
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_=update_columns
+        ).returning(*table.c)
+
+    def _save_with_orm(self, user: User) -> User:
+        """
+        ORMで既存行を読み込んでから保存（UPSERTに対応していない方言向け）
+        
         Args:
             user: 保存するユーザー
             
@@ -38,63 +176,246 @@ class SQLAlchemyUserRepository(UserRepository):
 
         if existing_user:
             # 既存のユーザーを更新
-            existing_user.email = str(user.email)
-            existing_user.password_hash = user._password._hashed_password
-            existing_user.name = user.name
-            existing_user.role = user.role.role_type
-            existing_user.is_active = user.is_active
-            existing_user.updated_at = user.updated_at
+            for name, value in self._to_row(user).items():
+                if name not in ('id', 'created_at'):
+                    setattr(existing_user, name, value)
         else:
             # 新規ユーザーを作成
-            user_model = UserModel(
-                id=user.id,
-                email=str(user.email),
-                password_hash=user._password._hashed_password,
-                name=user.name,
-                role=user.role.role_type,
-                is_active=user.is_active,
-                created_at=user.created_at,
-                updated_at=user.updated_at
-            )
+            user_model = UserModel(**self._to_row(user))
             self.session.add(user_model)
 
-        self.session.commit()
-        return self._to_entity(existing_user if existing_user else user_model)
+        with self._translate_email_conflict():
+            self.session.flush()
+        saved_user = self._to_entity(existing_user if existing_user else user_model)
+        self._commit(saved_user)
+        return saved_user
+
+    @staticmethod
+    def _to_row(user: User) -> dict:
+        """
+        ドメインエンティティを列の値に変換
+        
+        パスワードのハッシュを読み込んでいないユーザーは password_hash を含めない
+        
+        Args:
+            user: ドメインエンティティ
+            
+        Returns:
+            dict: 列名と値の辞書
+        """
+        row = {
+            'id': user.id,
+            'email': str(user.email),
+            'email_normalized': user.email.normalized,
+            'name': user.name,
+            'role': user.role.role_type,
+            'is_active': user.is_active,
+            'security_version': user.security_version,
+            'created_at': user.created_at,
+            'updated_at': user.updated_at
+        }
+        if user.has_credentials:
+            row['password_hash'] = user._password._hashed_password
+        return row
     
     def find_by_email(self, email: Email) -> Optional[User]:
         """
         メールアドレスでユーザーを検索
         
+        大文字・小文字を区別せず、正規化したメールアドレスのインデックスで検索する。
+        パスワードのハッシュは読み込まない（認証には find_credentials_by_email を使う）
+        
         Args:
             email: 検索するメールアドレス
             
         Returns:
             Optional[User]: 見つかったユーザー、見つからない場合はNone
         """
-        user_model = self.session.query(UserModel).filter_by(email=str(email)).first()
-        if not user_model:
-            return None
-        return self._to_entity(user_model)
+        return self._find_one(UserModel.__table__.c.email_normalized == email.normalized)
+
+    def find_credentials_by_email(self, email: Email) -> Optional[User]:
+        """
+        パスワードのハッシュを含めてメールアドレスでユーザーを検索（認証用）
+        
+        Args:
+            email: 検索するメールアドレス
+            
+        Returns:
+            Optional[User]: 見つかったユーザー、見つからない場合はNone
+        """
+        return self._find_one(
+            UserModel.__table__.c.email_normalized == email.normalized, credentials=True
+        )
     
     def find_by_id(self, user_id: str) -> Optional[User]:
         """
         IDでユーザーを検索
         
+        トークンの検証ごとに呼ばれるため、パスワードのハッシュは読み込まない
+        
         Args:
             user_id: 検索するユーザーID
             
         Returns:
             Optional[User]: 見つかったユーザー、見つからない場合はNone
         """
-        user_model = self.session.query(UserModel).filter_by(id=user_id).first()
-        if not user_model:
-            return None
-        return self._to_entity(user_model)
+        return self._find_one(UserModel.__table__.c.id == user_id)
+
+    def find_by_ids(self, user_ids: Iterable[str]) -> Dict[str, User]:
+        """
+        複数のIDのユーザーをまとめて検索（パスワードのハッシュは読み込まない）
+        
+        IN句のバインド変数が上限を超えないよう IN_CLAUSE_BATCH_SIZE 件ずつ問い合わせる
+        
+        Args:
+            user_ids: 検索するユーザーID
+            
+        Returns:
+            Dict[str, User]: 見つかったユーザー（IDごと、見つからないIDは含まない）
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        id_column = UserModel.__table__.c.id
+        users = {}
+        for start in range(0, len(user_ids), self.IN_CLAUSE_BATCH_SIZE):
+            batch = user_ids[start:start + self.IN_CLAUSE_BATCH_SIZE]
+            users.update((user.id, user) for user in self._find_all(id_column.in_(batch)))
+        return users
     
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """
+        指定したメールアドレスのうち登録済みのものを取得
+        
+        IN句のバインド変数が上限を超えないよう IN_CLAUSE_BATCH_SIZE 件ずつ問い合わせる。
+        直後の挿入の重複除外に使うため、レプリカではなくプライマリに問い合わせる
+        
+        Args:
+            emails: 確認するメールアドレス
+            
+        Returns:
+            Set[str]: 登録済みのメールアドレス（Email.normalize で正規化した表記）
+        """
+        emails = list(dict.fromkeys(Email.normalize(str(email)) for email in emails))
+        email_column = UserModel.__table__.c.email_normalized
+        existing = set()
+        for start in range(0, len(emails), self.IN_CLAUSE_BATCH_SIZE):
+            batch = emails[start:start + self.IN_CLAUSE_BATCH_SIZE]
+            existing.update(self.session.execute(
+                select(email_column).where(email_column.in_(batch))
+            ).scalars())
+        return existing
+
+    def add_many(self, users: Sequence[User]) -> None:
+        """
+        新規ユーザーをまとめて追加
+        
+        ORMの単位作業を経由せず、1つのINSERT文をパラメーターのリストで実行する（executemany）。
+        既存行との重複は呼び出し元で除外しておくこと
+        
+        Args:
+            users: 追加するユーザー
+            
+        Raises:
+            UserAlreadyExistsError: 既存ユーザーとメールアドレスが重複する場合
+        """
+        if not users:
+            return
+        self._record_write()
+        with self._translate_email_conflict():
+            self.session.execute(
+                insert(UserModel.__table__),
+                [self._to_row(user) for user in users]
+            )
+        if self.autocommit:
+            self.session.commit()
+            for user in users:
+                self._notify_saved(user)
+        else:
+            self._pending_saved.extend(users)
+
+    def iter_summaries(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        batch_size: int = 1000
+    ) -> Iterator[UserSummary]:
+        """
+        条件に合うユーザーをID順に取得
+        
+        password_hash はSELECT句に含めない。yield_per によりサーバーサイドカーソル
+        （対応する方言の場合）から batch_size 件ずつ取り出すため、件数によらずメモリ使用量は一定
+        
+        Args:
+            role: 絞り込むロール
+            is_active: 絞り込む有効状態
+            batch_size: 1回に取り出す件数
+            
+        Returns:
+            Iterator[UserSummary]: ユーザー情報
+        """
+        table = UserModel.__table__
+        statement = self._summary_statement(role, is_active).order_by(
+            table.c.id
+        ).execution_options(yield_per=batch_size)
+        for row in self._reader().execute(statement):
+            yield UserSummary(*row)
+
+    def list_page(
+        self,
+        role: Optional[RoleType] = None,
+        is_active: Optional[bool] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> UserPage:
+        """
+        作成日時の新しい順にユーザーを1ページ分取得
+        
+        OFFSETを使わず、前ページ最後の (created_at, id) より後の行を
+        (role, is_active, created_at, id) の複合インデックスの範囲検索で取り出す（キーセット方式）。
+        次のページの有無は limit + 1 件目を取得できるかで判定する
+        
+        Args:
+            role: 絞り込むロール
+            is_active: 絞り込む有効状態
+            limit: 1ページの件数
+            after: 前ページの next_key
+            
+        Returns:
+            UserPage: ユーザー一覧の1ページ
+        """
+        table = UserModel.__table__
+        statement = self._summary_statement(role, is_active)
+        if after is not None:
+            statement = statement.where(tuple_(table.c.created_at, table.c.id) < tuple_(*after))
+        statement = statement.order_by(
+            table.c.created_at.desc(), table.c.id.desc()
+        ).limit(limit + 1)
+        items = [UserSummary(*row) for row in self._reader().execute(statement)]
+        if len(items) <= limit:
+            return UserPage(items=items)
+        items = items[:limit]
+        return UserPage(items=items, next_key=(items[-1].created_at, items[-1].id))
+
+    @staticmethod
+    def _summary_statement(role: Optional[RoleType], is_active: Optional[bool]):
+        """認証情報を除いた列を条件付きで取得するSELECT文を生成"""
+        table = UserModel.__table__
+        statement = select(
+            table.c.id, table.c.email, table.c.name, table.c.role,
+            table.c.is_active, table.c.created_at, table.c.updated_at
+        )
+        if role is not None:
+            statement = statement.where(table.c.role == role)
+        if is_active is not None:
+            statement = statement.where(table.c.is_active == is_active)
+        return statement
+
     def exists_super_admin(self) -> bool:
         """
         スーパー管理者が存在するかどうかを確認
         
+        スーパー管理者の重複登録を防ぐ唯一の確認のため、複製の遅れたレプリカではなく
+        プライマリに問い合わせる
+        
         Returns:
             bool: スーパー管理者が存在する場合はTrue
         """
@@ -102,23 +423,137 @@ class SQLAlchemyUserRepository(UserRepository):
             role=RoleType.SUPER_ADMIN
         ).first() is not None
     
+    def _find_one(self, condition, credentials: bool = False) -> Optional[User]:
+        """
+        条件に合うユーザーを1件読み込む
+
+        Args:
+            condition: 検索条件
+            credentials: Trueの場合はパスワードのハッシュも読み込む
+        """
+        users = self._find_all(condition, credentials, limit=1)
+        return users[0] if users else None
+
+    def _find_all(self, condition, credentials: bool = False, limit: Optional[int] = None) -> List[User]:
+        """
+        条件に合うユーザーを読み込む
+
+        Args:
+            condition: 検索条件
+            credentials: Trueの場合はパスワードのハッシュも読み込む
+            limit: 読み込む最大件数（Noneの場合はすべて）
+        """
+        if self.load_entities:
+            return self._load_entities(condition, credentials, limit)
+        statement = select(*self._columns(credentials)).where(condition)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return [self._to_entity(row) for row in self._reader().execute(statement)]
+
+    def _load_entities(self, condition, credentials: bool = False, limit: Optional[int] = None) -> List[User]:
+        """
+        マッピング済みの User を直接読み込む
+
+        読み込んだエンティティはセッションから切り離し、変更が save を経由せずに
+        フラッシュされないようにする（他の読み込み経路と同じく、保存は save で明示的に行う）
+        """
+        session = self._reader()
+        statement = select(User).where(condition)
+        if limit is not None:
+            statement = statement.limit(limit)
+        if not credentials:
+            statement = statement.options(*credentials_deferred())
+        users = session.execute(statement).scalars().all()
+        for user in users:
+            session.expunge(user)
+            if not credentials:
+                # 切り離した後は遅延読み込みできないため、読み込んでいないことを明示する
+                attributes.set_committed_value(user, '_password', None)
+        return users
+
+    @staticmethod
+    def _columns(credentials: bool) -> list:
+        """読み込む列（credentials がFalseの場合はパスワードのハッシュを除く）"""
+        columns = UserModel.__table__.c
+        if credentials:
+            return list(columns)
+        return [column for column in columns if column.name != 'password_hash']
+
+    def _reader(self) -> Session:
+        """読み取りに使うセッション（ルーターがない場合は書き込みと同じセッション）"""
+        if self.router is None:
+            return self.session
+        return self.router.reader()
+
+    def _record_write(self) -> None:
+        """書き込みをルーターに記録し、以降の読み取りをプライマリに固定する"""
+        if self.router is not None:
+            self.router.record_write()
+
+    @contextmanager
+    def _translate_email_conflict(self):
+        """
+        メールアドレスの一意制約違反を UserAlreadyExistsError に変換する
+
+        autocommitの場合はここでトランザクションを取り消す。ユニットオブワークの中では
+        取り消しをユニットオブワークに任せる（PostgreSQLでは同じトランザクションを続けて使えない）
+        """
+        try:
+            yield
+        except IntegrityError as e:
+            if self.autocommit:
+                self.session.rollback()
+            if _is_email_conflict(e):
+                raise UserAlreadyExistsError("このメールアドレスは既に登録されています") from e
+            raise
+
+    def _commit(self, saved_user: User) -> None:
+        """
+        書き込みを確定して保存後コールバックを呼び出す
+        
+        autocommitでない場合はユニットオブワークの確定まで通知を保留する
+        """
+        if self.autocommit:
+            self.session.commit()
+            self._notify_saved(saved_user)
+        else:
+            self._pending_saved.append(saved_user)
+
+    def after_commit(self) -> None:
+        """ユニットオブワークの確定後に保留中の通知を送る"""
+        pending, self._pending_saved = self._pending_saved, []
+        for user in pending:
+            self._notify_saved(user)
+
+    def after_rollback(self) -> None:
+        """ユニットオブワークの取り消し後に保留中の通知を破棄する"""
+        self._pending_saved = []
+
+    def _notify_saved(self, user: User) -> None:
+        """保存後コールバックを呼び出す"""
+        for listener in self.save_listeners:
+            listener(user)
+
     def _to_entity(self, model: UserModel) -> User:
         """
         データベースモデルをドメインエンティティに変換
         
         Args:
-            model: データベースモデル
+            model: データベースモデル（同じ列名を持つ結果行も可）
             
         Returns:
             User: ドメインエンティティ
         """
+        # パスワードのハッシュを除いて取得した結果行には password_hash がない
+        password_hash = getattr(model, 'password_hash', None)
         return User(
             id=model.id,
             _email=Email(model.email),
-            _password=Password(model.password_hash),
+            _password=Password(password_hash) if password_hash is not None else None,
             name=model.name,
             role=Role(model.role),
             is_active=model.is_active,
             created_at=model.created_at,
-            updated_at=model.updated_at
+            updated_at=model.updated_at,
+            security_version=model.security_version or 0
         ) 
\ No newline at end of file
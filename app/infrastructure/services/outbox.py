@@ -0,0 +1,292 @@
+"""
+トランザクショナルアウトボックスによるメール送信
+"""
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ...domain.entities.user import User
+from ...domain.repositories.user_repository import UserRepository
+from ...domain.services.email_service import EmailService
+from ..database.models import OutboxMessageModel
+
+logger = logging.getLogger(__name__)
+
+# 確認メールのメッセージの種類
+CONFIRMATION_EMAIL = 'confirmation_email'
+
+
+class OutboxEmailService(EmailService):
+    """
+    メールを直接送らず、送信依頼をアウトボックスに書き込むメールサービス
+
+    書き込みはセッションに追加するだけで確定しない。ユニットオブワークの内側で呼び出し、
+    ユーザーの保存と同じトランザクションで確定させる（取り消された登録のメールは送られない）
+    """
+
+    def __init__(self, session: Session):
+        """
+        初期化
+
+        Args:
+            session: ユニットオブワークと同じセッション
+        """
+        self.session = session
+
+    def send_confirmation_email(self, user: User) -> None:
+        """
+        確認メールの送信を依頼
+
+        内容は送信時に最新のユーザー情報から組み立てるため、ユーザーIDのみを記録する
+
+        Args:
+            user: 確認メールを送信するユーザー
+        """
+        self.session.add(OutboxMessageModel(
+            kind=CONFIRMATION_EMAIL,
+            payload=json.dumps({'user_id': user.id})
+        ))
+
+
+@dataclass
+class DispatchResult:
+    """ディスパッチ1回分の結果"""
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def processed(self) -> int:
+        """取り出したメッセージの件数"""
+        return self.sent + self.retried + self.failed
+
+
+@dataclass(frozen=True)
+class ClaimedMessage:
+    """
+    取り出したメッセージの内容
+
+    取り出しを確定した後はORMのモデルが期限切れになり、属性を読むたびに問い合わせるため、
+    送信・結果の記録に必要な値を確定前に写し取っておく
+    """
+    id: int
+    kind: str
+    payload: str
+    attempts: int
+
+
+class OutboxDispatcher:
+    """
+    アウトボックスの送信待ちメッセージを取り出して送信する
+
+    1回のディスパッチは3段階で行い、メールの送信中はトランザクションを保持しない
+
+    1. 取り出し: 送信時刻を過ぎたメッセージを batch_size 件ずつ古い順に行ロックして取り出し
+       （SKIP LOCKED）、送信時刻を lease_seconds 後に延ばして確定する。他のディスパッチャーは
+       その間このメッセージを取り出さない
+    2. 送信: トランザクションの外で、種類ごとにまとめて送信サービスに渡す（send_confirmation_emails）
+    3. 記録: 結果を短いトランザクションで書き込む
+
+    失敗したメッセージは backoff_seconds から倍々に延ばした待ち時間（上限 max_backoff_seconds）の後に
+    再試行し、max_attempts 回失敗したものは 'failed' として以降は扱わない。
+    送信後・記録前に停止した場合は、lease_seconds の経過後に同じメッセージを再送する（少なくとも1回の配信）
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        user_repository: UserRepository,
+        sender: EmailService,
+        batch_size: int = 100,
+        max_attempts: int = 5,
+        backoff_seconds: float = 30.0,
+        max_backoff_seconds: float = 3600.0,
+        interval_seconds: float = 1.0,
+        lease_seconds: float = 300.0,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        """
+        初期化
+
+        Args:
+            session: アウトボックスを読み書きするセッション
+            user_repository: 送信時にユーザーを読み込むリポジトリ
+            sender: 実際にメールを送るサービス
+            batch_size: 1回に取り出すメッセージの件数
+            max_attempts: 'failed' とするまでの送信回数
+            backoff_seconds: 1回目の失敗後の待ち時間
+            max_backoff_seconds: 待ち時間の上限
+            interval_seconds: run() で送信待ちがない場合に待つ秒数
+            lease_seconds: 取り出したメッセージを他のディスパッチャーが取り出さない秒数
+                （送信・記録にかかる時間より長くする）
+            clock: 現在時刻（UTC）を返す関数
+        """
+        self.session = session
+        self.user_repository = user_repository
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.interval_seconds = interval_seconds
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self._stopped = threading.Event()
+        self._handlers = {CONFIRMATION_EMAIL: self._send_confirmation_emails}
+
+    def dispatch_once(self) -> DispatchResult:
+        """
+        送信待ちのメッセージを1バッチ分送信
+
+        Returns:
+            DispatchResult: 送信・再試行待ち・失敗の件数
+        """
+        now = self.clock()
+        messages = self._claim(now)
+        if not messages:
+            return DispatchResult()
+        failures = self._deliver(messages)
+        return self._record(messages, failures, now)
+
+    def drain(self) -> DispatchResult:
+        """送信時刻を過ぎたメッセージがなくなるまで送信"""
+        total = DispatchResult()
+        while True:
+            result = self.dispatch_once()
+            total.sent += result.sent
+            total.retried += result.retried
+            total.failed += result.failed
+            if result.processed < self.batch_size:
+                return total
+
+    def run(self) -> None:
+        """stop() が呼ばれるまで送信を繰り返す"""
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            try:
+                result = self.drain()
+            except Exception:
+                logger.exception("アウトボックスの送信に失敗しました")
+                result = DispatchResult()
+            if result.processed == 0:
+                self._stopped.wait(self.interval_seconds)
+
+    def stop(self) -> None:
+        """run() の繰り返しを停止"""
+        self._stopped.set()
+
+    def backoff(self, attempts: int) -> timedelta:
+        """attempts 回失敗した後の待ち時間"""
+        seconds = self.backoff_seconds * 2 ** (attempts - 1)
+        return timedelta(seconds=min(seconds, self.max_backoff_seconds))
+
+    def _claim(self, now: datetime) -> List[ClaimedMessage]:
+        """送信待ちのメッセージを取り出し、送信時刻を延ばして確定する"""
+        statement = select(OutboxMessageModel).where(
+            OutboxMessageModel.status == 'pending',
+            OutboxMessageModel.available_at <= now
+        ).order_by(
+            OutboxMessageModel.available_at, OutboxMessageModel.id
+        ).limit(self.batch_size).with_for_update(skip_locked=True)
+
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        try:
+            claimed = []
+            for message in self.session.execute(statement).scalars():
+                message.available_at = lease_until
+                claimed.append(ClaimedMessage(message.id, message.kind, message.payload, message.attempts))
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return claimed
+
+    def _record(
+        self, messages: List[ClaimedMessage], failures: Dict[int, Exception], now: datetime
+    ) -> DispatchResult:
+        """送信の結果を書き込んで確定する（主キーを指定した一括更新）"""
+        result = DispatchResult()
+        rows = []
+        for message in messages:
+            error = failures.get(message.id)
+            if error is not None:
+                rows.append(self._failure_row(message, error, now, result))
+            else:
+                rows.append({'id': message.id, 'status': 'sent', 'sent_at': now, 'attempts': message.attempts + 1})
+                result.sent += 1
+        try:
+            self.session.execute(update(OutboxMessageModel), rows)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result
+
+    def _deliver(self, messages: List[ClaimedMessage]) -> Dict[int, Exception]:
+        """
+        種類ごとにまとめてメッセージを送信
+
+        Returns:
+            Dict[int, Exception]: 送信に失敗したメッセージのIDと、その例外
+        """
+        groups: Dict[str, List[ClaimedMessage]] = {}
+        for message in messages:
+            groups.setdefault(message.kind, []).append(message)
+
+        failures = {}
+        for kind, group in groups.items():
+            handler = self._handlers.get(kind)
+            try:
+                if handler is None:
+                    raise ValueError(f"未対応のメッセージの種類です: {kind}")
+                failures.update(handler(group))
+            except Exception as e:
+                failures.update((message.id, e) for message in group)
+        return failures
+
+    def _send_confirmation_emails(self, messages: List[ClaimedMessage]) -> Dict[int, Exception]:
+        """確認メールをまとめて送信（ユーザーは1回の問い合わせでまとめて読み込む）"""
+        user_ids = {message.id: json.loads(message.payload)['user_id'] for message in messages}
+        try:
+            found = self.user_repository.find_by_ids(user_ids.values())
+        finally:
+            # 読み込みで始まったトランザクションを送信の前に終える（書き込みはないため取り消す）
+            self.session.rollback()
+
+        failures = {}
+        users = {}
+        for message_id, user_id in user_ids.items():
+            user = found.get(user_id)
+            if user is None:
+                # レプリカへの反映遅れの可能性があるため、他の失敗と同じく再試行する
+                failures[message_id] = LookupError(f"ユーザーが見つかりません: {user_id}")
+            else:
+                users[message_id] = user
+
+        send_failures = self.sender.send_confirmation_emails(list(users.values()))
+        for message_id, user in users.items():
+            if user.id in send_failures:
+                failures[message_id] = send_failures[user.id]
+        return failures
+
+    def _failure_row(
+        self, message: ClaimedMessage, error: Exception, now: datetime, result: DispatchResult
+    ) -> dict:
+        """失敗を記録する行（再試行の時刻を設定し、上限に達した場合は 'failed'）"""
+        attempts = message.attempts + 1
+        row = {'id': message.id, 'attempts': attempts, 'last_error': f"{type(error).__name__}: {error}"}
+        if attempts >= self.max_attempts:
+            row['status'] = 'failed'
+            result.failed += 1
+            logger.error("メッセージの送信を打ち切りました: id=%s, error=%s", message.id, row['last_error'])
+        else:
+            row['available_at'] = now + self.backoff(attempts)
+            result.retried += 1
+            logger.warning("メッセージの送信に失敗しました: id=%s, error=%s", message.id, row['last_error'])
+        return row
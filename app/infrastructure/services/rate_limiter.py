@@ -0,0 +1,172 @@
+"""
+トークンバケット方式のレートリミッター
+"""
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """レート制限のルール"""
+    capacity: float
+    refill_per_second: float
+
+    def wait_seconds(self, tokens: float, cost: float) -> float:
+        """不足分のトークンが補充されるまでの秒数"""
+        if self.refill_per_second <= 0:
+            return math.inf
+        return max(cost - tokens, 0.0) / self.refill_per_second
+
+
+class InMemoryTokenBucketStore:
+    """
+    プロセス内メモリのトークンバケット
+
+    キーのハッシュでシャードに振り分け、シャードごとのロックで競合を抑える。
+    シャードごとの保持キー数を上限で打ち切り、古いキーから追い出す
+    """
+
+    def __init__(self, shards: int = 64, max_keys_per_shard: int = 10_000):
+        """
+        初期化
+
+        Args:
+            shards: シャード数
+            max_keys_per_shard: シャードごとに保持する最大キー数
+        """
+        self._max_keys_per_shard = max_keys_per_shard
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, Tuple[float, float]]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+
+    def consume(self, key: str, rule: RateLimitRule, cost: float = 1.0) -> float:
+        """
+        トークンを消費
+
+        Returns:
+            float: 許可された場合は0、拒否された場合は再試行までの秒数
+        """
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated_at = buckets.pop(key, (rule.capacity, now))
+            tokens = min(rule.capacity, tokens + (now - updated_at) * rule.refill_per_second)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = rule.wait_seconds(tokens, cost)
+            buckets[key] = (tokens, now)
+            if len(buckets) > self._max_keys_per_shard:
+                buckets.popitem(last=False)
+            return wait
+
+
+class SQLiteTokenBucketStore:
+    """
+    SQLiteファイルのトークンバケット
+
+    同じファイルを指定した複数ワーカープロセスでカウンターを共有する。
+    補充と消費は1つのUPSERT文で行うため、プロセス間でも原子的に判定される
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイルのパス
+        """
+        self._db_path = db_path
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            " key TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+    def consume(self, key: str, rule: RateLimitRule, cost: float = 1.0) -> float:
+        """
+        トークンを消費
+
+        Returns:
+            float: 許可された場合は0、拒否された場合は再試行までの秒数
+        """
+        connection = self._connection()
+        now = time.time()
+        refilled = "MIN(:capacity, tokens + (:now - updated_at) * :rate)"
+        cursor = connection.execute(
+            "INSERT INTO rate_limit_buckets (key, tokens, updated_at)"
+            " SELECT :key, :capacity - :cost, :now WHERE :capacity >= :cost"
+            " ON CONFLICT (key) DO UPDATE"
+            f" SET tokens = {refilled} - :cost, updated_at = :now"
+            f" WHERE {refilled} >= :cost",
+            {'key': key, 'capacity': rule.capacity, 'cost': cost,
+             'now': now, 'rate': rule.refill_per_second}
+        )
+        if cursor.rowcount == 1:
+            return 0.0
+        row = connection.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+        ).fetchone()
+        tokens = 0.0
+        if row is not None:
+            tokens = min(rule.capacity, row[0] + (now - row[1]) * rule.refill_per_second)
+        return rule.wait_seconds(tokens, cost)
+
+    def _connection(self) -> sqlite3.Connection:
+        """スレッドごとの接続を取得"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+class RateLimiter:
+    """IPアドレスとメールアドレスそれぞれのバケットで要求を制限する"""
+
+    def __init__(self, store, ip_rule: RateLimitRule, email_rule: RateLimitRule):
+        """
+        初期化
+
+        Args:
+            store: トークンバケットの保存先
+            ip_rule: IPアドレスごとのルール
+            email_rule: メールアドレスごとのルール
+        """
+        self.store = store
+        self.ip_rule = ip_rule
+        self.email_rule = email_rule
+
+    def check(self, scope: str, ip_address: Optional[str], email: Optional[str] = None) -> float:
+        """
+        要求を許可するか判定
+
+        Args:
+            scope: 制限の単位（エンドポイント名など）
+            ip_address: 要求元のIPアドレス
+            email: 要求に含まれるメールアドレス
+
+        Returns:
+            float: 許可された場合は0、拒否された場合は再試行までの秒数
+        """
+        checks: List[Tuple[str, RateLimitRule]] = [
+            (f"{scope}:ip:{ip_address}", self.ip_rule)
+        ]
+        if email:
+            checks.append((f"{scope}:email:{email.strip().lower()}", self.email_rule))
+        for key, rule in checks:
+            wait = self.store.consume(key, rule)
+            if wait > 0:
+                return wait
+        return 0.0
@@ -0,0 +1,83 @@
+"""
+ユーザーごとのセキュリティバージョンの記録
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from ...domain.entities.user import User
+from ...domain.services.security_version_store import SecurityVersionStore
+
+
+class SecurityVersionRegistry(SecurityVersionStore):
+    """
+    プロセス内で観測したユーザーの最新セキュリティバージョンを保持する
+
+    記録から max_age_seconds を過ぎたエントリは信頼せず、呼び出し側にDBでの確認を促す。
+    これにより他ワーカーでの変更が反映されるまでの遅延を上限付きに抑える。
+    エントリは記録の古い順に並べ、期限切れのものは削除し、max_entries を超えた分は古いものから捨てる
+    （捨てたユーザーは未記録と同じくDBで確認されるだけなので、安全側に倒れる）
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = 300.0,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初期化
+
+        Args:
+            max_age_seconds: 記録を信頼する最大秒数
+            max_entries: 保持する最大件数
+            clock: 単調増加する現在時刻（秒）を返す関数
+        """
+        self._max_age_seconds = max_age_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def latest(self, user_id: str) -> Optional[int]:
+        """
+        記録済みの最新バージョンを取得
+
+        Returns:
+            Optional[int]: 未記録または記録が古い場合はNone（古い記録は削除する）
+        """
+        with self._lock:
+            entry = self._versions.get(user_id)
+            if entry is None:
+                return None
+            version, recorded_at = entry
+            if self._clock() - recorded_at > self._max_age_seconds:
+                del self._versions[user_id]
+                return None
+            return version
+
+    def record(self, user_id: str, version: int) -> None:
+        """バージョンを記録（期限切れのエントリと上限を超えた古いエントリは削除する）"""
+        now = self._clock()
+        with self._lock:
+            self._versions[user_id] = (version, now)
+            self._versions.move_to_end(user_id)
+            self._purge_locked(now)
+
+    def on_user_saved(self, user: User) -> None:
+        """リポジトリでユーザーが保存された際に呼び出される"""
+        self.record(user.id, user.security_version)
+
+    def __len__(self) -> int:
+        """保持している件数"""
+        with self._lock:
+            return len(self._versions)
+
+    def _purge_locked(self, now: float) -> None:
+        """ロック取得済みの状態で、期限切れと上限を超えた分を古い順に削除"""
+        while self._versions:
+            user_id, (_, recorded_at) = next(iter(self._versions.items()))
+            if now - recorded_at <= self._max_age_seconds and len(self._versions) <= self._max_entries:
+                return
+            del self._versions[user_id]
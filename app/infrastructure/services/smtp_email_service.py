@@ -0,0 +1,318 @@
+"""
+SMTPによるメールサービスの実装
+"""
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from jinja2 import DictLoader, Environment, FileSystemLoader, StrictUndefined, Template
+
+from ...domain.entities.user import User
+from ...domain.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+# 確認メールの既定のテンプレート（件名と本文）
+DEFAULT_TEMPLATES = {
+    'confirmation_email.subject': "アカウント登録確認",
+    'confirmation_email.txt': (
+        "{{ name }} 様\n"
+        "\n"
+        "アカウントの登録ありがとうございます。\n"
+        "以下のリンクをクリックして、アカウントを有効化してください。\n"
+        "\n"
+        "{{ activation_url }}\n"
+    ),
+}
+
+# 送信は拒否されたが、接続はそのまま使い続けられる例外（smtplib が RSET 済み）
+_REUSABLE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class EmailTemplates:
+    """
+    メールのテンプレート
+
+    初期化時にすべてのテンプレートをコンパイルして保持し、送信のたびに読み込み・解析しない
+    """
+
+    def __init__(self, templates: Optional[Dict[str, str]] = None, directory: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            templates: テンプレート名と内容（省略時は DEFAULT_TEMPLATES）
+            directory: テンプレートを読み込むディレクトリ（指定時は templates より優先）
+        """
+        loader = FileSystemLoader(directory) if directory else DictLoader(templates or DEFAULT_TEMPLATES)
+        environment = Environment(
+            loader=loader,
+            autoescape=False,
+            undefined=StrictUndefined,
+            auto_reload=False,
+            keep_trailing_newline=True
+        )
+        self._compiled: Dict[str, Template] = {
+            name: environment.get_template(name) for name in environment.list_templates()
+        }
+
+    def render(self, template_name: str, /, **context) -> str:
+        """コンパイル済みのテンプレートを描画（context には name などの任意の変数を渡せる）"""
+        try:
+            template = self._compiled[template_name]
+        except KeyError:
+            raise LookupError(f"テンプレートが見つかりません: {template_name}") from None
+        return template.render(**context)
+
+
+class SMTPConnectionPool:
+    """
+    SMTPサーバーへの接続のプール
+
+    接続は必要になった時点で size 本まで作成し、使い終わったものは閉じずに再利用する。
+    max_idle_seconds 以上使われなかった接続は、取り出す際に NOOP で生存を確認する。
+    接続が切れた・応答が不正などの例外が起きた接続はプールに戻さず破棄する
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        size: int = 4,
+        timeout_seconds: float = 10.0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        max_idle_seconds: float = 60.0,
+        connection_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP
+    ):
+        """
+        初期化
+
+        Args:
+            host: SMTPサーバーのホスト名
+            port: SMTPサーバーのポート番号
+            size: 同時に開く接続の最大数
+            timeout_seconds: 接続・応答と、空き接続を待つ最大秒数
+            username: 認証のユーザー名（省略時は認証しない）
+            password: 認証のパスワード
+            use_tls: 接続後に STARTTLS を行うかどうか
+            max_idle_seconds: 生存確認をせずに再利用する最大の待機秒数
+            connection_factory: 接続を作成する関数（smtplib.SMTP と同じ引数）
+        """
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout_seconds = timeout_seconds
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_idle_seconds = max_idle_seconds
+        self._connection_factory = connection_factory
+        # 直前に使った接続から再利用する（長く使われていない接続を自然に減らす）
+        self._idle: "queue.LifoQueue[Tuple[float, smtplib.SMTP]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def opened(self) -> int:
+        """これまでに開いた接続の数"""
+        return self._opened
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """
+        接続を借りる
+
+        Raises:
+            TimeoutError: timeout_seconds 以内に空きの接続がない場合
+        """
+        if not self._slots.acquire(timeout=self.timeout_seconds):
+            raise TimeoutError("SMTPの接続に空きがありません")
+        connection = None
+        try:
+            connection = self._checkout()
+            yield connection
+        except _REUSABLE_ERRORS:
+            raise
+        except BaseException:
+            if connection is not None:
+                self._quit(connection)
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                self._idle.put((time.monotonic(), connection))
+            self._slots.release()
+
+    def close(self) -> None:
+        """待機中の接続をすべて閉じる"""
+        while True:
+            try:
+                _, connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(connection)
+
+    def _checkout(self) -> smtplib.SMTP:
+        """待機中の接続を取り出す（なければ新しく開く）"""
+        while True:
+            try:
+                released_at, connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+            if time.monotonic() - released_at < self.max_idle_seconds or self._is_alive(connection):
+                return connection
+            self._quit(connection)
+
+    def _open(self) -> smtplib.SMTP:
+        """新しい接続を開き、必要ならTLSと認証を行う"""
+        connection = self._connection_factory(self.host, self.port, timeout=self.timeout_seconds)
+        try:
+            if self.use_tls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password or "")
+        except BaseException:
+            self._quit(connection)
+            raise
+        with self._lock:
+            self._opened += 1
+        return connection
+
+    @staticmethod
+    def _is_alive(connection: smtplib.SMTP) -> bool:
+        """NOOP で接続の生存を確認"""
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP) -> None:
+        """接続を閉じる（切断済みの場合も例外を出さない）"""
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+
+class SMTPEmailService(EmailService):
+    """
+    SMTPでメールを送信するメールサービス
+
+    接続は SMTPConnectionPool で再利用する。send_confirmation_emails では
+    batch_size 件ずつ同じ接続で続けて送信し、複数のバッチをプールの接続数まで並行して送る
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        sender_address: str,
+        templates: Optional[EmailTemplates] = None,
+        activation_url: str = "http://example.com/activate/{user_id}",
+        batch_size: int = 50
+    ):
+        """
+        初期化
+
+        Args:
+            pool: SMTPサーバーへの接続のプール
+            sender_address: 差出人のメールアドレス
+            templates: メールのテンプレート（省略時は既定のテンプレート）
+            activation_url: 有効化リンクのURL（{user_id} をユーザーIDに置き換える）
+            batch_size: 1つの接続で続けて送信する件数
+        """
+        self.pool = pool
+        self.sender_address = sender_address
+        self.templates = templates or EmailTemplates()
+        self.activation_url = activation_url
+        self.batch_size = batch_size
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def send_confirmation_email(self, user: User) -> None:
+        """
+        確認メールを送信
+
+        Args:
+            user: 確認メールを送信するユーザー
+        """
+        message = self._confirmation_message(user)
+        with self.pool.connection() as connection:
+            connection.send_message(message)
+
+    def send_confirmation_emails(self, users: Sequence[User]) -> Dict[str, Exception]:
+        """
+        複数のユーザーに確認メールをバッチで送信
+
+        接続が切れた場合、そのバッチの未送信分はすべて失敗として返す
+
+        Returns:
+            Dict[str, Exception]: 送信に失敗したユーザーのIDと、その例外
+        """
+        messages = [(user.id, self._confirmation_message(user)) for user in users]
+        batches = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+        if len(batches) <= 1:
+            return self._send_batch(batches[0]) if batches else {}
+
+        failures = {}
+        for batch_failures in self._get_executor().map(self._send_batch, batches):
+            failures.update(batch_failures)
+        return failures
+
+    def shutdown(self) -> None:
+        """並行送信のスレッドとプールの接続を閉じる"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self.pool.close()
+
+    def _send_batch(self, batch: List[Tuple[str, EmailMessage]]) -> Dict[str, Exception]:
+        """1つの接続でバッチを続けて送信"""
+        failures = {}
+        sent = 0
+        try:
+            with self.pool.connection() as connection:
+                for user_id, message in batch:
+                    try:
+                        connection.send_message(message)
+                    except _REUSABLE_ERRORS as e:
+                        failures[user_id] = e
+                    sent += 1
+        except Exception as e:
+            logger.warning("SMTPでの送信を中断しました: %s", e)
+            for user_id, _ in batch[sent:]:
+                failures[user_id] = e
+        return failures
+
+    def _confirmation_message(self, user: User) -> EmailMessage:
+        """確認メールを組み立てる"""
+        context = {
+            'name': user.name,
+            'email': user.email.value,
+            'activation_url': self.activation_url.format(user_id=user.id),
+        }
+        message = EmailMessage()
+        message['From'] = self.sender_address
+        message['To'] = user.email.value
+        message['Subject'] = self.templates.render('confirmation_email.subject', **context).strip()
+        message.set_content(self.templates.render('confirmation_email.txt', **context))
+        return message
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """並行送信のスレッドプール（接続数と同じスレッド数）"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool.size, thread_name_prefix='smtp-send'
+                )
+            return self._executor
@@ -0,0 +1,129 @@
+"""
+検証済みトークンのキャッシュ
+"""
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from ...domain.entities.user import User
+
+
+class VerifiedTokenCache:
+    """
+    署名検証とユーザー取得が済んだトークンをLRU/TTLで保持するキャッシュ
+
+    キーはトークン文字列そのものなので、ヒットしたトークンは一度検証済みであることが保証される。
+    各エントリの寿命はTTLとトークンのexpの早い方で打ち切る。
+    ユーザーは登録時と取得時に複製し、あるリクエストでの変更（保存前のもの）が
+    同じトークンを使う他のリクエスト・スレッドに漏れないようにする
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 60.0):
+        """
+        初期化
+
+        Args:
+            max_entries: 保持する最大件数
+            ttl_seconds: エントリの最大保持秒数
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[User, str, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token_value: str) -> Optional[Tuple[User, str]]:
+        """
+        キャッシュからユーザーとトークンIDを取得
+
+        Args:
+            token_value: トークン文字列
+
+        Returns:
+            Optional[Tuple[User, str]]: ヒットした場合はユーザーとトークンID
+        """
+        with self._lock:
+            entry = self._entries.get(token_value)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, token_id, expires_at = entry
+            if expires_at <= time.time():
+                self._remove_locked(token_value)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token_value)
+            self.hits += 1
+        return _snapshot(user), token_id
+
+    def put(self, token_value: str, user: User, token_id: str, token_exp: float) -> None:
+        """
+        検証済みトークンを登録
+
+        Args:
+            token_value: トークン文字列
+            user: トークンに紐づくユーザー
+            token_id: トークンID
+            token_exp: トークンの有効期限（UNIXタイムスタンプ）
+        """
+        expires_at = min(time.time() + self._ttl_seconds, token_exp)
+        with self._lock:
+            if token_value in self._entries:
+                self._remove_locked(token_value)
+            while len(self._entries) >= self._max_entries:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+            self._entries[token_value] = (_snapshot(user), token_id, expires_at)
+            self._tokens_by_user.setdefault(user.id, set()).add(token_value)
+
+    def invalidate_token(self, token_value: str) -> None:
+        """トークンのエントリを削除"""
+        with self._lock:
+            self._remove_locked(token_value)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """ユーザーに紐づく全エントリを削除"""
+        with self._lock:
+            for token_value in list(self._tokens_by_user.get(user_id, ())):
+                self._remove_locked(token_value)
+
+    def on_user_saved(self, user: User) -> None:
+        """リポジトリでユーザーが保存された際に呼び出される"""
+        self.invalidate_user(user.id)
+
+    def stats(self) -> dict:
+        """ヒット数・ミス数・ヒット率・件数を取得"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self._entries)
+            }
+
+    def _remove_locked(self, token_value: str) -> None:
+        """ロック取得済みの状態でエントリを削除"""
+        entry = self._entries.pop(token_value, None)
+        if entry is None:
+            return
+        user_id = entry[0].id
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token_value)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+def _snapshot(user: User) -> User:
+    """
+    ユーザーの複製
+
+    UserEntityCache と同じくコンストラクターを通して複製する。User がマッピング済みの場合
+    （USER_REPOSITORY_MAPPING='imperative'）、浅い複製ではORMの状態を元のインスタンスと共有してしまう
+    """
+    return dataclasses.replace(user)
@@ -0,0 +1,187 @@
+"""
+トークン失効ストアの実装
+"""
+import heapq
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from ...domain.exceptions import ServiceUnavailableError
+from ...domain.services.token_revocation_store import TokenRevocationStore
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryTokenRevocationStore(TokenRevocationStore):
+    """
+    プロセス内メモリで失効済みトークンIDを保持するストア
+
+    有効期限順のヒープで期限切れエントリを追い出すため、
+    メモリ使用量は「有効期限内の失効済みトークン数」に比例する。
+    有効期限内のエントリで上限件数に達した場合は、失効を取り消さないよう新たな登録を拒否する
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        初期化
+
+        Args:
+            max_entries: 保持する最大件数
+        """
+        self._max_entries = max_entries
+        self._entries: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def revoke(self, token_id: str, expires_at: float) -> None:
+        """
+        トークンIDを失効済みとして登録
+
+        Args:
+            token_id: トークンID（jti）
+            expires_at: トークンの有効期限（UNIXタイムスタンプ）
+
+        Raises:
+            ServiceUnavailableError: 期限切れを削除しても上限件数に達している場合
+        """
+        with self._lock:
+            self._purge_expired_locked(time.time())
+            if token_id not in self._entries and len(self._entries) >= self._max_entries:
+                # 有効期限内のエントリを追い出すと、ログアウト済みのトークンが再び有効になるため登録を拒否する
+                logger.warning("失効ストアが上限（%d件）に達したため失効の登録を拒否しました", self._max_entries)
+                raise ServiceUnavailableError("トークンの失効を登録できません。しばらくしてから再度お試しください")
+            self._entries[token_id] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, token_id))
+
+    def is_revoked(self, token_id: str) -> bool:
+        """トークンIDが失効済みかどうかを確認"""
+        expires_at = self._entries.get(token_id)
+        return expires_at is not None and expires_at > time.time()
+
+    def purge_expired(self) -> int:
+        """有効期限を過ぎたエントリを削除し、削除件数を返す"""
+        with self._lock:
+            return self._purge_expired_locked(time.time())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge_expired_locked(self, now: float) -> int:
+        """ロック取得済みの状態で期限切れエントリを削除"""
+        purged = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, token_id = heapq.heappop(self._expiry_heap)
+            # 再登録で期限が更新されたエントリは古いヒープ要素を無視する
+            if self._entries.get(token_id) == expires_at:
+                del self._entries[token_id]
+                purged += 1
+        return purged
+
+
+class SQLiteTokenRevocationStore(TokenRevocationStore):
+    """
+    SQLiteファイルで失効済みトークンIDを保持するストア
+
+    複数ワーカープロセスで失効情報を共有でき、メモリ使用量は件数に依存しない
+    """
+
+    def __init__(self, db_path: str, purge_interval: int = 1000):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイルのパス
+            purge_interval: 期限切れエントリを削除する登録回数の間隔
+        """
+        self._db_path = db_path
+        self._purge_interval = purge_interval
+        self._revoke_count = 0
+        self._count_lock = threading.Lock()
+        self._local = threading.local()
+        # メモリDBは接続ごとに別物になるためスレッド間で1接続を共有する
+        self._shared_connection = None
+        if db_path == ':memory:':
+            self._shared_connection = sqlite3.connect(
+                db_path, check_same_thread=False, isolation_level=None
+            )
+            self._shared_lock = threading.Lock()
+        self._initialize()
+
+    def revoke(self, token_id: str, expires_at: float) -> None:
+        """
+        トークンIDを失効済みとして登録
+
+        Args:
+            token_id: トークンID（jti）
+            expires_at: トークンの有効期限（UNIXタイムスタンプ）
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)",
+            (token_id, expires_at)
+        )
+        with self._count_lock:
+            self._revoke_count += 1
+            should_purge = self._revoke_count % self._purge_interval == 0
+        if should_purge:
+            self.purge_expired()
+
+    def is_revoked(self, token_id: str) -> bool:
+        """トークンIDが失効済みかどうかを確認"""
+        row = self._execute(
+            "SELECT 1 FROM revoked_tokens WHERE jti = ? AND expires_at > ?",
+            (token_id, time.time()),
+            fetch_one=True
+        )
+        return row is not None
+
+    def purge_expired(self) -> int:
+        """有効期限を過ぎたエントリを削除し、削除件数を返す"""
+        return self._execute(
+            "DELETE FROM revoked_tokens WHERE expires_at <= ?",
+            (time.time(),)
+        )
+
+    def _initialize(self) -> None:
+        """テーブルとインデックスを作成"""
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+            " jti TEXT PRIMARY KEY,"
+            " expires_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._execute(
+            "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at"
+            " ON revoked_tokens (expires_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """スレッドごとの接続を取得"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _execute(self, sql: str, params: tuple = (), fetch_one: bool = False):
+        """
+        SQLを実行
+
+        Returns:
+            fetch_oneがTrueの場合は先頭行、それ以外は影響行数
+        """
+        if self._shared_connection is not None:
+            with self._shared_lock:
+                return self._run(self._shared_connection, sql, params, fetch_one)
+        return self._run(self._connection(), sql, params, fetch_one)
+
+    @staticmethod
+    def _run(connection: sqlite3.Connection, sql: str, params: tuple, fetch_one: bool):
+        """接続上でSQLを実行して結果を取り出す"""
+        cursor = connection.execute(sql, params)
+        if fetch_one:
+            return cursor.fetchone()
+        return cursor.rowcount
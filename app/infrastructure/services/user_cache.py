@@ -0,0 +1,127 @@
+"""
+ユーザーエンティティのキャッシュ
+"""
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from ...domain.entities.user import User
+from ...domain.value_objects.email import Email
+
+
+def email_key(email) -> str:
+    """キャッシュのキーに使う正規化したメールアドレス"""
+    return Email.normalize(str(email))
+
+
+class UserCacheStats:
+    """識別子マップ・プロセス内キャッシュそれぞれのヒット数を集計する"""
+
+    def __init__(self):
+        """初期化"""
+        self._lock = threading.Lock()
+        self.identity_map_hits = 0
+        self.cache_hits = 0
+        self.misses = 0
+
+    def record(self, kind: str) -> None:
+        """
+        検索結果を記録
+
+        Args:
+            kind: 'identity_map_hits' / 'cache_hits' / 'misses' のいずれか
+        """
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    def snapshot(self) -> dict:
+        """ヒット数・ミス数・ヒット率を取得"""
+        with self._lock:
+            total = self.identity_map_hits + self.cache_hits + self.misses
+            return {
+                'identity_map_hits': self.identity_map_hits,
+                'cache_hits': self.cache_hits,
+                'misses': self.misses,
+                'identity_map_hit_ratio': self.identity_map_hits / total if total else 0.0,
+                'hit_ratio': (self.identity_map_hits + self.cache_hits) / total if total else 0.0
+            }
+
+
+class UserEntityCache:
+    """
+    プロセス内で共有するユーザーのLRU/TTLキャッシュ
+
+    IDと正規化したメールアドレスの両方で引ける。エンティティは可変のため、
+    スレッド間で同じインスタンスを共有しないよう格納時・取得時に複製する
+    （ORMのマッピング済みの場合も状態を共有しないよう、コンストラクターを通して複製する）
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 5.0):
+        """
+        初期化
+
+        Args:
+            max_entries: 保持する最大件数
+            ttl_seconds: エントリの最大保持秒数（他プロセスでの更新が反映されるまでの上限）
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._ids_by_email: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get_by_id(self, user_id: str) -> Optional[User]:
+        """IDでユーザーを取得"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove_locked(user_id)
+                return None
+            self._entries.move_to_end(user_id)
+            return dataclasses.replace(user)
+
+    def get_by_email(self, email) -> Optional[User]:
+        """メールアドレスでユーザーを取得"""
+        with self._lock:
+            user_id = self._ids_by_email.get(email_key(email))
+        if user_id is None:
+            return None
+        return self.get_by_id(user_id)
+
+    def put(self, user: User) -> None:
+        """ユーザーを登録（既存のエントリは置き換える）"""
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._remove_locked(user.id)
+            while len(self._entries) >= self._max_entries:
+                self._remove_locked(next(iter(self._entries)))
+            self._entries[user.id] = (dataclasses.replace(user), expires_at)
+            self._ids_by_email[email_key(user.email)] = user.id
+
+    def invalidate(self, user_id: str) -> None:
+        """ユーザーのエントリを削除"""
+        with self._lock:
+            self._remove_locked(user_id)
+
+    def on_user_saved(self, user: User) -> None:
+        """リポジトリでユーザーの保存が確定した際に呼び出される（ライトスルー）"""
+        self.put(user)
+
+    def __len__(self) -> int:
+        """保持している件数"""
+        with self._lock:
+            return len(self._entries)
+
+    def _remove_locked(self, user_id: str) -> None:
+        """ロック取得済みの状態でエントリを削除"""
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        key = email_key(entry[0].email)
+        if self._ids_by_email.get(key) == user_id:
+            del self._ids_by_email[key]
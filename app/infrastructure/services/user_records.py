@@ -0,0 +1,144 @@
+"""
+ユーザーファイル（CSV / NDJSON）の読み込み・書き出し
+"""
+import csv
+import io
+import json
+import os
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from ...application.usecases.bulk_user_import import BulkUserImportRecord
+from ...domain.read_models.user_summary import UserSummary
+
+# 対応する形式と拡張子
+FORMATS = ('csv', 'ndjson')
+MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+# エクスポートする列（認証情報は含めない）
+EXPORT_FIELDS = ('id', 'email', 'name', 'role', 'is_active', 'created_at', 'updated_at')
+_EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+
+def detect_format(path: str) -> str:
+    """
+    拡張子からファイル形式を判定
+
+    Raises:
+        ValueError: 判定できない場合
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"ファイル形式を判定できません: {path}")
+    return _EXTENSIONS[extension]
+
+
+def read_user_records(stream: IO[str], file_format: str) -> Iterator[BulkUserImportRecord]:
+    """
+    ファイルを1行ずつ読み込み、一括登録の入力に変換する
+
+    ファイル全体をメモリに載せないよう、ジェネレーターとして逐次返す。
+    解析できない行は error に理由を設定して返す（呼び出し元で除外として記録する）
+
+    Args:
+        stream: テキストモードで開いたファイル
+        file_format: 'csv' または 'ndjson'
+    """
+    if file_format == 'csv':
+        return _read_csv(stream)
+    if file_format == 'ndjson':
+        return _read_ndjson(stream)
+    raise ValueError(f"未対応のファイル形式です: {file_format}")
+
+
+def _read_csv(stream: IO[str]) -> Iterator[BulkUserImportRecord]:
+    """ヘッダー行（email,name,password または password_hash）付きのCSVを読み込む"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield _to_record(reader.line_num, row)
+
+
+def _read_ndjson(stream: IO[str]) -> Iterator[BulkUserImportRecord]:
+    """1行に1つのJSONオブジェクトを持つNDJSONを読み込む"""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield BulkUserImportRecord(line=line_number, error="JSONとして解析できません")
+            continue
+        if not isinstance(row, dict):
+            yield BulkUserImportRecord(line=line_number, error="JSONオブジェクトではありません")
+            continue
+        yield _to_record(line_number, row)
+
+
+def _to_record(line_number: int, row: dict) -> BulkUserImportRecord:
+    """1行分の値を入力に変換（パスワード以外は前後の空白を取り除く）"""
+    def field(name, strip=True):
+        value = row.get(name)
+        if value is None:
+            return None
+        value = str(value)
+        return (value.strip() if strip else value) or None
+
+    return BulkUserImportRecord(
+        line=line_number,
+        email=field('email') or '',
+        name=field('name') or '',
+        password=field('password', strip=False),
+        password_hash=field('password_hash')
+    )
+
+
+def write_user_records(
+    summaries: Iterable[UserSummary],
+    file_format: str,
+    rows_per_chunk: int = 500
+) -> Iterator[str]:
+    """
+    ユーザー情報を書き出し用の文字列に変換する
+
+    rows_per_chunk 件ごとに1つの文字列にまとめて返すジェネレーター。
+    ストリーミングレスポンスやファイルへの書き込みにそのまま渡せる
+
+    Args:
+        summaries: 書き出すユーザー情報
+        file_format: 'csv' または 'ndjson'
+        rows_per_chunk: 1回に返す件数
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"未対応のファイル形式です: {file_format}")
+    summaries = iter(summaries)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if file_format == 'csv':
+        writer.writerow(EXPORT_FIELDS)
+        yield _drain(buffer)
+    while True:
+        chunk = list(islice(summaries, rows_per_chunk))
+        if not chunk:
+            break
+        for summary in chunk:
+            row = summary.to_dict()
+            if file_format == 'csv':
+                writer.writerow([row[name] for name in EXPORT_FIELDS])
+            else:
+                buffer.write(json.dumps(row, ensure_ascii=False))
+                buffer.write('\n')
+        yield _drain(buffer)
+
+
+def _drain(buffer: io.StringIO) -> str:
+    """バッファの内容を取り出して空にする"""
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
@@ -0,0 +1,131 @@
+"""
+複数ワーカープロセスからの同時登録のスループットを計測するベンチマーク
+
+同じSQLiteファイルに対して --writers 個のプロセスが登録APIを呼び続け、
+--readers 個のプロセスがユーザーの検索を続ける状況で、既定のプロファイルと
+本番プロファイル（WAL・busy_timeoutなど）の登録件数/秒と失敗件数（database is locked）を比較する。
+書き込み経路を比べるため、パスワードのハッシュは低コストのpbkdf2を使う
+
+使い方:
+    python benchmarks/bench_concurrent_registration.py --writers 4 --readers 2 --seconds 5
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def make_app(db_path: str, profile: str):
+    """計測用のFlaskアプリケーションを作成"""
+    from app import create_app
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}",
+        'SECRET_KEY': 'bench-secret-key-bench-secret-key',
+        'DATABASE_PROFILE': profile,
+        'PASSWORD_HASH_ALGORITHM': 'pbkdf2',
+        'PASSWORD_HASH_COST': 1000,
+        'RATE_LIMIT_ENABLED': False,
+        # 失敗時のスタックトレース出力を抑える
+        'PROPAGATE_EXCEPTIONS': False,
+    })
+
+
+def writer(db_path: str, profile: str, start_at: float, seconds: float, results) -> None:
+    """登録APIを呼び続け、(成功数, 失敗数) を記録"""
+    import logging
+    # ConsoleEmailService の出力を捨てる
+    sys.stdout = open(os.devnull, 'w')
+    app = make_app(db_path, profile)
+    app.logger.setLevel(logging.CRITICAL)
+    client = app.test_client()
+    ok = failed = 0
+    time.sleep(max(start_at - time.time(), 0))
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        response = client.post('/api/auth/register', json={
+            'email': f"{uuid.uuid4().hex}@example.com",
+            'password': 'Password123!',
+            'name': 'Bench User'
+        })
+        if response.status_code == 201:
+            ok += 1
+        else:
+            failed += 1
+    results.put(('writer', ok, failed))
+
+
+def reader(db_path: str, profile: str, start_at: float, seconds: float, results) -> None:
+    """ユーザーの検索を続け、(成功数, 失敗数) を記録"""
+    from app.domain.value_objects.email import Email
+    app = make_app(db_path, profile)
+    ok = failed = 0
+    time.sleep(max(start_at - time.time(), 0))
+    deadline = start_at + seconds
+    with app.app_context():
+        repository = app.container.user_repository()
+        while time.time() < deadline:
+            try:
+                repository.find_by_email(Email("nobody@example.com"))
+                repository.list_page(limit=20)
+                ok += 1
+            except Exception:
+                failed += 1
+            finally:
+                app.container._db_session.rollback()
+    results.put(('reader', ok, failed))
+
+
+def run(profile: str, args) -> dict:
+    """プロファイルを指定して計測"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        make_app(db_path, profile)
+        results = multiprocessing.Queue()
+        start_at = time.time() + 2.0
+        processes = [
+            multiprocessing.Process(target=writer, args=(db_path, profile, start_at, args.seconds, results))
+            for _ in range(args.writers)
+        ] + [
+            multiprocessing.Process(target=reader, args=(db_path, profile, start_at, args.seconds, results))
+            for _ in range(args.readers)
+        ]
+        for process in processes:
+            process.start()
+        totals = {'writer': [0, 0], 'reader': [0, 0]}
+        for _ in processes:
+            kind, ok, failed = results.get()
+            totals[kind][0] += ok
+            totals[kind][1] += failed
+        for process in processes:
+            process.join()
+    return {
+        'registrations_per_second': totals['writer'][0] / args.seconds,
+        'failed_registrations': totals['writer'][1],
+        'reads_per_second': totals['reader'][0] / args.seconds,
+        'failed_reads': totals['reader'][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"writers={args.writers} readers={args.readers} seconds={args.seconds}")
+    print(f"{'profile':>10} {'reg/s':>8} {'reg fail':>9} {'read/s':>8} {'read fail':>10}")
+    for profile in ('default', 'production'):
+        r = run(profile, args)
+        print(f"{profile:>10} {r['registrations_per_second']:>8.0f} {r['failed_registrations']:>9} "
+              f"{r['reads_per_second']:>8.0f} {r['failed_reads']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+ログインのスループットをパスワードハッシュ化のワーカー数ごとに計測するベンチマーク
+
+使い方:
+    python benchmarks/bench_login_throughput.py --workers 0 1 2 4 --clients 8 --requests 200
+
+--workers 0 はリクエストスレッドでそのままハッシュ化する従来の動作
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "Password123!"
+
+
+def run(workers: int, clients: int, requests: int) -> dict:
+    """指定したワーカー数でログインを繰り返し、結果を返す"""
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'SECRET_KEY': 'bench-secret-key-bench-secret-key',
+            'PASSWORD_HASH_WORKERS': workers,
+            'PASSWORD_HASH_MAX_PENDING': max(workers, 1) * clients,
+        })
+        client = app.test_client()
+        client.post('/api/auth/register', data=json.dumps({
+            'email': EMAIL, 'password': PASSWORD, 'name': 'Bench'
+        }), content_type='application/json')
+
+        def login(_):
+            response = app.test_client().post('/api/auth/login', data=json.dumps({
+                'email': EMAIL, 'password': PASSWORD
+            }), content_type='application/json')
+            return response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            statuses = list(pool.map(login, range(requests)))
+        elapsed = time.perf_counter() - started
+
+        hasher = app.container.password_hasher()
+        if hasattr(hasher, 'shutdown'):
+            hasher.shutdown()
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    return {
+        'workers': workers,
+        'requests': requests,
+        'ok': statuses.count(200),
+        'rejected_503': statuses.count(503),
+        'seconds': round(elapsed, 3),
+        'logins_per_sec': round(requests / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'ok':>6} {'503':>6} {'seconds':>9} {'logins/s':>10}")
+    for workers in args.workers:
+        result = run(workers, args.clients, args.requests)
+        print(f"{result['workers']:>8} {result['ok']:>6} {result['rejected_503']:>6} "
+              f"{result['seconds']:>9} {result['logins_per_sec']:>10}")
+
+
+if __name__ == '__main__':
+    main()
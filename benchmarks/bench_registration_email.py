@@ -0,0 +1,87 @@
+"""
+確認メールの送信方式による登録APIの所要時間を計測するベンチマーク
+
+メールの送信に --smtp-latency ミリ秒かかる状況で、登録の処理中に送信する方式（direct）と
+アウトボックスに書き込み後から送信する方式（outbox）の /api/auth/register の所要時間
+（中央値・95パーセンタイル）を比較する。outbox ではディスパッチャーで全件を送り切るまでの時間も示す。
+書き込み経路を比べるため、パスワードのハッシュは低コストのpbkdf2を使う
+
+使い方:
+    python benchmarks/bench_registration_email.py --registrations 200 --smtp-latency 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app  # noqa: E402
+from app.infrastructure.database.models import OutboxMessageModel  # noqa: E402
+
+
+def run(delivery: str, args) -> dict:
+    """送信方式を指定して計測"""
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'SECRET_KEY': 'bench-secret-key-bench-secret-key',
+            'PASSWORD_HASH_ALGORITHM': 'pbkdf2',
+            'PASSWORD_HASH_COST': 1000,
+            'RATE_LIMIT_ENABLED': False,
+            'EMAIL_DELIVERY': delivery,
+        })
+        client = app.test_client()
+
+        def slow_send(self, user):
+            time.sleep(args.smtp_latency / 1000)
+
+        timings = []
+        with patch('app.infrastructure.services.email_service.ConsoleEmailService.send_confirmation_email', slow_send):
+            for _ in range(args.registrations):
+                started = time.perf_counter()
+                response = client.post('/api/auth/register', json={
+                    'email': f"{uuid.uuid4().hex}@example.com",
+                    'password': 'Password123!',
+                    'name': 'Bench User'
+                })
+                timings.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 201, response.get_json()
+
+            drain_seconds = None
+            if delivery == 'outbox':
+                with app.app_context():
+                    started = time.perf_counter()
+                    app.container.outbox_dispatcher().drain()
+                    drain_seconds = time.perf_counter() - started
+                    assert OutboxMessageModel.query.filter_by(status='sent').count() == args.registrations
+
+    timings.sort()
+    return {
+        'p50_ms': statistics.median(timings),
+        'p95_ms': timings[int(len(timings) * 0.95) - 1],
+        'drain_seconds': drain_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--registrations', type=int, default=200)
+    parser.add_argument('--smtp-latency', type=float, default=50.0)
+    args = parser.parse_args()
+
+    print(f"registrations={args.registrations} smtp_latency={args.smtp_latency}ms")
+    print(f"{'delivery':>8} {'p50 ms':>8} {'p95 ms':>8} {'drain s':>8}")
+    for delivery in ('direct', 'outbox'):
+        r = run(delivery, args)
+        drain = f"{r['drain_seconds']:>8.2f}" if r['drain_seconds'] is not None else f"{'-':>8}"
+        print(f"{delivery:>8} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {drain}")
+
+
+if __name__ == '__main__':
+    main()
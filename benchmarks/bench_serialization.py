@@ -0,0 +1,117 @@
+"""
+APIレスポンスのユーザーの変換コストを計測するベンチマーク
+
+--users 件（既定1000件）のユーザーについて、1000件あたりの所要時間（ミリ秒）を次の段階ごとに比較する
+
+- 辞書の作成: ルートで手書きしていた辞書 / USER_SERIALIZER（既定の項目・?fields=id,email）
+- JSONへの変換: Flask標準のプロバイダー（json） / OrjsonJSONProvider の response
+- 合計: 手書きの辞書 + json / シリアライザー + orjson
+
+使い方:
+    python benchmarks/bench_serialization.py --users 1000 --repeat 50
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app.api.json_provider import OrjsonJSONProvider  # noqa: E402
+from app.api.serializers import USER_SERIALIZER  # noqa: E402
+from app.domain.entities.user import User  # noqa: E402
+from app.domain.value_objects.email import Email  # noqa: E402
+from app.domain.value_objects.password import Password  # noqa: E402
+from app.domain.value_objects.role import Role, RoleType  # noqa: E402
+
+PASSWORD_HASH = "pbkdf2:sha256:1000$salt$hash"
+
+
+def make_users(count: int) -> list:
+    """変換するユーザーを作成"""
+    now = datetime.utcnow()
+    return [
+        User(
+            id=f"0190a5c2-7f3e-7000-8000-{i:012d}",
+            _email=Email(f"user{i}@example.com"),
+            _password=Password(PASSWORD_HASH),
+            name=f"ユーザー {i}",
+            role=Role(RoleType.USER),
+            is_active=True,
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def hand_written(users: list) -> list:
+    """変更前のルートと同じ手書きの辞書"""
+    return [
+        {
+            'id': user.id,
+            'email': str(user.email),
+            'name': user.name,
+            'role': user.role.role_type.value,
+            'is_active': user.is_active
+        }
+        for user in users
+    ]
+
+
+def measure(function, repeat: int, per: int, count: int) -> float:
+    """per 件あたりの所要時間（ミリ秒、repeat 回の最小値）"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best / count * per * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    orjson_provider = OrjsonJSONProvider(app)
+    users = make_users(args.users)
+    sparse = ['id', 'email']
+    payload = {'users': hand_written(users)}
+
+    def run(function):
+        return measure(function, args.repeat, 1000, args.users)
+
+    with app.app_context():
+        rows = [
+            ("dict: hand-written", run(lambda: hand_written(users))),
+            ("dict: serializer", run(lambda: USER_SERIALIZER.dump_many(users))),
+            ("dict: serializer ?fields=id,email", run(lambda: USER_SERIALIZER.dump_many(users, sparse))),
+            ("encode: json (Flask default)", run(lambda: default_provider.response(payload))),
+            ("encode: orjson", run(lambda: orjson_provider.response(payload))),
+            ("total: hand-written + json", run(
+                lambda: default_provider.response({'users': hand_written(users)})
+            )),
+            ("total: serializer + orjson", run(
+                lambda: orjson_provider.response({'users': USER_SERIALIZER.dump_many(users)})
+            )),
+            ("total: serializer ?fields + orjson", run(
+                lambda: orjson_provider.response({'users': USER_SERIALIZER.dump_many(users, sparse)})
+            )),
+        ]
+
+    print(f"users={args.users} repeat={args.repeat}")
+    print(f"{'stage':>36} {'ms/1k users':>12}")
+    for name, elapsed in rows:
+        print(f"{name:>36} {elapsed:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+SMTPによるメール送信のスループットを計測するベンチマーク
+
+ローカルに起動した受信だけを行うSMTPサーバーに対し、--messages 通の確認メールを次の方式で送信し、
+1秒あたりの送信数を比較する。サーバーは接続ごとに --connect-latency ミリ秒（TLS・認証の往復の代わり）、
+1通ごとに --message-latency ミリ秒（受信の応答の遅れの代わり）待ってから応答する
+
+- connect-per-message: 1通ごとに接続を開いて閉じる
+- pooled: SMTPEmailService.send_confirmation_email を1通ずつ呼ぶ（接続を再利用）
+- batched xN: SMTPEmailService.send_confirmation_emails で接続N本に分けて送る
+
+使い方:
+    python benchmarks/bench_smtp_throughput.py --messages 500 --pool-sizes 1 4 8
+"""
+import argparse
+import os
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.domain.entities.user import User  # noqa: E402
+from app.domain.value_objects.email import Email  # noqa: E402
+from app.domain.value_objects.role import Role, RoleType  # noqa: E402
+from app.infrastructure.services.smtp_email_service import SMTPConnectionPool, SMTPEmailService  # noqa: E402
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """受け取ったメールを数えるだけのSMTPセッション"""
+
+    def handle(self):
+        server = self.server
+        time.sleep(server.connect_latency)
+        self.wfile.write(b"220 sink ESMTP\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.wfile.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif command == b"DATA":
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(server.message_latency)
+                with server.lock:
+                    server.received += 1
+                self.wfile.write(b"250 OK\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    """受信だけを行うSMTPサーバー"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_latency: float, message_latency: float):
+        super().__init__(('127.0.0.1', 0), SinkHandler)
+        self.connect_latency = connect_latency
+        self.message_latency = message_latency
+        self.received = 0
+        self.lock = threading.Lock()
+
+
+def make_users(count: int) -> list:
+    """送信先のユーザーを作成"""
+    now = datetime.utcnow()
+    return [
+        User(
+            id=f"user-{i}",
+            _email=Email(f"user{i}@example.com"),
+            _password=None,
+            name=f"Bench User {i}",
+            role=Role(RoleType.USER),
+            is_active=True,
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def make_service(server: SinkServer, pool_size: int, batch_size: int) -> SMTPEmailService:
+    """サーバーに送信するメールサービスを作成"""
+    host, port = server.server_address
+    return SMTPEmailService(
+        SMTPConnectionPool(host, port, size=pool_size),
+        sender_address="no-reply@example.com",
+        batch_size=batch_size
+    )
+
+
+def measure(server: SinkServer, send, users: list) -> float:
+    """1秒あたりの送信数"""
+    server.received = 0
+    started = time.perf_counter()
+    send(users)
+    elapsed = time.perf_counter() - started
+    assert server.received == len(users), (server.received, len(users))
+    return len(users) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--connect-latency', type=float, default=20.0)
+    parser.add_argument('--message-latency', type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = SinkServer(args.connect_latency / 1000, args.message_latency / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    users = make_users(args.messages)
+    host, port = server.server_address
+
+    print(f"messages={args.messages} batch_size={args.batch_size} "
+          f"connect_latency={args.connect_latency}ms message_latency={args.message_latency}ms")
+    print(f"{'mode':>20} {'msg/s':>8}")
+
+    template = make_service(server, 1, args.batch_size)
+
+    def connect_per_message(users):
+        for user in users:
+            with smtplib.SMTP(host, port) as connection:
+                connection.send_message(template._confirmation_message(user))
+
+    print(f"{'connect-per-message':>20} {measure(server, connect_per_message, users):>8.0f}")
+
+    service = make_service(server, 1, args.batch_size)
+
+    def pooled(users):
+        for user in users:
+            service.send_confirmation_email(user)
+
+    print(f"{'pooled':>20} {measure(server, pooled, users):>8.0f}")
+    service.shutdown()
+
+    for pool_size in args.pool_sizes:
+        service = make_service(server, pool_size, args.batch_size)
+        failures = {}
+        rate = measure(server, lambda users: failures.update(service.send_confirmation_emails(users)), users)
+        assert not failures, failures
+        print(f"{f'batched x{pool_size}':>20} {rate:>8.0f}")
+        service.shutdown()
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
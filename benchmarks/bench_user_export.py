@@ -0,0 +1,100 @@
+"""
+ユーザーエクスポートのメモリ使用量と所要時間を計測するベンチマーク
+
+--rows 件を投入したSQLiteファイルから、iter_summaries + write_user_records による
+ストリーミング書き出しと、全件をエンティティとして読み込んでから書き出す方法を比べ、
+tracemallocのピークメモリが件数に比例しないことを確認する
+
+使い方:
+    python benchmarks/bench_user_export.py --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.domain.value_objects.role import RoleType  # noqa: E402
+from app.infrastructure.database.models import UserModel  # noqa: E402
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository  # noqa: E402
+from app.infrastructure.services.user_records import write_user_records  # noqa: E402
+
+PASSWORD_HASH = "scrypt:32768:8:1$" + "s" * 16 + "$" + "h" * 128
+
+
+def prefill(engine, rows: int, chunk: int = 50_000) -> None:
+    """ユーザーを投入"""
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        for start in range(0, rows, chunk):
+            batch = []
+            for _ in range(min(chunk, rows - start)):
+                user_id = str(uuid.uuid4())
+                batch.append({
+                    'id': user_id, 'email': f"{user_id}@example.com", 'email_normalized': f"{user_id}@example.com",
+                    'password_hash': PASSWORD_HASH,
+                    'name': 'Export User', 'role': RoleType.USER, 'is_active': True,
+                    'security_version': 0, 'created_at': now, 'updated_at': now
+                })
+            connection.execute(insert(UserModel.__table__), batch)
+
+
+def streaming(session, sink) -> None:
+    """iter_summaries で逐次取り出して書き出す"""
+    summaries = SQLAlchemyUserRepository(session).iter_summaries()
+    for chunk in write_user_records(summaries, 'ndjson'):
+        sink.write(chunk)
+
+
+def load_all(session, sink) -> None:
+    """全件をエンティティとして読み込んでから書き出す"""
+    repository = SQLAlchemyUserRepository(session)
+    users = [repository._to_entity(model) for model in session.query(UserModel).all()]
+    for user in users:
+        sink.write(json.dumps({
+            'id': user.id, 'email': str(user.email), 'name': user.name,
+            'role': user.role.role_type.value, 'is_active': user.is_active,
+            'created_at': user.created_at.isoformat(), 'updated_at': user.updated_at.isoformat()
+        }) + '\n')
+
+
+def measure(engine, export) -> tuple:
+    """(ピークメモリ[MB], 所要時間[秒]) を計測"""
+    with Session(engine) as session, open(os.devnull, 'w') as sink:
+        tracemalloc.start()
+        started = time.perf_counter()
+        export(session, sink)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'stream MB':>10} {'stream s':>9} {'load MB':>10} {'load s':>9}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            UserModel.metadata.create_all(engine, tables=[UserModel.__table__])
+            prefill(engine, rows)
+            stream_mb, stream_s = measure(engine, streaming)
+            load_mb, load_s = measure(engine, load_all)
+            engine.dispose()
+        print(f"{rows:>10} {stream_mb:>10.1f} {stream_s:>9.2f} {load_mb:>10.1f} {load_s:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+ユーザーIDの方式ごとの挿入スループットとインデックスの大きさを計測するベンチマーク
+
+SQLiteファイルの users テーブルに --rows 件を --transaction-size 件ずつのトランザクションで挿入し、
+次の組み合わせで1秒あたりの挿入件数（全体と最後の10%）と、dbstat による主キーのインデックス・
+id を含むインデックス・ファイル全体の大きさを比較する
+
+- uuid4/string: 従来のランダムなUUIDを36文字の文字列で保存
+- uuid7/string: 時刻順のUUID（UUIDv7Generator）を36文字の文字列で保存
+- uuid4/binary, uuid7/binary: 同じIDを16バイトで保存（USER_ID_STORAGE='binary'）
+
+ページキャッシュ（--cache-mb）より主キーのインデックスが大きくなると、ランダムなIDでは挿入のたびに
+離れたページを読み書きするため差が開く
+
+使い方:
+    python benchmarks/bench_user_ids.py --rows 1000000 --cache-mb 2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, text  # noqa: E402
+
+from app.domain.services.id_generator import UUIDv7Generator  # noqa: E402
+from app.domain.value_objects.role import RoleType  # noqa: E402
+from app.infrastructure.database.models import UserModel  # noqa: E402
+from app.infrastructure.database.profiles import install_sqlite_pragmas  # noqa: E402
+from app.infrastructure.database.types import configure_user_id_storage  # noqa: E402
+
+PASSWORD_HASH = "pbkdf2:sha256:1000$salt$hash"
+VARIANTS = ['uuid4/string', 'uuid7/string', 'uuid4/binary', 'uuid7/binary']
+
+
+def id_factory(kind: str):
+    """IDを生成する関数"""
+    if kind == 'uuid4':
+        return lambda: str(uuid.uuid4())
+    return UUIDv7Generator().new_id
+
+
+def index_sizes(engine) -> dict:
+    """dbstat によるテーブル・インデックスごとの大きさ（バイト）"""
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all()
+    return dict(rows)
+
+
+def run(variant: str, rows: int, transaction_size: int, cache_mb: int) -> dict:
+    """1つの組み合わせで挿入し、スループットと大きさを返す"""
+    kind, storage = variant.split('/')
+    new_id = id_factory(kind)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        engine = create_engine(f"sqlite:///{path}")
+        install_sqlite_pragmas(engine, {
+            'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -cache_mb * 1024
+        })
+        configure_user_id_storage(engine, storage)
+        UserModel.metadata.create_all(engine, tables=[UserModel.__table__])
+        table = UserModel.__table__
+
+        tail_start = rows - rows // 10
+        tail_elapsed = 0.0
+        started = time.perf_counter()
+        for start in range(0, rows, transaction_size):
+            now = datetime.utcnow()
+            batch = []
+            for i in range(start, min(start + transaction_size, rows)):
+                email = f"user{i}@example.com"
+                batch.append({
+                    'id': new_id(), 'email': email, 'email_normalized': email,
+                    'password_hash': PASSWORD_HASH, 'name': 'Bench User', 'role': RoleType.USER,
+                    'is_active': True, 'security_version': 0, 'created_at': now, 'updated_at': now
+                })
+            batch_started = time.perf_counter()
+            with engine.begin() as connection:
+                connection.execute(insert(table), batch)
+            if start >= tail_start:
+                tail_elapsed += time.perf_counter() - batch_started
+        elapsed = time.perf_counter() - started
+
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        sizes = index_sizes(engine)
+        id_indexes = sum(size for name, size in sizes.items() if name.startswith('ix_users_'))
+        result = {
+            'rows_per_second': rows / elapsed,
+            'tail_rows_per_second': (rows - tail_start) / tail_elapsed if tail_elapsed else 0.0,
+            'primary_key_mb': sizes.get('sqlite_autoindex_users_1', 0) / 1024 ** 2,
+            'id_indexes_mb': id_indexes / 1024 ** 2,
+            'file_mb': os.path.getsize(path) / 1024 ** 2,
+        }
+        engine.dispose()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--transaction-size', type=int, default=1000)
+    parser.add_argument('--cache-mb', type=int, default=2)
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=VARIANTS)
+    args = parser.parse_args()
+
+    print(f"rows={args.rows} transaction_size={args.transaction_size} cache={args.cache_mb}MiB")
+    print(f"{'variant':>14} {'rows/s':>9} {'last10% rows/s':>15} {'pk MiB':>8} {'ix_* MiB':>9} {'file MiB':>9}")
+    for variant in args.variants:
+        result = run(variant, args.rows, args.transaction_size, args.cache_mb)
+        print(f"{variant:>14} {result['rows_per_second']:>9.0f} {result['tail_rows_per_second']:>15.0f} "
+              f"{result['primary_key_mb']:>8.1f} {result['id_indexes_mb']:>9.1f} {result['file_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+ユーザー一括登録のスループットを従来の1件ずつの登録経路と比較するベンチマーク
+
+同じ入力を UserRegistrationUseCase（1件ごとにハッシュ化・重複確認・コミット）と
+BulkUserImportUseCase（チャンクごとに一括確認・並列ハッシュ化・executemany）で
+SQLiteファイルに登録し、1秒あたりの登録件数を比較する。
+既定ではハッシュ化の影響を除いて書き込み経路を比べるため低コストのpbkdf2を使う。
+--algorithm/--cost で本番の方針を指定すると、ハッシュ化込みの比較になる。
+移行元のハッシュをそのまま取り込む場合（password_hash 列）の件数も併せて表示する。
+--repository memory ではSQLiteの代わりに InMemoryUserRepository に登録し、
+データベースを除いたユースケース自体の処理量を計測する
+
+使い方:
+    python benchmarks/bench_user_import.py --users 5000 --workers 4
+    python benchmarks/bench_user_import.py --users 5000 --repository memory
+    python benchmarks/bench_user_import.py --users 500 --algorithm scrypt --cost 15 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.application.usecases.bulk_user_import import (  # noqa: E402
+    BulkUserImportRecord,
+    BulkUserImportUseCase
+)
+from app.application.usecases.user_registration import (  # noqa: E402
+    UserRegistrationRequest,
+    UserRegistrationUseCase
+)
+from app.domain.services.password_hasher import (  # noqa: E402
+    InlinePasswordHasher,
+    PasswordHashPolicy,
+    set_password_hasher
+)
+from app.infrastructure.database.models import UserModel  # noqa: E402
+from app.infrastructure.repositories.in_memory_user_repository import (  # noqa: E402
+    InMemoryUnitOfWork,
+    InMemoryUserRepository,
+    InMemoryUserStore
+)
+from app.infrastructure.repositories.unit_of_work import SQLAlchemyUnitOfWork  # noqa: E402
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository  # noqa: E402
+from app.infrastructure.services.password_hasher import ProcessPoolPasswordHasher  # noqa: E402
+
+PASSWORD = "Password123!"
+
+
+class NullEmailService:
+    """メール送信を行わないダミー"""
+
+    def send_confirmation_email(self, user):
+        pass
+
+
+def records(prefix: str, count: int, password_hash: str = None):
+    """登録する入力を生成"""
+    for i in range(count):
+        yield BulkUserImportRecord(
+            line=i + 1, email=f"{prefix}{i}@example.com", name="Bench User",
+            password=None if password_hash else PASSWORD, password_hash=password_hash
+        )
+
+
+@contextmanager
+def open_backend(backend, transaction_size=None):
+    """
+    登録先のリポジトリとユニットオブワークを作成
+
+    Args:
+        backend: SQLAlchemyのエンジン、または InMemoryUserStore
+        transaction_size: ユニットオブワークの途中確定の件数
+    """
+    if isinstance(backend, InMemoryUserStore):
+        yield InMemoryUserRepository(backend), InMemoryUnitOfWork(backend, batch_size=transaction_size)
+        return
+    with Session(backend) as session:
+        yield SQLAlchemyUserRepository(session), SQLAlchemyUnitOfWork(session, batch_size=transaction_size)
+
+
+def run_per_user(backend, policy: PasswordHashPolicy, count: int) -> float:
+    """従来の経路で登録し、1秒あたりの件数を返す"""
+    set_password_hasher(InlinePasswordHasher(policy))
+    with open_backend(backend) as (repository, _):
+        use_case = UserRegistrationUseCase(repository, NullEmailService())
+        started = time.perf_counter()
+        for record in records('single', count):
+            use_case.execute(UserRegistrationRequest(record.email, record.password, record.name))
+        return count / (time.perf_counter() - started)
+
+
+def run_bulk(backend, policy: PasswordHashPolicy, count: int, args, prefix='bulk',
+             password_hash: str = None) -> float:
+    """一括登録の経路で登録し、1秒あたりの件数を返す"""
+    if args.workers > 1:
+        hasher = ProcessPoolPasswordHasher(max_workers=args.workers, policy=policy)
+        # ワーカープロセスの起動時間を計測から除く
+        hasher.hash_many([PASSWORD] * args.workers)
+    else:
+        hasher = InlinePasswordHasher(policy)
+    try:
+        with open_backend(backend, args.transaction_size) as (_, unit_of_work):
+            use_case = BulkUserImportUseCase(
+                unit_of_work.users, unit_of_work, hasher, chunk_size=args.chunk_size
+            )
+            started = time.perf_counter()
+            result = use_case.execute(records(prefix, count, password_hash))
+            elapsed = time.perf_counter() - started
+            assert result.imported == count
+            return count / elapsed
+    finally:
+        if args.workers > 1:
+            hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--algorithm', default='pbkdf2')
+    parser.add_argument('--cost', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--transaction-size', type=int, default=10_000)
+    parser.add_argument('--repository', choices=('sqlalchemy', 'memory'), default='sqlalchemy')
+    args = parser.parse_args()
+    policy = PasswordHashPolicy(args.algorithm, args.cost)
+
+    if args.repository == 'memory':
+        store = InMemoryUserStore()
+        per_user = run_per_user(store, policy, args.users)
+        bulk = run_bulk(store, policy, args.users, args)
+        prehashed = run_bulk(store, policy, args.users, args, 'prehashed', policy.hash(PASSWORD))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            UserModel.metadata.create_all(engine, tables=[UserModel.__table__])
+            per_user = run_per_user(engine, policy, args.users)
+            bulk = run_bulk(engine, policy, args.users, args)
+            prehashed = run_bulk(engine, policy, args.users, args, 'prehashed', policy.hash(PASSWORD))
+            engine.dispose()
+
+    print(f"policy={policy.method} users={args.users} workers={args.workers} repository={args.repository}")
+    print(f"per-user:         {per_user:>10.0f} users/s")
+    print(f"bulk:             {bulk:>10.0f} users/s  ({bulk / per_user:.1f}x)")
+    print(f"bulk (prehashed): {prehashed:>10.0f} users/s  ({prehashed / per_user:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+ユーザーの読み込み方式（宣言的モデル経由 / User エンティティの命令的マッピング）を比較するベンチマーク
+
+--users 件のユーザーをメモリ内のSQLiteに登録し、find_by_id で全件を順に読み込んだ際の
+1件あたりの時間と、読み込み結果を保持した状態でtracemallocで計測したピークメモリ・読み込み後に残るメモリブロック数を出力する
+
+使い方:
+    python benchmarks/bench_user_load.py --users 10000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db  # noqa: E402
+from app.domain.entities.user import User  # noqa: E402
+from app.domain.value_objects.email import Email  # noqa: E402
+from app.domain.value_objects.password import Password  # noqa: E402
+from app.domain.value_objects.role import Role, RoleType  # noqa: E402
+from app.infrastructure.database.orm import stop_mappers  # noqa: E402
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository  # noqa: E402
+
+PASSWORD_HASH = "pbkdf2:sha256:1000$salt$hash"
+
+
+def seed(repository: SQLAlchemyUserRepository, count: int) -> list:
+    """ユーザーを登録してIDの一覧を返す"""
+    now = datetime.utcnow()
+    users = [
+        User(
+            id=f"user-{i:06d}",
+            name=f"User {i}",
+            _email=Email(f"user{i}@example.com"),
+            _password=Password(PASSWORD_HASH),
+            role=Role(RoleType.USER),
+            is_active=True,
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+    repository.add_many(users)
+    return [user.id for user in users]
+
+
+def run(mapping: str, count: int) -> dict:
+    """読み込み方式を指定して計測"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SECRET_KEY': 'bench-secret-key-bench-secret-key',
+    })
+    try:
+        with app.app_context():
+            db.create_all()
+            user_ids = seed(SQLAlchemyUserRepository(db.session), count)
+            repository = SQLAlchemyUserRepository(db.session, load_entities=mapping == 'imperative')
+            db.session.expunge_all()
+
+            # 時間はtracemallocのオーバーヘッドを含めずに計測する
+            started = time.perf_counter()
+            loaded = [repository.find_by_id(user_id) for user_id in user_ids]
+            elapsed = time.perf_counter() - started
+            del loaded
+
+            tracemalloc.start()
+            loaded = [repository.find_by_id(user_id) for user_id in user_ids]
+            _, peak = tracemalloc.get_traced_memory()
+            retained = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+            tracemalloc.stop()
+
+            assert len(loaded) == count and all(user is not None for user in loaded)
+            db.session.remove()
+            db.drop_all()
+    finally:
+        stop_mappers()
+    return {
+        'us_per_user': elapsed / count * 1_000_000,
+        'peak_mib': peak / 1024 / 1024,
+        'retained_blocks': retained,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"users={args.users}")
+    print(f"{'mapping':>12} {'us/user':>9} {'peak MiB':>9} {'blocks':>9}")
+    for mapping in ('declarative', 'imperative'):
+        r = run(mapping, args.users)
+        print(f"{mapping:>12} {r['us_per_user']:>9.1f} {r['peak_mib']:>9.1f} {r['retained_blocks']:>9}")
+
+
+if __name__ == '__main__':
+    main()
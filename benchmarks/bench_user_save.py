@@ -0,0 +1,108 @@
+"""
+SQLAlchemyUserRepository.save の1件あたりの所要時間を計測するベンチマーク
+
+既存行を --rows 件投入したテーブルに対し、従来のORM経路（SELECT + INSERT/UPDATE）と
+UPSERT 1文の経路で新規登録・更新を行い、平均所要時間を比較する
+
+使い方:
+    python benchmarks/bench_user_save.py --rows 100000 1000000 --saves 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.domain.entities.user import User  # noqa: E402
+from app.domain.value_objects.email import Email  # noqa: E402
+from app.domain.value_objects.password import Password  # noqa: E402
+from app.domain.value_objects.role import Role, RoleType  # noqa: E402
+from app.infrastructure.database.models import UserModel  # noqa: E402
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository  # noqa: E402
+
+PASSWORD_HASH = "pbkdf2:sha256:1000$salt$hash"
+
+
+def make_user(user_id: str) -> User:
+    """ハッシュ化を省略したユーザーを作成"""
+    now = datetime.utcnow()
+    return User(
+        id=user_id,
+        _email=Email(f"{user_id}@example.com"),
+        _password=Password(PASSWORD_HASH),
+        name="Bench User",
+        role=Role(RoleType.USER),
+        is_active=True,
+        created_at=now,
+        updated_at=now
+    )
+
+
+def prefill(engine, rows: int, chunk: int = 50_000) -> list:
+    """既存行を投入し、更新対象に使うIDの一部を返す"""
+    sample_ids = []
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        for start in range(0, rows, chunk):
+            batch = []
+            for _ in range(min(chunk, rows - start)):
+                user_id = str(uuid.uuid4())
+                batch.append({
+                    'id': user_id, 'email': f"{user_id}@example.com", 'email_normalized': f"{user_id}@example.com",
+                    'password_hash': PASSWORD_HASH,
+                    'name': 'Existing', 'role': RoleType.USER, 'is_active': True,
+                    'security_version': 0, 'created_at': now, 'updated_at': now
+                })
+            connection.execute(insert(UserModel.__table__), batch)
+            sample_ids.extend(row['id'] for row in batch[:100])
+    return sample_ids
+
+
+def measure(save, users) -> float:
+    """1件あたりの平均所要時間（ミリ秒）"""
+    started = time.perf_counter()
+    for user in users:
+        save(user)
+    return (time.perf_counter() - started) / len(users) * 1000
+
+
+def run(rows: int, saves: int) -> dict:
+    """指定した行数のテーブルで計測"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        UserModel.metadata.create_all(engine, tables=[UserModel.__table__])
+        sample_ids = prefill(engine, rows)
+        result = {'rows': rows}
+        with Session(engine) as session:
+            repository = SQLAlchemyUserRepository(session)
+            for label, save in (('orm', repository._save_with_orm), ('upsert', repository.save)):
+                new_users = [make_user(str(uuid.uuid4())) for _ in range(saves)]
+                result[f'{label}_insert_ms'] = measure(save, new_users)
+                updates = [make_user(sample_ids[i % len(sample_ids)]) for i in range(saves)]
+                result[f'{label}_update_ms'] = measure(save, updates)
+        engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--saves', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'orm ins':>9} {'ups ins':>9} {'orm upd':>9} {'ups upd':>9}  (ms/save)")
+    for rows in args.rows:
+        r = run(rows, args.saves)
+        print(f"{r['rows']:>10} {r['orm_insert_ms']:>9.3f} {r['upsert_insert_ms']:>9.3f} "
+              f"{r['orm_update_ms']:>9.3f} {r['upsert_update_ms']:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""add user listing indexes
+
+Revision ID: 5b1e7d9c2f34
+Revises: 8f2d1c4b7a90
+Create Date: 2026-10-17 11:03:52.660731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7d9c2f34'
+down_revision = '8f2d1c4b7a90'
+branch_labels = None
+depends_on = None
+
+# 一覧のキーセットページネーション (created_at, id) 用の複合インデックス
+# 絞り込み条件の組み合わせごとに、等価条件の列を先頭に置く
+INDEXES = {
+    'ix_users_created_at_id': ['created_at', 'id'],
+    'ix_users_role_created_at_id': ['role', 'created_at', 'id'],
+    'ix_users_is_active_created_at_id': ['is_active', 'created_at', 'id'],
+    'ix_users_role_is_active_created_at_id': ['role', 'is_active', 'created_at', 'id'],
+}
+
+
+def upgrade():
+    # 初期マイグレーションに含まれていない列をモデルに合わせて追加する
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')}
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        if 'name' not in columns:
+            batch_op.add_column(sa.Column('name', sa.String(length=255), nullable=False, server_default=''))
+        if 'is_active' not in columns:
+            batch_op.add_column(sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'users', columns)
+
+
+def downgrade():
+    # 列の追加は元に戻さない（このマイグレーション以前から存在した場合と区別できないため）
+    for name in INDEXES:
+        op.drop_index(name, table_name='users')
@@ -0,0 +1,26 @@
+"""add security_version to users
+
+Revision ID: 8f2d1c4b7a90
+Revises: 3c789e418a6a
+Create Date: 2026-10-17 09:12:31.418204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d1c4b7a90'
+down_revision = '3c789e418a6a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('security_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('security_version')
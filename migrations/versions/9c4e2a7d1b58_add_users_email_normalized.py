@@ -0,0 +1,92 @@
+"""add users.email_normalized
+
+Revision ID: 9c4e2a7d1b58
+Revises: 5b1e7d9c2f34
+Create Date: 2026-10-17 14:26:08.193512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e2a7d1b58'
+down_revision = '5b1e7d9c2f34'
+branch_labels = None
+depends_on = None
+
+# 既存行の埋め戻しで1回に更新する行数（行ロックを保持する時間を短く保つ）
+BACKFILL_BATCH_SIZE = 1000
+# PostgreSQLで email_normalized のNULLを禁止するCHECK制約
+EMAIL_NORMALIZED_NOT_NULL = 'ck_users_email_normalized_not_null'
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.String),
+    sa.column('email', sa.String),
+    sa.column('email_normalized', sa.String),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    # NULLを許す列として追加する（既存行を書き換えないため、テーブルの再作成・長いロックが発生しない）
+    # 重複の検出で中断した後に再実行できるよう、追加済みの場合は埋め戻しから再開する
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('users')}
+    if 'email_normalized' not in columns:
+        op.add_column('users', sa.Column('email_normalized', sa.String(length=255), nullable=True))
+
+    with op.get_context().autocommit_block():
+        # バッチごとに確定しながら埋める。実行中に旧バージョンが追加した行も次のバッチで拾う
+        # Email.normalize と同じく前後の空白を除いて小文字にする（メールアドレスはASCIIのみ）
+        while True:
+            pending = sa.select(users.c.id).where(
+                users.c.email_normalized.is_(None)
+            ).limit(BACKFILL_BATCH_SIZE)
+            result = bind.execute(
+                users.update()
+                .where(users.c.id.in_(pending))
+                .values(email_normalized=sa.func.lower(sa.func.trim(users.c.email)))
+            )
+            if result.rowcount == 0:
+                break
+
+        # 大文字小文字だけが異なる既存の重複は自動では統合しない
+        duplicates = bind.execute(
+            sa.select(users.c.email_normalized)
+            .group_by(users.c.email_normalized)
+            .having(sa.func.count() > 1)
+            .limit(20)
+        ).scalars().all()
+        if duplicates:
+            raise RuntimeError(
+                "大文字小文字だけが異なるメールアドレスのユーザーが存在します。"
+                f"統合してから再実行してください: {', '.join(duplicates)}"
+            )
+
+        # PostgreSQLでは書き込みを止めないようCONCURRENTLYで作成する（トランザクション外で実行）
+        op.create_index(
+            'ux_users_email_normalized', 'users', ['email_normalized'],
+            unique=True, postgresql_concurrently=True
+        )
+
+    # SQLiteのNOT NULL化はテーブルの再作成になるため行わない（書き込みはリポジトリが常に値を設定する）
+    if bind.dialect.name == 'postgresql':
+        # SET NOT NULL はACCESS EXCLUSIVEロックを取って全行を走査するため、CHECK制約で代える。
+        # NOT VALID での追加は既存行を検査せず一瞬で終わり、VALIDATE は書き込みを止めずに検査する
+        op.execute(
+            f"ALTER TABLE users ADD CONSTRAINT {EMAIL_NORMALIZED_NOT_NULL} "
+            "CHECK (email_normalized IS NOT NULL) NOT VALID"
+        )
+        with op.get_context().autocommit_block():
+            op.execute(f"ALTER TABLE users VALIDATE CONSTRAINT {EMAIL_NORMALIZED_NOT_NULL}")
+    elif bind.dialect.name != 'sqlite':
+        op.alter_column('users', 'email_normalized', existing_type=sa.String(length=255), nullable=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint(EMAIL_NORMALIZED_NOT_NULL, 'users', type_='check')
+    op.drop_index('ux_users_email_normalized', table_name='users')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('email_normalized')
@@ -0,0 +1,42 @@
+"""create outbox_messages table
+
+Revision ID: d3a8f6b2c915
+Revises: 9c4e2a7d1b58
+Create Date: 2026-10-17 16:41:27.508313
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a8f6b2c915'
+down_revision = '9c4e2a7d1b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'outbox_messages',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # 送信待ちで送信時刻を過ぎたものを古い順に取り出すためのインデックス
+    op.create_index(
+        'ix_outbox_messages_status_available_at_id', 'outbox_messages',
+        ['status', 'available_at', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_outbox_messages_status_available_at_id', table_name='outbox_messages')
+    op.drop_table('outbox_messages')
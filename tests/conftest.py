@@ -15,6 +15,31 @@ from app.domain.value_objects.email import Email
 from app.domain.value_objects.password import Password
 from app.domain.value_objects.role import Role, RoleType
 
+# ハッシュ化を省略したテストユーザーのパスワードハッシュ（検証には使えない固定値）
+TEST_PASSWORD_HASH = "pbkdf2:sha256:1000$salt$hash"
+
+
+def make_user(user_id="user-1", email=None, role=RoleType.USER, name="Test User",
+              is_active=True, created_at=None, **fields):
+    """
+    ハッシュ化を省略したテストユーザーを作成
+
+    メールアドレスの省略時は '<user_id>@example.com'、作成日時の省略時は現在時刻とし、
+    更新日時は作成日時に揃える（その他の属性は fields で指定する）
+    """
+    created_at = created_at or datetime.utcnow()
+    return User(
+        id=user_id,
+        _email=Email(email or f"{user_id}@example.com"),
+        _password=Password(TEST_PASSWORD_HASH),
+        name=name,
+        role=Role(role),
+        is_active=is_active,
+        created_at=created_at,
+        updated_at=fields.pop('updated_at', created_at),
+        **fields
+    )
+
 
 @pytest.fixture
 def test_user():
@@ -7,7 +7,9 @@ from http import HTTPStatus
 from datetime import datetime
 from app import create_app, db
 from app.infrastructure.database.models import UserModel
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
 from app.domain.value_objects.role import RoleType
+from conftest import make_user
 
 # テストデータ
 TEST_SUPER_ADMIN_EMAIL = "super.admin@example.com"
@@ -172,4 +174,217 @@ def test_super_admin_login_with_invalid_credentials(test_client):
     # レスポンスの検証
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     response_data = json.loads(response.data)
-    assert 'error' in response_data 
\ No newline at end of file
+    assert 'error' in response_data
+
+def save_user(app, user_id, role=RoleType.USER, is_active=True):
+    """ハッシュ化を省略したユーザーを保存し、そのユーザーのトークンを返す"""
+    user = make_user(
+        user_id, role=role, name=f"Name {user_id}", is_active=is_active, created_at=datetime(2024, 1, 1)
+    )
+    SQLAlchemyUserRepository(db.session).save(user)
+    return str(app.auth_service.generate_token(user))
+
+def test_export_users_as_ndjson(app, test_client):
+    """
+    正常系: 管理者がユーザーをNDJSONで絞り込んでエクスポートするケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+    save_user(app, "user-a")
+    save_user(app, "user-b", is_active=False)
+
+    response = test_client.get(
+        '/api/admin/users/export?role=user&is_active=true',
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['id'] for row in rows] == ["user-a"]
+    assert rows[0]['email'] == "user-a@example.com"
+    assert 'password_hash' not in rows[0]
+
+def test_export_users_as_csv(app, test_client):
+    """
+    正常系: ユーザーをCSVでエクスポートするケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    response = test_client.get(
+        '/api/admin/users/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == "id,email,name,role,is_active,created_at,updated_at"
+    assert lines[1].startswith("admin,admin@example.com,Name admin,admin,True,")
+
+def test_export_users_requires_admin(app, test_client):
+    """
+    異常系: 一般ユーザーと未認証の要求が拒否されるケース
+    """
+    token = save_user(app, "user-a")
+
+    response = test_client.get('/api/admin/users/export', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert test_client.get('/api/admin/users/export').status_code == HTTPStatus.UNAUTHORIZED
+
+def test_export_users_with_invalid_filter(app, test_client):
+    """
+    異常系: 不正な絞り込み条件が400で拒否されるケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    response = test_client.get(
+        '/api/admin/users/export?role=owner',
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert json.loads(response.data)['error'] == "無効なロールです"
+
+def test_list_users_with_cursor(app, test_client):
+    """
+    正常系: next_cursor をたどって全ユーザーを新しい順に取得できるケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+    for i in range(4):
+        save_user(app, f"user-{i}")
+    headers = {'Authorization': f'Bearer {token}'}
+
+    ids = []
+    url = '/api/admin/users?role=user&limit=3'
+    while url:
+        response = test_client.get(url, headers=headers)
+        assert response.status_code == HTTPStatus.OK
+        body = json.loads(response.data)
+        ids.extend(user['id'] for user in body['users'])
+        url = f"/api/admin/users?role=user&limit=3&cursor={body['next_cursor']}" if body['next_cursor'] else None
+
+    # 作成日時が同じため、IDの降順で並ぶ
+    assert ids == ["user-3", "user-2", "user-1", "user-0"]
+
+def test_list_users_with_sparse_fields(app, test_client):
+    """
+    正常系: fields で指定した項目だけが、宣言の順に返るケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+    save_user(app, "user-0")
+
+    response = test_client.get(
+        '/api/admin/users?role=user&fields=email, id', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert json.loads(response.data)['users'] == [{'id': "user-0", 'email': "user-0@example.com"}]
+
+@pytest.mark.parametrize("query, error", [
+    ("limit=0", "limitには1から200の整数を指定してください"),
+    ("limit=abc", "limitには1から200の整数を指定してください"),
+    ("cursor=not-a-cursor", "無効なカーソルです"),
+    ("is_active=yes", "is_activeには true または false を指定してください"),
+    ("fields=id,password_hash", "指定できないフィールドです: password_hash"),
+])
+def test_list_users_with_invalid_query(app, test_client, query, error):
+    """
+    異常系: 不正なクエリパラメーターが400で拒否されるケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    response = test_client.get(f'/api/admin/users?{query}', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert json.loads(response.data)['error'] == error
+
+def test_list_users_validates_fields_on_empty_page(app, test_client):
+    """
+    異常系: 該当するユーザーがいない場合も、指定できない項目が400で拒否されるケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    response = test_client.get(
+        '/api/admin/users?role=user&fields=bogus', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert json.loads(response.data)['error'] == "指定できないフィールドです: bogus"
+
+def test_list_users_requires_admin(app, test_client):
+    """
+    異常系: 一般ユーザーの要求が拒否されるケース
+    """
+    token = save_user(app, "user-a")
+
+    response = test_client.get('/api/admin/users', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+def test_cache_stats(app, test_client):
+    """
+    正常系: 管理者がキャッシュのヒット率を取得できるケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    response = test_client.get('/api/admin/cache-stats', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == HTTPStatus.OK
+    body = json.loads(response.data)
+    assert set(body['user_cache']) >= {'identity_map_hits', 'cache_hits', 'misses', 'hit_ratio'}
+    assert 'hit_ratio' in body['token_cache']
+
+def admin_payload(email="new.admin@example.com", name="New Admin"):
+    """管理者登録のリクエストデータ"""
+    return {'email': email, 'password': TEST_SUPER_ADMIN_PASSWORD, 'name': name}
+
+def test_register_admin_by_super_admin(app, test_client):
+    """
+    正常系: スーパー管理者のトークンで管理者を登録でき、同じメールアドレスの再登録は409になるケース
+    """
+    headers = {'Authorization': f'Bearer {save_user(app, "root", role=RoleType.SUPER_ADMIN)}'}
+
+    response = test_client.post('/api/admin/admin/register', json=admin_payload(), headers=headers)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert json.loads(response.data)['user']['role'] == RoleType.ADMIN.value
+    assert UserModel.query.filter_by(email="new.admin@example.com").one().role == RoleType.ADMIN
+
+    response = test_client.post(
+        '/api/admin/admin/register', json=admin_payload("NEW.admin@example.com"), headers=headers
+    )
+    assert response.status_code == HTTPStatus.CONFLICT
+
+    response = test_client.post('/api/admin/admin/register', json={'email': 'x@example.com'}, headers=headers)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+def test_register_admin_requires_super_admin(app, test_client):
+    """
+    異常系: 管理者のトークンでは管理者を登録できないケース
+    """
+    headers = {'Authorization': f'Bearer {save_user(app, "admin", role=RoleType.ADMIN)}'}
+
+    response = test_client.post('/api/admin/admin/register', json=admin_payload(), headers=headers)
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert UserModel.query.filter_by(email="new.admin@example.com").first() is None
+
+def test_register_admins_in_bulk(app, test_client):
+    """
+    正常系: 複数の管理者を1リクエストで登録し、重複を含む場合は1件も登録されないケース
+    """
+    headers = {'Authorization': f'Bearer {save_user(app, "root", role=RoleType.SUPER_ADMIN)}'}
+
+    response = test_client.post('/api/admin/admin/register/bulk', json={'admins': [
+        admin_payload("a@example.com", "A"), admin_payload("b@example.com", "B")
+    ]}, headers=headers)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert [user['email'] for user in json.loads(response.data)['users']] == ["a@example.com", "b@example.com"]
+
+    response = test_client.post('/api/admin/admin/register/bulk', json={'admins': [
+        admin_payload("c@example.com", "C"), admin_payload("A@example.com", "A2")
+    ]}, headers=headers)
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert UserModel.query.filter_by(email="c@example.com").first() is None
+    assert UserModel.query.filter_by(role=RoleType.ADMIN).count() == 2
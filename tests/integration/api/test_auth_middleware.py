@@ -0,0 +1,125 @@
+"""
+リクエスト単位の認証（require_auth）の統合テスト
+"""
+import pytest
+from http import HTTPStatus
+from datetime import datetime
+from unittest.mock import patch
+
+from app import create_app, db
+from app.api.auth import authenticate_request, current_auth
+from app.domain.exceptions import AuthenticationError
+from app.domain.value_objects.auth_token import AuthToken
+from app.domain.value_objects.role import RoleType
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from conftest import make_user
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key'
+    })
+    return app
+
+@pytest.fixture
+def test_client(app):
+    """テスト用のクライアントを作成"""
+    return app.test_client()
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+def save_user(app, user_id, role=RoleType.USER):
+    """ハッシュ化を省略したユーザーを保存し、そのユーザーのトークンを返す"""
+    user = make_user(user_id, role=role, name=f"Name {user_id}", created_at=datetime(2024, 1, 1))
+    SQLAlchemyUserRepository(db.session).save(user)
+    return str(app.auth_service.generate_token(user))
+
+def test_logout_decodes_token_once(app, test_client):
+    """
+    正常系: ログアウトでは認証時に検証したクレームで失効を登録し、トークンを1回だけデコードするケース
+    """
+    token = save_user(app, "user-a")
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with patch.object(AuthToken, 'decode_payload', autospec=True, side_effect=AuthToken.decode_payload) as decode:
+        response = test_client.post('/api/auth/logout', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert decode.call_count == 1
+    # 失効したトークンは以降のリクエストで拒否される
+    assert test_client.post('/api/auth/logout', headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+
+def test_logout_fails_closed_when_revocation_store_is_full(app, test_client):
+    """
+    異常系: 失効ストアが有効なエントリで埋まっている場合、ログアウトは503になりトークンの失効は取り消されないケース
+    """
+    revoked = save_user(app, "user-a")
+    headers = {'Authorization': f'Bearer {revoked}'}
+    assert test_client.post('/api/auth/logout', headers=headers).status_code == HTTPStatus.OK
+    app.auth_service.revocation_store._max_entries = 1
+    other = save_user(app, "user-b")
+
+    response = test_client.post('/api/auth/logout', headers={'Authorization': f'Bearer {other}'})
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+    assert test_client.post('/api/auth/logout', headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+
+def test_authentication_is_cached_per_request(app):
+    """
+    正常系: 同じリクエストでの2回目以降の認証は検証を繰り返さず、リクエストの終了で破棄されるケース
+    """
+    token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+        with patch.object(app.auth_service, 'verify_claims', wraps=app.auth_service.verify_claims) as verify:
+            first = authenticate_request()
+            second = authenticate_request()
+
+        assert first is second
+        assert verify.call_count == 1
+        assert current_auth().principal.user_id == "admin"
+        assert current_auth().claims['role'] == RoleType.ADMIN.value
+
+    with app.test_request_context():
+        assert current_auth() is None
+        with pytest.raises(AuthenticationError):
+            authenticate_request()
+
+@pytest.mark.parametrize('header', [None, 'Token abc', 'Bearer ', 'Bearer invalid-token'])
+def test_missing_or_invalid_token_is_unauthorized(test_client, header):
+    """
+    異常系: トークンがない・形式が違う・無効な場合は401になるケース
+    """
+    headers = {'Authorization': header} if header is not None else {}
+
+    assert test_client.get('/api/admin/users', headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+    assert test_client.post('/api/auth/logout', headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+
+def test_role_requirement_is_enforced(app, test_client):
+    """
+    異常系: ロールが要件を満たさない場合は403になるケース
+    """
+    user_token = save_user(app, "user-a")
+    admin_token = save_user(app, "admin", role=RoleType.ADMIN)
+
+    def get(token):
+        return test_client.get('/api/admin/cache-stats', headers={'Authorization': f'Bearer {token}'})
+
+    assert get(user_token).status_code == HTTPStatus.FORBIDDEN
+    assert get(admin_token).status_code == HTTPStatus.OK
+    response = test_client.post(
+        '/api/admin/admin/register', json={}, headers={'Authorization': f'Bearer {admin_token}'}
+    )
+    assert response.status_code == HTTPStatus.FORBIDDEN
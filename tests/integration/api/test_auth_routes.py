@@ -5,9 +5,16 @@ import pytest
 import json
 from http import HTTPStatus
 from datetime import datetime
+from unittest.mock import patch
 from app import create_app, db
 from app.infrastructure.database.models import UserModel
 from app.domain.value_objects.role import RoleType
+from app.domain.exceptions import ServiceUnavailableError
+from app.infrastructure.services.rate_limiter import (
+    InMemoryTokenBucketStore,
+    RateLimiter,
+    RateLimitRule
+)
 
 # テストデータ
 TEST_EMAIL = "test@example.com"
@@ -146,13 +153,14 @@ def test_successful_user_logout(active_user, test_client):
     response_data = json.loads(response.data)
     assert response_data['message'] == 'ログアウトに成功しました'
 
-def test_duplicate_email_registration(active_user, test_client):
+@pytest.mark.parametrize("email", [TEST_EMAIL, f"  {TEST_EMAIL.upper()} "])
+def test_duplicate_email_registration(active_user, test_client, email):
     """
-    異常系: 既存のメールアドレスで登録を試みるケース
+    異常系: 既存のメールアドレス（大文字小文字・前後の空白だけが異なるものを含む）で登録を試みるケース
     """
     # 同じメールアドレスで2回目の登録を試みる
     data = {
-        'email': TEST_EMAIL,
+        'email': email,
         'password': TEST_PASSWORD,
         'name': TEST_NAME
     }
@@ -199,4 +207,52 @@ def test_logout_with_invalid_token(test_client):
     # レスポンスの検証
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     response_data = json.loads(response.data)
-    assert 'error' in response_data 
\ No newline at end of file
+    assert 'error' in response_data
+
+def test_login_when_password_hashing_is_saturated(active_user, test_client):
+    """
+    異常系: パスワード処理が混み合っている場合は503を即座に返すケース
+    """
+    with patch('app.domain.value_objects.password.get_password_hasher') as get_hasher:
+        get_hasher.return_value.verify.side_effect = ServiceUnavailableError("混み合っています")
+        response = test_client.post(
+            '/api/auth/login',
+            data=json.dumps({
+                'email': TEST_EMAIL,
+                'password': TEST_PASSWORD
+            }),
+            content_type='application/json'
+        )
+
+    # レスポンスの検証
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+    response_data = json.loads(response.data)
+    assert 'error' in response_data
+
+def test_login_is_rate_limited_before_authentication(active_user, test_client):
+    """
+    異常系: 同じメールアドレスへのログイン試行が制限を超えたケース
+    """
+    test_client.application.rate_limiter = RateLimiter(
+        InMemoryTokenBucketStore(),
+        ip_rule=RateLimitRule(capacity=100, refill_per_second=1),
+        email_rule=RateLimitRule(capacity=2, refill_per_second=0.01)
+    )
+    login_data = json.dumps({
+        'email': TEST_EMAIL,
+        'password': 'WrongPassword123!'
+    })
+
+    statuses = [
+        test_client.post('/api/auth/login', data=login_data, content_type='application/json').status_code
+        for _ in range(2)
+    ]
+    with patch('app.domain.services.auth_service.AuthService.authenticate') as authenticate:
+        response = test_client.post('/api/auth/login', data=login_data, content_type='application/json')
+
+    # レスポンスの検証
+    assert statuses == [HTTPStatus.UNAUTHORIZED, HTTPStatus.UNAUTHORIZED]
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response.headers['Retry-After']) >= 1
+    authenticate.assert_not_called()
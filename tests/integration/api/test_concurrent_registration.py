@@ -0,0 +1,47 @@
+"""
+同じメールアドレスでの同時登録の統合テスト
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app, db
+from app.infrastructure.database.models import OutboxMessageModel, UserModel
+
+TEST_PASSWORD = "Password123!"
+WORKERS = 8
+
+def test_parallel_duplicate_signups_create_one_user(tmp_path):
+    """
+    異常系: 同じメールアドレス（大文字小文字の違いを含む）で同時に登録した場合、
+    1件だけが登録され、残りは500ではなく409になるケース
+    """
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        'DATABASE_PROFILE': 'production',
+        'RATE_LIMIT_ENABLED': False,
+        'PASSWORD_HASH_ALGORITHM': 'pbkdf2',
+        'PASSWORD_HASH_COST': 1000
+    })
+    barrier = threading.Barrier(WORKERS)
+
+    def signup(index):
+        client = app.test_client()
+        email = "race@example.com" if index % 2 else "RACE@example.com"
+        barrier.wait()
+        return client.post('/api/auth/register', json={
+            'email': email, 'password': TEST_PASSWORD, 'name': f"Racer {index}"
+        }).status_code
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        statuses = sorted(executor.map(signup, range(WORKERS)))
+
+    assert statuses == [201] + [409] * (WORKERS - 1)
+    with app.app_context():
+        assert UserModel.query.count() == 1
+        # 取り消された登録の送信依頼は残らない
+        assert OutboxMessageModel.query.count() == 1
+        db.session.remove()
+        db.drop_all()
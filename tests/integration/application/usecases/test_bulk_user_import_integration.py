@@ -0,0 +1,152 @@
+"""
+ユーザー一括登録ユースケースの統合テスト
+"""
+import json
+import pytest
+
+from app import create_app, db
+from app.application.usecases.bulk_user_import import BulkUserImportRecord, BulkUserImportUseCase
+from app.domain.services.password_hasher import InlinePasswordHasher, PasswordHashPolicy
+from app.domain.value_objects.email import Email
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from conftest import TEST_PASSWORD_HASH
+
+# テストデータ
+TEST_PASSWORD = "Password123!"
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        # テストを速くするため低コストのハッシュを使用する
+        'PASSWORD_HASH_ALGORITHM': 'pbkdf2',
+        'PASSWORD_HASH_COST': 1000
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+def make_use_case(app, batch_size=None, chunk_size=2, rejected=None):
+    """一括登録ユースケースを作成"""
+    unit_of_work = app.container.unit_of_work(batch_size=batch_size)
+    use_case = BulkUserImportUseCase(
+        user_repository=unit_of_work.users,
+        unit_of_work=unit_of_work,
+        password_hasher=InlinePasswordHasher(PasswordHashPolicy('pbkdf2', 1000)),
+        chunk_size=chunk_size,
+        on_reject=rejected.append if rejected is not None else None
+    )
+    return use_case, unit_of_work
+
+def test_import_users_and_reject_invalid_rows(app):
+    """
+    正常系: 正しい行だけが登録され、不正な行・重複行が理由付きで除外されるケース
+    """
+    repository = SQLAlchemyUserRepository(db.session)
+    rejected = []
+    use_case, _ = make_use_case(app, rejected=rejected)
+    records = [
+        BulkUserImportRecord(line=2, email="a@example.com", name="A", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=3, email="invalid", name="B", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=4, email="c@example.com", name="C", password="weak"),
+        BulkUserImportRecord(line=5, email="a@example.com", name="A2", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=6, email="e@example.com", name="E", password_hash=TEST_PASSWORD_HASH),
+        BulkUserImportRecord(line=7, error="JSONとして解析できません"),
+    ]
+
+    result = use_case.execute(records)
+
+    assert (result.processed, result.imported, result.rejected) == (6, 2, 4)
+    assert [r.line for r in rejected] == [3, 4, 5, 7]
+    assert rejected[2].reason == "ファイル内でメールアドレスが重複しています"
+    user = repository.find_credentials_by_email(Email("a@example.com"))
+    assert user.verify_password(TEST_PASSWORD)
+    assert repository.find_credentials_by_email(Email("e@example.com"))._password._hashed_password == TEST_PASSWORD_HASH
+
+def test_import_skips_existing_emails(app):
+    """
+    正常系: 登録済みのメールアドレスが除外されるケース
+    """
+    first, _ = make_use_case(app)
+    first.execute([BulkUserImportRecord(line=1, email="a@example.com", name="A", password=TEST_PASSWORD)])
+    rejected = []
+    second, _ = make_use_case(app, rejected=rejected)
+
+    result = second.execute([
+        BulkUserImportRecord(line=1, email="a@example.com", name="A", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=2, email="b@example.com", name="B", password=TEST_PASSWORD),
+    ])
+
+    assert (result.imported, result.rejected) == (1, 1)
+    assert rejected[0].reason == "このメールアドレスは既に登録されています"
+
+def test_import_commits_per_transaction_size(app):
+    """
+    正常系: 指定した件数ごとにトランザクションが確定されるケース
+    """
+    use_case, unit_of_work = make_use_case(app, batch_size=4, chunk_size=2)
+    records = [
+        BulkUserImportRecord(line=i, email=f"user{i}@example.com", name="User", password_hash=TEST_PASSWORD_HASH)
+        for i in range(10)
+    ]
+
+    result = use_case.execute(records)
+
+    assert result.imported == 10
+    # 4件・8件で途中確定し、残り2件を最後に確定する
+    assert unit_of_work.commit_count == 3
+
+def test_import_command_writes_rejects_report(app, tmp_path):
+    """
+    正常系: CLIコマンドでCSVを取り込み、除外した行がNDJSONに書き出されるケース
+    """
+    source = tmp_path / "users.csv"
+    source.write_text(
+        "email,name,password\n"
+        f"a@example.com,A,{TEST_PASSWORD}\n"
+        f"invalid,B,{TEST_PASSWORD}\n",
+        encoding='utf-8'
+    )
+    rejects = tmp_path / "rejects.ndjson"
+
+    result = app.test_cli_runner().invoke(
+        args=['users', 'import', str(source), '--workers', '1', '--rejects', str(rejects)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "1件を登録、1件を除外" in result.output
+    assert [json.loads(line) for line in rejects.read_text(encoding='utf-8').splitlines()] == [
+        {'line': 3, 'email': 'invalid', 'reason': '無効なメールアドレスです'}
+    ]
+    assert SQLAlchemyUserRepository(db.session).find_by_email(Email("a@example.com")) is not None
+
+def test_export_command_round_trips_imported_users(app, tmp_path):
+    """
+    正常系: 取り込んだユーザーがCLIコマンドでパスワードハッシュを含まずに書き出されるケース
+    """
+    use_case, _ = make_use_case(app)
+    use_case.execute([
+        BulkUserImportRecord(line=i, email=f"user{i}@example.com", name=f"User {i}", password_hash=TEST_PASSWORD_HASH)
+        for i in range(3)
+    ])
+    output = tmp_path / "users.ndjson"
+
+    result = app.test_cli_runner().invoke(
+        args=['users', 'export', '--role', 'user', '--active', '--output', str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert sorted(row['email'] for row in rows) == [f"user{i}@example.com" for i in range(3)]
+    assert all('password_hash' not in row for row in rows)
@@ -53,7 +53,11 @@ def user_repository(init_database):
 @pytest.fixture
 def auth_service(user_repository, app):
     """認証サービスのインスタンスを作成"""
-    return AuthService(user_repository=user_repository)
+    return AuthService(
+        user_repository=user_repository,
+        revocation_store=app.container.token_revocation_store(),
+        security_versions=app.container.security_version_registry()
+    )
 
 @pytest.fixture
 def super_admin_login_usecase(auth_service):
@@ -0,0 +1,200 @@
+"""
+認証サービスの統合テスト
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from app import create_app, db
+from app.domain.entities.user import User
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+from app.domain.value_objects.role import Role, RoleType
+from app.domain.services.auth_service import AuthService
+from app.domain.services.password_hasher import (
+    InlinePasswordHasher,
+    PasswordHashPolicy,
+    set_password_hasher
+)
+from app.domain.exceptions import AuthenticationError
+from app.infrastructure.services.security_version_registry import SecurityVersionRegistry
+
+# テストデータ
+TEST_EMAIL = "auth_service@example.com"
+TEST_PASSWORD = "Password123!"
+TEST_NAME = "Auth Service User"
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key'
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def user_repository(app, init_database):
+    """キャッシュ無効化コールバック付きのユーザーリポジトリを作成"""
+    return app.container.user_repository()
+
+@pytest.fixture
+def auth_service(app, user_repository):
+    """検証済みトークンキャッシュ付きの認証サービスを作成"""
+    return AuthService(
+        user_repository=user_repository,
+        revocation_store=app.container.token_revocation_store(),
+        security_versions=SecurityVersionRegistry(),
+        token_cache=app.container.verified_token_cache()
+    )
+
+@pytest.fixture
+def test_user(user_repository):
+    """テストユーザーを作成"""
+    user = User(
+        id="test-id",
+        _email=Email(TEST_EMAIL),
+        _password=Password.create(TEST_PASSWORD),
+        name=TEST_NAME,
+        role=Role(RoleType.USER),
+        is_active=True,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    return user_repository.save(user)
+
+@pytest.fixture
+def test_token(auth_service, test_user):
+    """テストトークンを作成"""
+    _, token = auth_service.authenticate(TEST_EMAIL, TEST_PASSWORD)
+    return token
+
+def test_repeated_verification_hits_cache(auth_service, user_repository, test_token):
+    """
+    正常系: 同じトークンの2回目以降の検証でDBにアクセスしないケース
+    """
+    auth_service.verify_token(test_token)
+
+    with patch.object(user_repository, 'find_by_id', wraps=user_repository.find_by_id) as find_by_id:
+        user = auth_service.verify_token(test_token)
+
+    assert user.email == Email(TEST_EMAIL)
+    find_by_id.assert_not_called()
+    assert auth_service.token_cache.stats()['hits'] == 1
+
+def test_invalidated_token_is_rejected_after_caching(auth_service, test_token):
+    """
+    異常系: キャッシュ済みのトークンをログアウトで無効化したケース
+    """
+    auth_service.verify_token(test_token)
+    auth_service.invalidate_token(test_token)
+
+    with pytest.raises(AuthenticationError):
+        auth_service.verify_token(test_token)
+
+def test_saving_user_refreshes_cached_user(auth_service, user_repository, test_token):
+    """
+    正常系: ユーザー保存後の検証では最新のユーザーが返るケース
+    """
+    user = auth_service.verify_token(test_token)
+    user.update_profile(name="Renamed User")
+    user_repository.save(user)
+
+    assert auth_service.verify_token(test_token).name == "Renamed User"
+    assert auth_service.token_cache.stats()['hits'] == 0
+
+@pytest.fixture
+def claims_auth_service(app, user_repository):
+    """セキュリティバージョン記録付きの認証サービスを作成"""
+    return AuthService(
+        user_repository=user_repository,
+        revocation_store=app.container.token_revocation_store(),
+        security_versions=app.container.security_version_registry()
+    )
+
+def test_claims_only_verification_skips_repository(claims_auth_service, user_repository, test_user):
+    """
+    正常系: 記録済みのバージョンと一致するトークンはDBを参照せずに主体を返すケース
+    """
+    _, token = claims_auth_service.authenticate(TEST_EMAIL, TEST_PASSWORD)
+
+    with patch.object(user_repository, 'find_by_id', wraps=user_repository.find_by_id) as find_by_id:
+        principal = claims_auth_service.verify_token(token, claims_only=True)
+
+    assert principal.user_id == test_user.id
+    assert principal.role.role_type == RoleType.USER
+    assert principal.is_active is True
+    find_by_id.assert_not_called()
+
+def test_claims_only_verification_rejects_stale_token(claims_auth_service, user_repository, test_user):
+    """
+    異常系: トークン発行後にセキュリティバージョンが上がったケース
+    """
+    _, token = claims_auth_service.authenticate(TEST_EMAIL, TEST_PASSWORD)
+    test_user.change_role(Role(RoleType.ADMIN))
+    user_repository.save(test_user)
+
+    with pytest.raises(AuthenticationError):
+        claims_auth_service.verify_token(token, claims_only=True)
+    with pytest.raises(AuthenticationError):
+        claims_auth_service.verify_token(token)
+
+def test_claims_only_verification_without_record_checks_repository(app, user_repository, test_user):
+    """
+    正常系: バージョンの記録がない場合はDBで確認して主体を返すケース
+    """
+    auth_service = AuthService(
+        user_repository=user_repository,
+        revocation_store=app.container.token_revocation_store(),
+        security_versions=SecurityVersionRegistry()
+    )
+    _, token = auth_service.authenticate(TEST_EMAIL, TEST_PASSWORD)
+
+    with patch.object(user_repository, 'find_by_id', wraps=user_repository.find_by_id) as find_by_id:
+        principal = auth_service.verify_token(token, claims_only=True)
+        auth_service.verify_token(token, claims_only=True)
+
+    assert principal.user_id == test_user.id
+    find_by_id.assert_called_once_with(test_user.id)
+
+def test_outdated_hash_is_upgraded_on_login(app, user_repository):
+    """
+    正常系: 旧方式のハッシュがログイン成功時に現行の方針で再ハッシュされるケース
+    """
+    set_password_hasher(InlinePasswordHasher(PasswordHashPolicy('pbkdf2', 1000)))
+    user = User(
+        id="legacy-id",
+        _email=Email("legacy@example.com"),
+        _password=Password.create(TEST_PASSWORD),
+        name="Legacy User",
+        role=Role(RoleType.USER),
+        is_active=True,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    user_repository.save(user)
+    set_password_hasher(InlinePasswordHasher(PasswordHashPolicy('scrypt', 10)))
+
+    try:
+        AuthService(
+            user_repository=user_repository,
+            revocation_store=app.container.token_revocation_store(),
+            security_versions=app.container.security_version_registry()
+        ).authenticate("legacy@example.com", TEST_PASSWORD)
+    finally:
+        set_password_hasher(app.container.password_hasher())
+
+    upgraded = user_repository.find_credentials_by_email(Email("legacy@example.com"))
+    assert upgraded._password._hashed_password.startswith("scrypt:1024:8:1$")
+    assert upgraded.security_version == user.security_version
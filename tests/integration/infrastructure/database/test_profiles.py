@@ -0,0 +1,73 @@
+"""
+データベース接続プロファイルの統合テスト
+"""
+import pytest
+
+from app import create_app, db
+
+def make_app(tmp_path, **config):
+    """SQLiteファイルを使うFlaskアプリケーションを作成"""
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        **config
+    })
+
+def read_pragmas(*names):
+    """現在の接続のPRAGMAの値を取得"""
+    with db.engine.connect() as connection:
+        return {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in names
+        }
+
+def test_production_profile_sets_pragmas_and_pool(tmp_path):
+    """
+    正常系: 本番プロファイルでは接続ごとにPRAGMAが設定され、接続プールが構成されるケース
+    """
+    app = make_app(tmp_path, DATABASE_PROFILE='production', DATABASE_POOL_SIZE=3,
+                   SQLITE_PRAGMAS={'busy_timeout': 2500})
+
+    with app.app_context():
+        pragmas = read_pragmas('journal_mode', 'synchronous', 'busy_timeout', 'temp_store', 'cache_size')
+        pool = db.engine.pool
+        db.drop_all()
+
+    assert pragmas == {
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'busy_timeout': 2500,
+        'temp_store': 2,
+        'cache_size': -65536
+    }
+    assert pool.size() == 3
+    assert pool._pre_ping is True
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    """
+    正常系: 既定のプロファイルではPRAGMAを変更しないケース
+    """
+    app = make_app(tmp_path)
+
+    with app.app_context():
+        pragmas = read_pragmas('journal_mode')
+        db.drop_all()
+
+    assert pragmas == {'journal_mode': 'delete'}
+
+def test_production_profile_with_memory_database():
+    """
+    正常系: メモリ内データベースでも本番プロファイルで起動できるケース
+    """
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SECRET_KEY': 'test-secret-key',
+        'DATABASE_PROFILE': 'production'
+    })
+
+    with app.app_context():
+        assert read_pragmas('temp_store') == {'temp_store': 2}
+        db.drop_all()
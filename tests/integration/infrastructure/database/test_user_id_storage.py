@@ -0,0 +1,125 @@
+"""
+ユーザーIDの保存形式（USER_ID_STORAGE）の統合テスト
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app import create_app, db
+from app.application.usecases.user_registration import UserRegistrationRequest, UserRegistrationUseCase
+from app.domain.services.id_generator import new_id
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from app.infrastructure.services.email_service import ConsoleEmailService
+from conftest import make_user as make_test_user
+
+def make_app(tmp_path, **config):
+    """SQLiteファイルを使うFlaskアプリケーションを作成"""
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        **config
+    })
+
+def make_user(index, user_id=None):
+    """ハッシュ化を省略したユーザーを作成"""
+    return make_test_user(
+        user_id or new_id(), f"user{index}@example.com", name=f"User {index}",
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=index)
+    )
+
+def raw_ids():
+    """保存されている users.id の値と型"""
+    with db.engine.connect() as connection:
+        return connection.execute(text("SELECT id, typeof(id) FROM users ORDER BY created_at")).all()
+
+def test_binary_storage_round_trip(tmp_path):
+    """
+    正常系: binary ではIDが16バイトで保存され、検索・一覧・更新では文字列として扱えるケース
+    """
+    app = make_app(tmp_path, USER_ID_STORAGE='binary')
+    users = [make_user(i) for i in range(3)]
+
+    with app.app_context():
+        repository = SQLAlchemyUserRepository(db.session)
+        repository.add_many(users[:2])
+        repository.save(users[2])
+
+        stored = raw_ids()
+        found = repository.find_by_id(users[1].id)
+        first_page = repository.list_page(limit=2)
+        second_page = repository.list_page(limit=2, after=first_page.next_key)
+        missing = repository.find_by_id("not-a-uuid")
+        db.drop_all()
+
+    assert [(bytes(value), kind) for value, kind in stored] == [
+        (uuid.UUID(user.id).bytes, 'blob') for user in users
+    ]
+    assert found.id == users[1].id and str(found.email) == "user1@example.com"
+    assert [user.id for user in first_page.items + second_page.items] == [user.id for user in reversed(users)]
+    assert missing is None
+
+def test_registration_with_binary_storage(tmp_path):
+    """
+    正常系: binary でも登録で時刻順のIDが発行され、エンティティでは文字列として扱えるケース
+    """
+    app = make_app(tmp_path, USER_ID_STORAGE='binary')
+
+    with app.app_context():
+        usecase = UserRegistrationUseCase(
+            user_repository=SQLAlchemyUserRepository(db.session),
+            email_service=ConsoleEmailService()
+        )
+        registered = usecase.execute(UserRegistrationRequest(
+            email='binary@example.com', password='Password123!', name='Binary'
+        ))
+        found = SQLAlchemyUserRepository(db.session).find_by_id(registered.id)
+        db.drop_all()
+
+    assert uuid.UUID(registered.id).version == 7
+    assert found.name == 'Binary'
+
+def test_convert_existing_ids(tmp_path):
+    """
+    正常系: 文字列で保存された既存のIDを binary に変換し、binary の設定で読み出せ、元に戻せるケース
+    """
+    users = [make_user(i, user_id=str(uuid.uuid4())) for i in range(5)]
+    app = make_app(tmp_path)
+    with app.app_context():
+        SQLAlchemyUserRepository(db.session).add_many(users)
+
+    result = app.test_cli_runner().invoke(args=['users', 'convert-ids', 'binary', '--batch-size', '2'])
+    assert result.exit_code == 0, result.output
+    assert "5件のユーザーIDを変換しました" in result.output
+
+    binary_app = make_app(tmp_path, USER_ID_STORAGE='binary')
+    with binary_app.app_context():
+        assert {kind for _, kind in raw_ids()} == {'blob'}
+        repository = SQLAlchemyUserRepository(db.session)
+        assert all(repository.find_by_id(user.id).email == user.email for user in users)
+
+    # 変換済みの行は対象にならず、逆方向にも変換できる
+    assert "0件" in binary_app.test_cli_runner().invoke(args=['users', 'convert-ids', 'binary']).output
+    result = binary_app.test_cli_runner().invoke(args=['users', 'convert-ids', 'string'])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        assert [value for value, _ in raw_ids()] == [user.id for user in users]
+        db.drop_all()
+
+def test_convert_rejects_non_uuid_ids(tmp_path):
+    """
+    異常系: UUIDでないIDがある場合は何も変換せずにエラーになるケース
+    """
+    app = make_app(tmp_path)
+    with app.app_context():
+        SQLAlchemyUserRepository(db.session).add_many([make_user(0), make_user(1, user_id="legacy-1")])
+
+    result = app.test_cli_runner().invoke(args=['users', 'convert-ids', 'binary'])
+
+    assert result.exit_code != 0
+    assert "legacy-1" in result.output
+    with app.app_context():
+        assert {kind for _, kind in raw_ids()} == {'text'}
+        db.drop_all()
@@ -0,0 +1,143 @@
+"""
+キャッシュ付きユーザーリポジトリの統合テスト
+"""
+import pytest
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event
+
+from app import create_app, db
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.role import RoleType
+from app.infrastructure.database.models import UserModel
+from conftest import TEST_PASSWORD_HASH, make_user
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        'USER_CACHE_TTL_SECONDS': 60
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        app.container.user_repository().save(make_user("user-1", "user@example.com"))
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+@contextmanager
+def count_selects():
+    """実行されたSELECT文を記録する"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_identity_map_returns_same_instance_within_request(app):
+    """
+    正常系: 同じリクエスト内ではIDとメールアドレスのどちらで引いても同じインスタンスが返るケース
+    """
+    app.container._user_cache.invalidate("user-1")
+    repository = app.container.user_repository()
+
+    with app.test_request_context(), count_selects() as selects:
+        by_id = repository.find_by_id("user-1")
+        by_email = app.container.user_repository().find_by_email(Email("user@example.com"))
+
+    assert by_id is by_email
+    assert len(selects) == 1
+    assert app.container.user_cache_stats().snapshot()['identity_map_hits'] == 1
+
+def test_process_cache_is_shared_across_requests(app):
+    """
+    正常系: 保存時に書き込まれたキャッシュが別のリクエストで再利用され、別のインスタンスが返るケース
+    """
+    repository = app.container.user_repository()
+
+    with count_selects() as selects:
+        with app.test_request_context():
+            first = repository.find_by_id("user-1")
+        with app.test_request_context():
+            second = repository.find_by_email(Email("user@example.com"))
+
+    assert selects == []
+    assert first == second and first is not second
+
+def test_email_lookup_ignores_case(app):
+    """
+    正常系: 大文字小文字だけが異なるメールアドレスでもデータベースと同じく同じユーザーが見つかるケース
+    """
+    repository = app.container.user_repository()
+
+    with app.test_request_context():
+        assert repository.find_by_email(Email("USER@example.com")).id == "user-1"
+        assert repository.find_by_email(Email("user@EXAMPLE.com")).id == "user-1"
+
+def test_save_in_unit_of_work_writes_through_after_commit(app):
+    """
+    正常系: ユニットオブワークの確定後にキャッシュが保存後の値に置き換わり、取り消し時は変わらないケース
+    """
+    with app.test_request_context():
+        unit_of_work = app.container.unit_of_work()
+        with unit_of_work:
+            user = unit_of_work.users.find_by_id("user-1")
+            user.update_profile(name="Renamed")
+            unit_of_work.users.save(user)
+            assert app.container._user_cache.get_by_id("user-1").name == "Test User"
+
+        with pytest.raises(RuntimeError):
+            with app.container.unit_of_work() as rolled_back:
+                user = rolled_back.users.find_by_id("user-1")
+                user.update_profile(name="Rolled Back")
+                rolled_back.users.save(user)
+                raise RuntimeError()
+
+        assert app.container.user_repository().find_by_id("user-1").name == "Renamed"
+
+    assert app.container._user_cache.get_by_id("user-1").name == "Renamed"
+
+def test_database_read_populates_process_cache(app):
+    """
+    正常系: 保存を経由せずに追加された行も、初回の読み込みでキャッシュされ別のリクエストで再利用されるケース
+    """
+    now = datetime.utcnow()
+    db.session.execute(UserModel.__table__.insert().values(
+        id="user-2",
+        email="direct@example.com",
+        email_normalized="direct@example.com",
+        password_hash=TEST_PASSWORD_HASH,
+        name="Direct User",
+        role=RoleType.USER,
+        is_active=True,
+        created_at=now,
+        updated_at=now
+    ))
+    db.session.commit()
+    repository = app.container.user_repository()
+
+    with count_selects() as selects:
+        with app.test_request_context():
+            first = repository.find_by_id("user-2")
+        with app.test_request_context():
+            second = repository.find_by_email(Email("direct@example.com"))
+
+    assert first == second and first is not second
+    assert len(selects) == 1
+    stats = app.container.user_cache_stats().snapshot()
+    assert (stats['misses'], stats['cache_hits']) == (1, 1)
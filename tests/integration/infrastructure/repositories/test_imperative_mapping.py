@@ -0,0 +1,145 @@
+"""
+User エンティティの命令的マッピングによる読み込みの統合テスト
+"""
+import time
+import pytest
+from datetime import datetime
+from sqlalchemy import inspect as sa_inspect
+
+from app import create_app, db
+from app.domain.entities.user import User
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+from app.domain.value_objects.role import Role, RoleType
+from app.infrastructure.database.models import UserModel
+from app.infrastructure.database.orm import is_mapped, stop_mappers
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from app.infrastructure.services.token_cache import VerifiedTokenCache
+from conftest import TEST_PASSWORD_HASH, make_user as make_test_user
+
+@pytest.fixture
+def app():
+    """User エンティティを直接マッピングするFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        'USER_REPOSITORY_MAPPING': 'imperative'
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用データベースを初期化し、終了時にマッピングを解除"""
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.remove()
+        db.drop_all()
+    # マッピングは User クラス全体に作用するため、他のテストに持ち越さない
+    stop_mappers()
+
+@pytest.fixture
+def repository(app):
+    """命令的マッピングで読み込むリポジトリ"""
+    return SQLAlchemyUserRepository(db.session, load_entities=True)
+
+def make_user(user_id="user-1", email="test@example.com"):
+    """ハッシュ化を省略したテストユーザーを作成"""
+    return make_test_user(
+        user_id, email, role=RoleType.ADMIN, created_at=datetime(2024, 1, 1, 12, 0, 0), security_version=3
+    )
+
+def test_container_maps_user_entity(app):
+    """設定に応じてコンテナのリポジトリがマッピングを有効にすること"""
+    assert app.container.user_repository().inner.load_entities is True
+    assert is_mapped()
+
+def test_find_by_id_returns_entity_with_value_objects(repository):
+    """IDで検索した結果が値オブジェクトを組み立てた User であること"""
+    repository.save(make_user())
+
+    user = repository.find_by_id("user-1")
+
+    assert isinstance(user, User)
+    assert user.email == Email("test@example.com")
+    assert user._password is None
+    assert user.role == Role(RoleType.ADMIN)
+    assert user.name == "Test User"
+    assert user.is_active is True
+    assert user.security_version == 3
+    assert user.created_at == datetime(2024, 1, 1, 12, 0, 0)
+
+def test_find_by_ids_returns_detached_entities(repository):
+    """複数のIDで検索した結果がセッションから切り離され、パスワードのハッシュを含まないこと"""
+    repository.save(make_user())
+    repository.save(make_user("user-2", "other@example.com"))
+
+    users = repository.find_by_ids(["user-1", "user-2"])
+
+    assert sorted(users) == ["user-1", "user-2"]
+    assert all(user._password is None and user not in db.session for user in users.values())
+
+def test_find_by_email(repository):
+    """メールアドレスで検索できること"""
+    repository.save(make_user())
+
+    user = repository.find_by_email(Email("test@example.com"))
+
+    assert user is not None
+    assert user.id == "user-1"
+    assert repository.find_by_email(Email("other@example.com")) is None
+    assert repository.find_by_id("missing") is None
+    credentials = repository.find_credentials_by_email(Email("test@example.com"))
+    assert credentials._password == Password(TEST_PASSWORD_HASH)
+
+def test_loaded_entity_changes_are_saved_only_explicitly(repository):
+    """読み込んだエンティティの変更は save を呼ぶまでデータベースに反映されないこと"""
+    repository.save(make_user())
+    user = repository.find_by_id("user-1")
+    assert user not in db.session
+
+    user.update_profile(name="Changed")
+    db.session.commit()
+    assert db.session.get(UserModel, "user-1").name == "Test User"
+
+    repository.save(user)
+    db.session.expire_all()
+    saved = db.session.get(UserModel, "user-1")
+    assert saved.name == "Changed"
+    # 読み込んでいないパスワードのハッシュは保存で消えない
+    assert saved.password_hash == TEST_PASSWORD_HASH
+    assert repository.find_by_id("user-1").name == "Changed"
+
+def test_verified_token_cache_copies_do_not_share_orm_state(app):
+    """検証済みトークンのキャッシュが返す複製は、セッション内の元のインスタンスとORMの状態を共有しないこと"""
+    user = make_user()
+    db.session.add(user)
+    cache = VerifiedTokenCache()
+    cache.put('token', user, 'jti', time.time() + 60)
+
+    cached, _ = cache.get('token')
+
+    assert cached == user
+    assert sa_inspect(cached) is not sa_inspect(user)
+    assert cached not in db.session and user in db.session
+    cached.update_profile(name="Changed")
+    assert user.name == "Test User"
+    assert not db.session.dirty
+
+def test_register_and_login_with_imperative_mapping(app):
+    """マッピングを有効にした状態でも登録・ログインができること"""
+    client = app.test_client()
+    response = client.post('/api/auth/register', json={
+        'email': 'mapped@example.com',
+        'password': 'Password123!',
+        'name': 'Mapped User'
+    })
+    assert response.status_code == 201
+
+    response = client.post('/api/auth/login', json={
+        'email': 'mapped@example.com',
+        'password': 'Password123!'
+    })
+    assert response.status_code == 200
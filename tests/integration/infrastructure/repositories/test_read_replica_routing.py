@@ -0,0 +1,138 @@
+"""
+読み取りレプリカへの振り分けの統合テスト
+"""
+import pytest
+
+from app import create_app, db
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.role import RoleType
+from app.infrastructure.database.models import UserModel
+from app.infrastructure.database.routing import REPLICA_ENGINE_KEY
+from app.infrastructure.database.sqlite_replica import SQLiteReplicaCopier, sqlite_path
+from conftest import make_user as make_test_user
+
+@pytest.fixture
+def app(tmp_path):
+    """プライマリとレプリカを別のSQLiteファイルにしたFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_REPLICA_URI': f"sqlite:///{tmp_path / 'replica.db'}",
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key'
+    })
+    return app
+
+@pytest.fixture
+def copier(app):
+    """プライマリの内容をレプリカに複製するコピー機能"""
+    with app.app_context():
+        return SQLiteReplicaCopier(
+            sqlite_path(db.engine.url), sqlite_path(app.extensions[REPLICA_ENGINE_KEY].url)
+        )
+
+@pytest.fixture(autouse=True)
+def init_database(app, copier):
+    """プライマリにテーブルを作成してレプリカに複製"""
+    with app.app_context():
+        db.create_all()
+    copier.sync()
+    yield
+    with app.app_context():
+        db.drop_all()
+
+def make_user(user_id):
+    """ハッシュ化を省略したテストユーザーを作成"""
+    return make_test_user(user_id, name="Replica User")
+
+def test_reads_go_to_replica_until_synced(app, copier):
+    """
+    正常系: 読み取りはレプリカに送られ、複製されるまでプライマリの書き込みが見えないケース
+    """
+    with app.app_context():
+        app.container.user_repository().save(make_user("user-1"))
+
+    with app.test_request_context():
+        repository = app.container.user_repository()
+        assert repository.find_by_id("user-1") is None
+        assert repository.find_by_email(Email("user-1@example.com")) is None
+
+    copier.sync()
+
+    with app.test_request_context():
+        repository = app.container.user_repository()
+        assert repository.find_by_id("user-1").name == "Replica User"
+        assert [user.id for user in repository.list_page().items] == ["user-1"]
+
+def test_reads_stick_to_primary_after_write_in_request(app):
+    """
+    正常系: 同じリクエストで書き込んだ後の読み取りはプライマリに送られ、次のリクエストでは戻るケース
+    """
+    with app.app_context():
+        app.container.user_repository().save(make_user("user-1"))
+
+    with app.test_request_context():
+        repository = app.container.user_repository()
+        assert repository.find_by_id("user-1") is None
+        repository.save(make_user("user-2"))
+        assert repository.find_by_id("user-1") is not None
+        assert repository.exists_super_admin() is False
+
+    with app.test_request_context():
+        assert app.container.user_repository().find_by_id("user-2") is None
+
+def test_registration_and_login_over_replica(app, copier):
+    """
+    正常系: 登録はプライマリに書き込まれ、複製後にレプリカ経由でログインできるケース
+    """
+    client = app.test_client()
+    credentials = {'email': 'replica@example.com', 'password': 'Password123!'}
+    response = client.post('/api/auth/register', json={**credentials, 'name': 'Replica User'})
+    assert response.status_code == 201
+
+    assert client.post('/api/auth/login', json=credentials).status_code == 401
+    copier.sync()
+    assert client.post('/api/auth/login', json=credentials).status_code == 200
+
+def test_super_admin_check_reads_primary(app):
+    """
+    異常系: レプリカに複製される前でも、2人目のスーパー管理者の登録が拒否されるケース
+    """
+    client = app.test_client()
+    first = client.post('/api/admin/super-admin/register', json={
+        'email': 'super1@example.com', 'password': 'Password123!', 'name': 'Super Admin 1'
+    })
+    second = client.post('/api/admin/super-admin/register', json={
+        'email': 'super2@example.com', 'password': 'Password123!', 'name': 'Super Admin 2'
+    })
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert second.get_json()['error'] == "スーパー管理者は既に登録されています"
+    with app.app_context():
+        assert db.session.query(UserModel).filter_by(role=RoleType.SUPER_ADMIN).count() == 1
+
+def test_replica_sync_command(app):
+    """
+    正常系: CLIコマンドでプライマリの内容がレプリカに複製されるケース
+    """
+    with app.app_context():
+        app.container.user_repository().save(make_user("user-1"))
+
+    result = app.test_cli_runner().invoke(args=['replica', 'sync'])
+
+    assert result.exit_code == 0, result.output
+    with app.test_request_context():
+        assert app.container.user_repository().find_by_id("user-1") is not None
+
+@pytest.mark.parametrize("url", [
+    "postgresql://user@localhost/app",
+    "sqlite:///:memory:",
+    "sqlite://",
+])
+def test_sqlite_path_rejects_non_file_url(url):
+    """
+    異常系: SQLiteファイル以外のURLではValueErrorになるケース
+    """
+    with pytest.raises(ValueError, match="SQLiteファイルのURIではありません"):
+        sqlite_path(url)
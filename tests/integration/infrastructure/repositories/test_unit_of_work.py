@@ -0,0 +1,130 @@
+"""
+SQLAlchemyユニットオブワークの統合テスト
+"""
+import json
+import pytest
+from http import HTTPStatus
+from unittest.mock import Mock, patch
+
+from app import create_app, db
+from app.infrastructure.database.metrics import commit_count
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from app.infrastructure.repositories.unit_of_work import SQLAlchemyUnitOfWork
+from conftest import make_user as make_test_user
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        'DB_METRICS_HEADER': True
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+def make_user(index):
+    """ハッシュ化を省略したテストユーザーを作成"""
+    return make_test_user(f"user-{index}", f"user{index}@example.com", name=f"User {index}")
+
+def test_writes_are_committed_once(app):
+    """
+    正常系: 複数の書き込みが1回のコミットで確定され、保存通知が確定後に送られるケース
+    """
+    listener = Mock()
+    unit_of_work = SQLAlchemyUnitOfWork(
+        db.session,
+        user_repository_factory=lambda session, autocommit: SQLAlchemyUserRepository(
+            session, save_listeners=[listener], autocommit=autocommit
+        )
+    )
+
+    with unit_of_work:
+        for index in range(3):
+            unit_of_work.users.save(make_user(index))
+        listener.assert_not_called()
+
+    assert unit_of_work.commit_count == 1
+    assert commit_count() == 1
+    assert listener.call_count == 3
+    assert SQLAlchemyUserRepository(db.session).find_by_id("user-2") is not None
+
+def test_rollback_on_error(app):
+    """
+    異常系: with文の中で例外が発生した場合は書き込みが取り消されるケース
+    """
+    unit_of_work = app.container.unit_of_work()
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work:
+            unit_of_work.users.save(make_user(1))
+            raise RuntimeError("失敗")
+
+    assert unit_of_work.commit_count == 0
+    assert SQLAlchemyUserRepository(db.session).find_by_id("user-1") is None
+
+def test_rollback_when_commit_fails(app):
+    """
+    異常系: コミット自体が失敗した場合もロールバックされ、保留中の保存通知が破棄されるケース
+    """
+    listener = Mock()
+    unit_of_work = SQLAlchemyUnitOfWork(
+        db.session,
+        user_repository_factory=lambda session, autocommit: SQLAlchemyUserRepository(
+            session, save_listeners=[listener], autocommit=autocommit
+        )
+    )
+
+    with patch.object(db.session, 'commit', side_effect=RuntimeError("コミットに失敗")):
+        with pytest.raises(RuntimeError):
+            with unit_of_work:
+                unit_of_work.users.save(make_user(1))
+
+    listener.assert_not_called()
+    assert unit_of_work.users._pending_saved == []
+    # セッションは取り消し済みで、続けて使用できる
+    assert SQLAlchemyUserRepository(db.session).find_by_id("user-1") is None
+    with unit_of_work:
+        unit_of_work.users.save(make_user(2))
+    assert listener.call_count == 1
+
+def test_checkpoint_commits_in_batches(app):
+    """
+    正常系: バッチサイズごとに途中確定されるケース
+    """
+    unit_of_work = app.container.unit_of_work(batch_size=2)
+
+    with unit_of_work:
+        for index in range(5):
+            unit_of_work.users.save(make_user(index))
+            unit_of_work.checkpoint()
+
+    # 2件 × 2回の途中確定と、残り1件の最終確定
+    assert unit_of_work.commit_count == 3
+
+def test_registration_request_commits_once(app):
+    """
+    正常系: ユーザー登録リクエストのコミット数が1回であるケース
+    """
+    response = app.test_client().post(
+        '/api/auth/register',
+        data=json.dumps({
+            'email': "metrics@example.com",
+            'password': "Password123!",
+            'name': "Metrics User"
+        }),
+        content_type='application/json'
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.headers['X-DB-Commit-Count'] == '1'
@@ -0,0 +1,281 @@
+"""
+SQLAlchemyユーザーリポジトリの統合テスト
+"""
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app import create_app, db
+from app.domain.exceptions import UserAlreadyExistsError
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+from app.domain.value_objects.role import Role, RoleType
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository, _is_email_conflict
+from conftest import TEST_PASSWORD_HASH, make_user as make_test_user
+
+# テストデータ
+TEST_EMAIL = "repository@example.com"
+TEST_NAME = "Repository User"
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key'
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def user_repository(init_database):
+    """ユーザーリポジトリのインスタンスを作成"""
+    return SQLAlchemyUserRepository(db.session)
+
+def make_user(user_id="test-id", email=TEST_EMAIL, role=RoleType.USER, created_at=None):
+    """ハッシュ化を省略したテストユーザーを作成"""
+    return make_test_user(user_id, email, role=role, name=TEST_NAME, created_at=created_at)
+
+@contextmanager
+def count_statements():
+    """実行されたSQL文を記録する"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+@contextmanager
+def record_parameters():
+    """実行されたSQL文のパラメーターを記録する"""
+    parameters = []
+
+    def before_cursor_execute(conn, cursor, statement, params, context, executemany):
+        parameters.append(params)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield parameters
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def test_insert_is_single_statement(user_repository):
+    """
+    正常系: 新規ユーザーの保存が1文で行われるケース
+    """
+    with count_statements() as statements:
+        saved = user_repository.save(make_user())
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith('INSERT')
+    assert saved.email == Email(TEST_EMAIL)
+    assert saved.role == Role(RoleType.USER)
+
+def test_update_is_single_statement_and_keeps_created_at(user_repository):
+    """
+    正常系: 既存ユーザーの更新が1文で行われ、作成日時が維持されるケース
+    """
+    created_at = datetime(2024, 1, 1)
+    user_repository.save(make_user(created_at=created_at))
+
+    user = make_user(created_at=datetime.utcnow())
+    user.update_profile(name="Updated Name")
+    with count_statements() as statements:
+        saved = user_repository.save(user)
+
+    assert len(statements) == 1
+    assert saved.name == "Updated Name"
+    assert saved.created_at == created_at
+    assert user_repository.find_by_id("test-id").name == "Updated Name"
+
+def test_find_existing_emails_in_batches(user_repository):
+    """
+    正常系: 登録済みのメールアドレスだけがIN句の分割問い合わせで返されるケース
+    """
+    user_repository.add_many([make_user(f"id-{i}", f"user{i}@example.com") for i in range(3)])
+    user_repository.IN_CLAUSE_BATCH_SIZE = 2
+    emails = [f"user{i}@example.com" for i in range(5)]
+
+    with count_statements() as statements:
+        existing = user_repository.find_existing_emails(emails)
+
+    assert existing == {"user0@example.com", "user1@example.com", "user2@example.com"}
+    assert len(statements) == 3
+
+def test_add_many_inserts_in_one_executemany(user_repository):
+    """
+    正常系: 複数ユーザーが1回のINSERT実行で追加されるケース
+    """
+    users = [make_user(f"id-{i}", f"user{i}@example.com") for i in range(50)]
+
+    with count_statements() as statements:
+        user_repository.add_many(users)
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT')]
+    assert len(inserts) == 1
+    assert user_repository.find_by_id("id-49").email == Email("user49@example.com")
+
+def test_iter_summaries_skips_password_hash(user_repository):
+    """
+    正常系: 絞り込んだユーザーがパスワードハッシュを読み込まずにID順で取得されるケース
+    """
+    user_repository.add_many([
+        make_user("id-2", "user2@example.com"),
+        make_user("id-1", "user1@example.com"),
+        make_user("id-3", "admin@example.com", role=RoleType.ADMIN),
+    ])
+
+    with count_statements() as statements:
+        summaries = list(user_repository.iter_summaries(role=RoleType.USER, batch_size=1))
+
+    assert [summary.id for summary in summaries] == ["id-1", "id-2"]
+    assert summaries[0].email == "user1@example.com"
+    assert len(statements) == 1
+    assert 'password_hash' not in statements[0]
+
+def test_find_by_id_skips_password_hash(user_repository):
+    """
+    正常系: IDでの検索はパスワードハッシュを読み込まず、認証用の検索でのみ読み込むケース
+    """
+    user_repository.save(make_user())
+
+    with count_statements() as statements:
+        user = user_repository.find_by_id("test-id")
+        credentials = user_repository.find_credentials_by_email(Email(TEST_EMAIL))
+
+    assert user.email == Email(TEST_EMAIL)
+    assert not user.has_credentials
+    assert 'password_hash' not in statements[0]
+    assert credentials._password == Password(TEST_PASSWORD_HASH)
+    assert 'password_hash' in statements[1]
+
+def test_save_without_credentials_keeps_password_hash(user_repository):
+    """
+    正常系: パスワードハッシュを読み込んでいないユーザーを保存してもハッシュが維持されるケース
+    """
+    user_repository.save(make_user())
+    user = user_repository.find_by_email(Email(TEST_EMAIL))
+
+    user.deactivate()
+    saved_user = user_repository.save(user)
+
+    assert saved_user.is_active is False
+    credentials = user_repository.find_credentials_by_email(Email(TEST_EMAIL))
+    assert credentials.is_active is False
+    assert credentials._password == Password(TEST_PASSWORD_HASH)
+
+def test_find_by_email_ignores_case_using_index(user_repository):
+    """
+    正常系: 大文字小文字の異なるメールアドレスでも、正規化した列のインデックスで検索されるケース
+    """
+    user_repository.save(make_user(email="Mixed.Case@Example.com"))
+
+    with count_statements() as statements, record_parameters() as parameters:
+        user = user_repository.find_by_email(Email("mixed.case@example.COM"))
+
+    assert user.id == "test-id"
+    assert str(user.email) == "Mixed.Case@Example.com"
+    assert user_repository.find_existing_emails(["MIXED.case@example.com"]) == {"mixed.case@example.com"}
+    plan = db.session.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + statements[0], parameters[0]
+    ).fetchall()
+    assert "USING INDEX ux_users_email_normalized" in plan[0][-1]
+
+def test_email_differing_only_in_case_is_rejected(user_repository):
+    """
+    異常系: 大文字小文字だけが異なるメールアドレスの別ユーザーは一意制約で拒否されるケース
+    """
+    user_repository.save(make_user(email="dup@example.com"))
+
+    with pytest.raises(UserAlreadyExistsError):
+        user_repository.save(make_user(user_id="other-id", email="DUP@example.com"))
+
+    # 取り消し後も同じセッションで続けて書き込めること
+    user_repository.save(make_user(user_id="other-id", email="other@example.com"))
+    assert user_repository.find_by_id("other-id") is not None
+
+class DriverError(Exception):
+    """ドライバーの例外（PostgreSQLの diag を持たせられる）"""
+
+    def __init__(self, message, constraint_name=None):
+        super().__init__(message)
+        if constraint_name is not None:
+            self.diag = SimpleNamespace(constraint_name=constraint_name)
+
+@pytest.mark.parametrize("orig, expected", [
+    (DriverError("UNIQUE constraint failed: users.email_normalized"), True),
+    (DriverError("UNIQUE constraint failed: users.email"), True),
+    (DriverError("UNIQUE constraint failed: users.id"), False),
+    (DriverError("UNIQUE constraint failed: user_emails.email_normalized"), False),
+    (DriverError("duplicate key", constraint_name="ux_users_email_normalized"), True),
+    (DriverError("duplicate key", constraint_name="users_email_key"), True),
+    (DriverError('violates unique constraint "ux_users_email_normalized"', constraint_name="users_pkey"), False),
+    (DriverError('duplicate key value violates unique constraint "users_email_key"'), True),
+    (DriverError('duplicate key value violates unique constraint "users_pkey"'), False),
+    (DriverError("(1062, \"Duplicate entry 'a@example.com' for key 'users.email'\")"), True),
+    (DriverError("(1062, \"Duplicate entry 'a@example.com' for key 'ux_users_email_normalized'\")"), True),
+    (DriverError("(1062, \"Duplicate entry 'email-id' for key 'users.PRIMARY'\")"), False),
+    (DriverError("NOT NULL constraint failed: users.email"), False),
+])
+def test_is_email_conflict(orig, expected):
+    """
+    正常系: 既知のメールアドレスの一意制約・列の違反だけをメールアドレスの重複と判定するケース
+    """
+    assert _is_email_conflict(IntegrityError("INSERT", {}, orig)) is expected
+
+def test_list_page_walks_pages_with_keyset(user_repository):
+    """
+    正常系: 作成日時の新しい順に、同じ作成日時の行も欠けずにページをたどれるケース
+    """
+    base = datetime(2024, 1, 1)
+    user_repository.add_many([
+        make_user(f"id-{i}", f"user{i}@example.com", created_at=base + timedelta(minutes=i // 2))
+        for i in range(5)
+    ])
+
+    pages = [user_repository.list_page(limit=2)]
+    while pages[-1].next_key:
+        pages.append(user_repository.list_page(limit=2, after=pages[-1].next_key))
+
+    assert [[user.id for user in page.items] for page in pages] == [
+        ["id-4", "id-3"], ["id-2", "id-1"], ["id-0"]
+    ]
+
+@pytest.mark.parametrize("role", [None, RoleType.USER])
+@pytest.mark.parametrize("is_active", [None, True])
+@pytest.mark.parametrize("after", [None, (datetime(2024, 1, 1), "id-0")])
+def test_list_page_uses_index_range_scan(user_repository, role, is_active, after):
+    """
+    正常系: 絞り込み条件の組み合わせによらず、一覧の取得が複合インデックスの検索になり
+    全件走査・ソートが発生しないケース
+    """
+    with count_statements() as statements, record_parameters() as parameters:
+        user_repository.list_page(role=role, is_active=is_active, after=after)
+
+    plan = db.session.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + statements[-1], parameters[-1]
+    ).fetchall()
+    details = [row[-1] for row in plan]
+    assert len(details) == 1
+    assert "USING INDEX ix_users_" in details[0]
+    assert "TEMP B-TREE" not in details[0]
+    if role is not None or is_active is not None or after is not None:
+        assert details[0].startswith("SEARCH")
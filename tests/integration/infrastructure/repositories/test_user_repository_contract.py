@@ -0,0 +1,222 @@
+"""
+ユーザーリポジトリの実装に共通する振る舞いのテスト
+
+SQLAlchemyUserRepository と InMemoryUserRepository の両方に同じテストを実行する
+"""
+import pytest
+from datetime import datetime
+
+from app import create_app, db
+from app.domain.exceptions import UserAlreadyExistsError
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.password import Password
+from app.domain.value_objects.role import Role, RoleType
+from app.infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from app.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from conftest import TEST_PASSWORD_HASH, make_user as make_test_user
+
+@pytest.fixture(params=['sqlalchemy', 'memory'])
+def app(request):
+    """リポジトリの実装を切り替えたFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        'USER_REPOSITORY': request.param
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def repository(app):
+    """キャッシュを挟まないリポジトリ"""
+    store = app.container.in_memory_user_store()
+    if store is not None:
+        return InMemoryUserRepository(store)
+    return SQLAlchemyUserRepository(db.session)
+
+def make_user(user_id="user-1", email="user@example.com", role=RoleType.USER,
+              created_at=datetime(2024, 1, 1), is_active=True):
+    """ハッシュ化を省略したテストユーザーを作成"""
+    return make_test_user(
+        user_id, email, role=role, name="Contract User", is_active=is_active, created_at=created_at
+    )
+
+def test_find_by_id_returns_user_without_credentials(repository):
+    """IDでの検索はパスワードのハッシュを含まず、認証用の検索でのみ含むこと"""
+    repository.save(make_user())
+
+    user = repository.find_by_id("user-1")
+    credentials = repository.find_credentials_by_email(Email("user@example.com"))
+
+    assert user.email == Email("user@example.com")
+    assert user.name == "Contract User"
+    assert not user.has_credentials
+    assert credentials._password == Password(TEST_PASSWORD_HASH)
+    assert repository.find_by_id("missing") is None
+
+def test_find_by_ids_returns_found_users_by_id(repository):
+    """複数のIDでの検索は見つかったユーザーだけをIDごとに、パスワードのハッシュを含めずに返すこと"""
+    repository.add_many([make_user("user-1", "a@example.com"), make_user("user-2", "b@example.com")])
+
+    users = repository.find_by_ids(["user-2", "missing", "user-1", "user-2"])
+
+    assert sorted(users) == ["user-1", "user-2"]
+    assert str(users["user-2"].email) == "b@example.com"
+    assert not users["user-1"].has_credentials
+    assert repository.find_by_ids([]) == {}
+
+def test_find_by_email_ignores_case(repository):
+    """大文字小文字だけが異なるメールアドレスでも同じユーザーが見つかること"""
+    repository.save(make_user(email="Mixed@Example.com"))
+
+    assert repository.find_by_email(Email("mixed@example.COM")).id == "user-1"
+    assert str(repository.find_by_email(Email("mixed@example.com")).email) == "Mixed@Example.com"
+    assert repository.find_by_email(Email("other@example.com")) is None
+
+def test_save_without_credentials_keeps_hash_and_created_at(repository):
+    """ハッシュを読み込んでいないユーザーの保存でハッシュと作成日時が維持されること"""
+    repository.save(make_user())
+    user = repository.find_by_id("user-1")
+    user.created_at = datetime(2030, 1, 1)
+    user.update_profile(name="Renamed")
+
+    saved_user = repository.save(user)
+
+    assert saved_user.name == "Renamed"
+    credentials = repository.find_credentials_by_email(Email("user@example.com"))
+    assert credentials.name == "Renamed"
+    assert credentials.created_at == datetime(2024, 1, 1)
+    assert credentials._password == Password(TEST_PASSWORD_HASH)
+
+def test_returned_users_are_copies(repository):
+    """検索結果を変更しても保存するまで反映されないこと"""
+    repository.save(make_user())
+
+    repository.find_by_id("user-1").update_profile(name="Changed")
+
+    assert repository.find_by_id("user-1").name == "Contract User"
+
+def test_add_many_and_existing_emails(repository):
+    """まとめて追加したユーザーが正規化したメールアドレスで確認できること"""
+    repository.add_many([
+        make_user("user-1", "a@example.com"),
+        make_user("user-2", "b@example.com", role=RoleType.SUPER_ADMIN),
+    ])
+
+    assert repository.find_existing_emails(["A@example.com", "c@example.com"]) == {"a@example.com"}
+    assert repository.exists_super_admin()
+    assert repository.find_by_id("user-2").role == Role(RoleType.SUPER_ADMIN)
+
+def test_add_many_notifies_save_listeners_on_commit(app):
+    """まとめて追加したユーザーも、保存と同じく確定後にだけ保存後コールバックへ通知されること"""
+    registry = app.container.security_version_registry()
+
+    with pytest.raises(RuntimeError):
+        with app.container.unit_of_work() as unit_of_work:
+            unit_of_work.users.add_many([make_user("user-1", "a@example.com")])
+            raise RuntimeError("中断")
+    assert registry.latest("user-1") is None
+
+    with app.container.unit_of_work() as unit_of_work:
+        unit_of_work.users.add_many([make_user("user-1", "a@example.com")])
+        assert registry.latest("user-1") is None
+    assert registry.latest("user-1") == 0
+
+    app.container.user_repository().add_many([make_user("user-2", "b@example.com")])
+    assert registry.latest("user-2") == 0
+
+def test_exists_super_admin_without_super_admin(repository):
+    """スーパー管理者がいない場合はFalseであること"""
+    repository.save(make_user(role=RoleType.ADMIN))
+
+    assert not repository.exists_super_admin()
+
+def test_iter_summaries_filters_in_id_order(repository):
+    """絞り込んだユーザーがID順に取得されること"""
+    repository.add_many([
+        make_user("id-3", "c@example.com"),
+        make_user("id-1", "a@example.com"),
+        make_user("id-2", "b@example.com", role=RoleType.ADMIN),
+        make_user("id-4", "d@example.com", is_active=False),
+    ])
+
+    summaries = list(repository.iter_summaries(role=RoleType.USER, is_active=True, batch_size=1))
+
+    assert [summary.id for summary in summaries] == ["id-1", "id-3"]
+    assert summaries[0].email == "a@example.com"
+    assert summaries[0].role == RoleType.USER
+
+def test_list_page_walks_pages_with_keyset(repository):
+    """作成日時の新しい順に、同じ作成日時の行も欠けずにページをたどれること"""
+    repository.add_many([
+        make_user(f"id-{i}", f"user{i}@example.com", created_at=datetime(2024, 1, 1 + i // 2))
+        for i in range(5)
+    ])
+
+    pages = [repository.list_page(limit=2)]
+    while pages[-1].next_key is not None:
+        pages.append(repository.list_page(limit=2, after=pages[-1].next_key))
+
+    assert [[user.id for user in page.items] for page in pages] == [
+        ["id-4", "id-3"], ["id-2", "id-1"], ["id-0"]
+    ]
+    assert [user.id for user in repository.list_page(role=RoleType.ADMIN).items] == []
+
+def test_unit_of_work_rollback_discards_writes(app, repository):
+    """ユニットオブワークの取り消しで書き込みが元に戻り、確定した書き込みは残ること"""
+    repository.save(make_user())
+
+    with pytest.raises(RuntimeError):
+        with app.container.unit_of_work() as unit_of_work:
+            user = unit_of_work.users.find_by_id("user-1")
+            user.update_profile(name="Rolled Back")
+            unit_of_work.users.save(user)
+            unit_of_work.users.add_many([make_user("user-2", "new@example.com")])
+            assert unit_of_work.users.find_by_id("user-2") is not None
+            raise RuntimeError("中断")
+
+    assert repository.find_by_id("user-1").name == "Contract User"
+    assert repository.find_by_id("user-2") is None
+
+    with app.container.unit_of_work() as unit_of_work:
+        unit_of_work.users.add_many([make_user("user-2", "new@example.com")])
+    assert repository.find_by_id("user-2") is not None
+
+def test_register_and_login_through_api(app):
+    """APIからの登録・ログインがリポジトリの実装によらず動作すること"""
+    client = app.test_client()
+    response = client.post('/api/auth/register', json={
+        'email': 'api@example.com',
+        'password': 'Password123!',
+        'name': 'API User'
+    })
+    assert response.status_code == 201
+
+    response = client.post('/api/auth/login', json={
+        'email': 'API@example.com',
+        'password': 'Password123!'
+    })
+    assert response.status_code == 200
+
+def test_duplicate_email_raises_user_already_exists(repository):
+    """別のユーザーが同じメールアドレスで保存・追加すると UserAlreadyExistsError となり、既存ユーザーは変わらないこと"""
+    repository.save(make_user())
+
+    with pytest.raises(UserAlreadyExistsError):
+        repository.save(make_user("user-2", "USER@example.com"))
+    with pytest.raises(UserAlreadyExistsError):
+        repository.add_many([make_user("user-3", "new@example.com"), make_user("user-4", "user@example.com")])
+
+    assert repository.find_by_email(Email("user@example.com")).id == "user-1"
+    assert repository.find_by_id("user-2") is None
+    assert repository.find_existing_emails(["new@example.com"]) == set()
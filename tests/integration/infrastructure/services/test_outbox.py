@@ -0,0 +1,246 @@
+"""
+アウトボックスによるメール送信の統合テスト
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from sqlalchemy import event
+
+from app import create_app, db
+from app.application.usecases.user_registration import UserRegistrationRequest, UserRegistrationUseCase
+from app.domain.services.email_service import EmailService
+from app.infrastructure.database.models import OutboxMessageModel, UserModel
+from app.infrastructure.services.outbox import OutboxDispatcher, OutboxEmailService
+
+TEST_PASSWORD = "Password123!"
+
+@pytest.fixture
+def app():
+    """テスト用のFlaskアプリケーションを作成"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SECRET_KEY': 'test-secret-key',
+        'PASSWORD_HASH_ALGORITHM': 'pbkdf2',
+        'PASSWORD_HASH_COST': 1000
+    })
+    return app
+
+@pytest.fixture(autouse=True)
+def init_database(app):
+    """テスト用のデータベースを初期化"""
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.remove()
+        db.drop_all()
+
+class FakeClock:
+    """進めることのできる時計"""
+
+    def __init__(self):
+        # 登録時に記録される送信時刻より後から始める
+        self.now = datetime.utcnow() + timedelta(seconds=1)
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    """テスト用の時計"""
+    return FakeClock()
+
+@pytest.fixture
+def sender():
+    """実際の送信の代わりのモック（まとめての送信は既定の実装で1件ずつの送信に委ねる）"""
+    sender = Mock(spec=EmailService)
+    sender.send_confirmation_emails.side_effect = lambda users: EmailService.send_confirmation_emails(sender, users)
+    return sender
+
+@pytest.fixture
+def dispatcher(app, sender, clock):
+    """テスト用のディスパッチャー"""
+    return OutboxDispatcher(
+        db.session, app.container.user_repository(), sender,
+        batch_size=2, max_attempts=3, backoff_seconds=30.0, clock=clock
+    )
+
+def register(app, email="outbox@example.com"):
+    """アウトボックスを使うユースケースでユーザーを登録"""
+    unit_of_work = app.container.unit_of_work()
+    use_case = UserRegistrationUseCase(
+        user_repository=unit_of_work.users,
+        email_service=app.container.email_service(),
+        unit_of_work=unit_of_work
+    )
+    return use_case.execute(UserRegistrationRequest(email=email, password=TEST_PASSWORD, name="Outbox User"))
+
+def pending_messages():
+    """送信時刻を過ぎていない分も含めた送信待ちのメッセージ"""
+    db.session.expire_all()
+    return OutboxMessageModel.query.filter_by(status='pending').order_by(OutboxMessageModel.id).all()
+
+def test_register_api_queues_email_without_sending(app):
+    """
+    正常系: 登録APIは確認メールを送らず、ユーザーと同じトランザクションで送信を依頼するケース
+    """
+    with patch('app.infrastructure.services.email_service.ConsoleEmailService.send_confirmation_email') as send:
+        response = app.test_client().post('/api/auth/register', json={
+            'email': 'api@example.com', 'password': TEST_PASSWORD, 'name': 'API User'
+        })
+
+    assert response.status_code == 201
+    send.assert_not_called()
+    message = OutboxMessageModel.query.one()
+    assert message.kind == 'confirmation_email'
+    assert response.get_json()['user']['id'] in message.payload
+    assert isinstance(app.container.email_service(), OutboxEmailService)
+
+class FailingOutboxEmailService(OutboxEmailService):
+    """送信を依頼した直後に失敗するメールサービス"""
+
+    def send_confirmation_email(self, user):
+        super().send_confirmation_email(user)
+        raise RuntimeError("送信依頼の後に失敗しました")
+
+def test_rolled_back_registration_queues_nothing(app):
+    """
+    異常系: 登録のトランザクションが取り消された場合、ユーザーも送信依頼も残らないケース
+    """
+    unit_of_work = app.container.unit_of_work()
+    use_case = UserRegistrationUseCase(
+        user_repository=unit_of_work.users,
+        email_service=FailingOutboxEmailService(db.session),
+        unit_of_work=unit_of_work
+    )
+
+    with pytest.raises(RuntimeError):
+        use_case.execute(UserRegistrationRequest(
+            email="rollback@example.com", password=TEST_PASSWORD, name="Rollback User"
+        ))
+
+    assert OutboxMessageModel.query.count() == 0
+    assert UserModel.query.count() == 0
+
+def test_dispatch_sends_and_marks_messages(app, dispatcher, sender, clock):
+    """
+    正常系: 送信待ちのメッセージがバッチごとに送信され、送信済みになるケース
+    """
+    users = [register(app, f"user{i}@example.com") for i in range(3)]
+
+    first = dispatcher.dispatch_once()
+    rest = dispatcher.drain()
+
+    assert (first.sent, rest.sent) == (2, 1)
+    assert [call.args[0].id for call in sender.send_confirmation_email.call_args_list] == [u.id for u in users]
+    assert str(sender.send_confirmation_email.call_args_list[0].args[0].email) == "user0@example.com"
+    assert pending_messages() == []
+    assert OutboxMessageModel.query.filter_by(status='sent').count() == 3
+    assert dispatcher.dispatch_once().processed == 0
+
+def test_failed_sends_are_retried_with_backoff(app, dispatcher, sender, clock):
+    """
+    異常系: 送信に失敗したメッセージが待ち時間を倍々に延ばして再試行され、上限で打ち切られるケース
+    """
+    register(app)
+    sender.send_confirmation_email.side_effect = ConnectionError("SMTPに接続できません")
+
+    assert dispatcher.dispatch_once().retried == 1
+    message = pending_messages()[0]
+    assert message.attempts == 1
+    assert message.available_at == clock.now + timedelta(seconds=30)
+    assert message.last_error == "ConnectionError: SMTPに接続できません"
+
+    # 待ち時間が過ぎるまでは取り出さない
+    assert dispatcher.dispatch_once().processed == 0
+    clock.now += timedelta(seconds=30)
+    assert dispatcher.dispatch_once().retried == 1
+    assert pending_messages()[0].available_at == clock.now + timedelta(seconds=60)
+
+    clock.now += timedelta(seconds=60)
+    assert dispatcher.dispatch_once().failed == 1
+    assert pending_messages() == []
+    assert OutboxMessageModel.query.one().status == 'failed'
+
+def test_retry_succeeds_after_transient_failure(app, dispatcher, sender, clock):
+    """
+    正常系: 一時的な失敗の後、再試行で送信されるケース
+    """
+    register(app)
+    sender.send_confirmation_email.side_effect = [ConnectionError("一時的な失敗"), None]
+
+    dispatcher.dispatch_once()
+    clock.now += timedelta(seconds=30)
+    result = dispatcher.dispatch_once()
+
+    assert result.sent == 1
+    message = OutboxMessageModel.query.one()
+    assert (message.status, message.attempts) == ('sent', 2)
+
+def test_failures_are_recorded_per_message(app, dispatcher, sender, clock):
+    """
+    異常系: まとめて送信したうち失敗したメッセージだけが再試行待ちになるケース
+    """
+    users = [register(app, f"user{i}@example.com") for i in range(2)]
+    sender.send_confirmation_emails.side_effect = lambda batch: {users[1].id: ConnectionError("拒否されました")}
+
+    result = dispatcher.dispatch_once()
+
+    assert (result.sent, result.retried) == (1, 1)
+    assert [call.args[0] for call in sender.send_confirmation_emails.call_args_list] == [users]
+    assert pending_messages()[0].payload == f'{{"user_id": "{users[1].id}"}}'
+
+def test_send_happens_outside_transaction_after_claim(app, dispatcher, sender, clock):
+    """
+    正常系: 送信の時点では取り出し（送信時刻の延長）が確定済みで、トランザクションを保持していないケース
+    """
+    register(app)
+    observed = {}
+
+    def send(user):
+        observed['in_transaction'] = db.session().in_transaction()
+        observed['available_at'] = pending_messages()[0].available_at
+
+    sender.send_confirmation_email.side_effect = send
+
+    assert dispatcher.dispatch_once().sent == 1
+    assert observed == {'in_transaction': False, 'available_at': clock.now + timedelta(seconds=300)}
+
+def test_users_are_loaded_with_one_query(app, dispatcher, sender):
+    """
+    正常系: バッチのユーザーを1回の問い合わせでまとめて読み込むケース
+    """
+    for i in range(2):
+        register(app, f"user{i}@example.com")
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM users' in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        assert dispatcher.dispatch_once().sent == 2
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert len(statements) == 1
+    assert ' IN ' in statements[0].upper()
+
+def test_interrupted_dispatch_is_redelivered_after_lease(app, dispatcher, sender, clock):
+    """
+    異常系: 送信中に停止したメッセージは、取り出しの期限が過ぎるまで他のディスパッチャーに取り出されず、
+    期限の後に再送されるケース
+    """
+    register(app)
+    sender.send_confirmation_email.side_effect = KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        dispatcher.dispatch_once()
+
+    sender.send_confirmation_email.side_effect = None
+    assert dispatcher.dispatch_once().processed == 0
+    clock.now += timedelta(seconds=300)
+    assert dispatcher.dispatch_once().sent == 1
+    assert OutboxMessageModel.query.one().attempts == 1
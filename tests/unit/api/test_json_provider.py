@@ -0,0 +1,71 @@
+"""
+JSONプロバイダーのテストモジュール
+"""
+import json
+import sys
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.api.json_provider import OrjsonJSONProvider, create_json_provider
+
+pytest.importorskip("orjson")
+
+
+def make_app(**config):
+    """設定を指定したFlaskアプリケーションを作成"""
+    app = Flask(__name__)
+    app.config.update(config)
+    return app
+
+
+def test_orjson_matches_default_provider():
+    """
+    正常系: orjson の出力が標準のプロバイダーと同じ値・同じキーの順になるケース
+    """
+    app = make_app()
+    payload = {'b': [1, 2.5, None], 'a': "日本語", 'at': datetime(2024, 1, 1, 12, 0)}
+    orjson_provider, default_provider = OrjsonJSONProvider(app), DefaultJSONProvider(app)
+
+    with app.app_context():
+        response = orjson_provider.response(payload)
+
+    assert response.data.endswith(b"\n")
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == json.loads(default_provider.dumps(payload))
+    assert list(json.loads(response.data)) == ['a', 'at', 'b']
+    assert orjson_provider.loads(orjson_provider.dumps(payload))['at'] == "Mon, 01 Jan 2024 12:00:00 GMT"
+
+def test_unsupported_arguments_fall_back_to_json():
+    """
+    正常系: orjson が対応しない引数の場合は標準の変換を使うケース
+    """
+    provider = OrjsonJSONProvider(make_app())
+
+    assert provider.dumps({'a': "日本語"}, ensure_ascii=False) == '{"a": "日本語"}'
+    assert provider.dumps([1], indent=4) == "[\n    1\n]"
+
+@pytest.mark.parametrize("name, expected", [
+    ('auto', OrjsonJSONProvider),
+    ('orjson', OrjsonJSONProvider),
+    ('default', DefaultJSONProvider),
+])
+def test_create_json_provider(name, expected):
+    """
+    正常系: JSON_PROVIDER に応じたプロバイダーが作成されるケース
+    """
+    assert type(create_json_provider(make_app(JSON_PROVIDER=name))) is expected
+
+def test_orjson_not_installed():
+    """
+    異常系: orjson がない場合、'auto' は標準のプロバイダーになり、'orjson' はエラーになるケース
+    """
+    with patch.dict(sys.modules, {'orjson': None}):
+        assert type(create_json_provider(make_app(JSON_PROVIDER='auto'))) is DefaultJSONProvider
+        with pytest.raises(RuntimeError):
+            create_json_provider(make_app(JSON_PROVIDER='orjson'))
+
+    with pytest.raises(ValueError):
+        create_json_provider(make_app(JSON_PROVIDER='ujson'))
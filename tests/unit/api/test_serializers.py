@@ -0,0 +1,95 @@
+"""
+APIレスポンスのシリアライザーのテストモジュール
+"""
+import pytest
+from datetime import datetime
+
+from app.api.serializers import (
+    Field,
+    Serializer,
+    USER_SERIALIZER,
+    parse_fields,
+    serialize,
+    serialize_many,
+    serializer_for
+)
+from app.domain.entities.user import User
+from app.domain.exceptions import ValidationError
+from app.domain.read_models.user_summary import UserSummary
+from app.domain.value_objects.role import RoleType
+from conftest import make_user as make_test_user
+
+
+def make_user(index=0):
+    """テストユーザーを作成"""
+    return make_test_user(
+        f"user-{index}", f"user{index}@example.com", role=RoleType.ADMIN, name=f"User {index}",
+        created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 2)
+    )
+
+
+class TestSerializer:
+    """シリアライザーのテストクラス"""
+
+    def test_default_fields(self):
+        """既定の項目で変換され、認証情報が含まれないテスト"""
+        assert serialize(make_user()) == {
+            'id': "user-0",
+            'email': "user0@example.com",
+            'name': "User 0",
+            'role': "admin",
+            'is_active': True
+        }
+
+    def test_sparse_fields_follow_declared_order(self):
+        """指定した項目だけが宣言の順に含まれ、同じ組み合わせでは同じ関数を使うテスト"""
+        user = make_user()
+
+        dumped = serialize(user, fields=['updated_at', 'id'])
+
+        assert list(dumped.items()) == [('id', "user-0"), ('updated_at', "2024-01-02T00:00:00")]
+        assert USER_SERIALIZER.plan(['id', 'updated_at']) is USER_SERIALIZER.plan(['updated_at', 'id'])
+
+    def test_unknown_field_is_rejected(self):
+        """指定できない項目がValidationErrorになるテスト（空の一覧でも検証する）"""
+        with pytest.raises(ValidationError):
+            serialize(make_user(), fields=['id', 'password'])
+        with pytest.raises(ValidationError):
+            serialize_many([], UserSummary, fields=['password'])
+
+    def test_summary_matches_read_model(self):
+        """ユーザー一覧の変換が UserSummary.to_dict と同じになるテスト"""
+        summary = UserSummary(
+            id="user-0", email="user0@example.com", name="User 0", role=RoleType.USER,
+            is_active=False, created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 2)
+        )
+
+        assert serialize_many([summary], UserSummary) == [summary.to_dict()]
+        assert serialize_many([], UserSummary) == []
+
+    def test_registry_uses_base_class(self):
+        """サブクラスには基底クラスのシリアライザーが使われ、未登録の型はLookupErrorになるテスト"""
+        class SpecialUser(User):
+            pass
+
+        assert serializer_for(SpecialUser) is USER_SERIALIZER
+        with pytest.raises(LookupError):
+            serializer_for(object)
+
+    def test_invalid_path(self):
+        """識別子でない属性のパスが拒否されるテスト"""
+        with pytest.raises(ValueError):
+            Field('id', 'id; import os')
+        assert Serializer([Field('name', 'name', str.upper)]).dump(make_user()) == {'name': "USER 0"}
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    (" , ", None),
+    ("id,email", ['id', 'email']),
+    (" id , name ,", ['id', 'name']),
+])
+def test_parse_fields(value, expected):
+    """?fields= の値の解析のテスト"""
+    assert parse_fields(value) == expected
@@ -9,14 +9,20 @@ from app.application.usecases.admin_registration import AdminRegistrationUseCase
 from app.domain.entities.user import User
 from app.domain.value_objects.email import Email
 from app.domain.value_objects.password import Password
+from app.domain.value_objects.principal import Principal
 from app.domain.value_objects.role import Role, RoleType
-from app.domain.exceptions import UserAlreadyExistsError, UnauthorizedError
+from app.domain.services.password_hasher import InlinePasswordHasher, PasswordHashPolicy
+from app.domain.exceptions import UserAlreadyExistsError, UnauthorizedError, ValidationError
+from app.infrastructure.repositories.in_memory_user_repository import (
+    InMemoryUnitOfWork,
+    InMemoryUserRepository,
+    InMemoryUserStore
+)
 
 # テストデータ
 TEST_ADMIN_EMAIL = "admin@example.com"
 TEST_ADMIN_PASSWORD = "Password123!"
 TEST_ADMIN_NAME = "Test Admin"
-TEST_SUPER_ADMIN_EMAIL = "super.admin@example.com"
 
 @pytest.fixture
 def mock_user_repository():
@@ -28,30 +34,19 @@ def admin_registration_usecase(mock_user_repository):
     """管理者登録ユースケースのフィクスチャ"""
     return AdminRegistrationUseCase(user_repository=mock_user_repository)
 
+def make_principal(role_type):
+    """トークンのクレームから組み立てた主体の代わり"""
+    return Principal(user_id=f"{role_type.value}-id", role=Role(role_type), is_active=True, security_version=0)
+
 @pytest.fixture
-def super_admin_user():
-    """スーパー管理者ユーザーのフィクスチャ"""
-    return User(
-        id="super-admin-id",
-        _email=Email(TEST_SUPER_ADMIN_EMAIL),
-        _password=Password.create(TEST_ADMIN_PASSWORD),
-        name="Super Admin",
-        role=Role(RoleType.SUPER_ADMIN),
-        is_active=True,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
+def super_admin():
+    """スーパー管理者の主体のフィクスチャ"""
+    return make_principal(RoleType.SUPER_ADMIN)
 
-def test_successful_admin_registration(admin_registration_usecase, mock_user_repository, super_admin_user):
+def test_successful_admin_registration(admin_registration_usecase, mock_user_repository, super_admin):
     """
     正常系: 管理者登録が成功するケース
     """
-    # モックの設定
-    mock_user_repository.find_by_email.side_effect = [
-        super_admin_user,  # スーパー管理者の検索結果
-        None  # 新規管理者のメールアドレス検索結果
-    ]
-
     # 保存されるユーザーオブジェクトを作成
     expected_admin = User(
         id="test-admin-id",
@@ -70,7 +65,7 @@ def test_successful_admin_registration(admin_registration_usecase, mock_user_rep
         email=TEST_ADMIN_EMAIL,
         password=TEST_ADMIN_PASSWORD,
         name=TEST_ADMIN_NAME
-    ))
+    ), requested_by=super_admin)
 
     # 検証
     assert result is not None
@@ -80,48 +75,33 @@ def test_successful_admin_registration(admin_registration_usecase, mock_user_rep
     assert result.role.role_type == RoleType.ADMIN
     assert result.is_active is True
 
-    # リポジトリのメソッドが正しく呼び出されたことを確認
-    assert mock_user_repository.find_by_email.call_count == 2
+    # 権限の確認にリポジトリを使わず、保存の1回だけであることを確認
+    mock_user_repository.find_by_email.assert_not_called()
     mock_user_repository.save.assert_called_once()
+    assert mock_user_repository.save.call_args.args[0].role.role_type == RoleType.ADMIN
 
-def test_registration_with_invalid_super_admin(admin_registration_usecase, mock_user_repository):
+@pytest.mark.parametrize('role_type', [RoleType.ADMIN, RoleType.USER])
+def test_registration_by_non_super_admin(admin_registration_usecase, mock_user_repository, role_type):
     """
-    異常系: 無効なスーパー管理者で管理者登録を試みるケース
+    異常系: スーパー管理者以外が管理者登録を試みるケース
     """
-    # モックの設定
-    mock_user_repository.find_by_email.return_value = None
-
     # 例外が発生することを確認
     with pytest.raises(UnauthorizedError):
         admin_registration_usecase.execute(AdminRegistrationRequest(
             email=TEST_ADMIN_EMAIL,
             password=TEST_ADMIN_PASSWORD,
             name=TEST_ADMIN_NAME
-        ))
+        ), requested_by=make_principal(role_type))
 
-    # リポジトリのメソッドが正しく呼び出されたことを確認
-    mock_user_repository.find_by_email.assert_called_once_with(Email(TEST_SUPER_ADMIN_EMAIL))
-    mock_user_repository.save.assert_not_called()
+    # リポジトリを一切使わないことを確認
+    assert mock_user_repository.mock_calls == []
 
-def test_registration_with_duplicate_email(admin_registration_usecase, mock_user_repository, super_admin_user):
+def test_registration_with_duplicate_email(admin_registration_usecase, mock_user_repository, super_admin):
     """
-    異常系: 既存のメールアドレスで管理者登録を試みるケース
+    異常系: 既存のメールアドレスで管理者登録を試みるケース（保存時の一意制約違反）
     """
     # モックの設定
-    existing_admin = User(
-        id="existing-admin-id",
-        _email=Email(TEST_ADMIN_EMAIL),
-        _password=Password.create(TEST_ADMIN_PASSWORD),
-        name=TEST_ADMIN_NAME,
-        role=Role(RoleType.ADMIN),
-        is_active=True,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
-    mock_user_repository.find_by_email.side_effect = [
-        super_admin_user,  # スーパー管理者の検索結果
-        existing_admin  # 新規管理者のメールアドレス検索結果
-    ]
+    mock_user_repository.save.side_effect = UserAlreadyExistsError("このメールアドレスは既に登録されています")
 
     # 例外が発生することを確認
     with pytest.raises(UserAlreadyExistsError):
@@ -129,8 +109,57 @@ def test_registration_with_duplicate_email(admin_registration_usecase, mock_user
             email=TEST_ADMIN_EMAIL,
             password=TEST_ADMIN_PASSWORD,
             name=TEST_ADMIN_NAME
-        ))
+        ), requested_by=super_admin)
 
     # リポジトリのメソッドが正しく呼び出されたことを確認
-    assert mock_user_repository.find_by_email.call_count == 2
-    mock_user_repository.save.assert_not_called() 
\ No newline at end of file
+    mock_user_repository.find_by_email.assert_not_called()
+    mock_user_repository.save.assert_called_once()
+
+def make_bulk_use_case(store):
+    """メモリ内のストアに保存する一括登録のユースケースを作成"""
+    unit_of_work = InMemoryUnitOfWork(store)
+    return AdminRegistrationUseCase(
+        user_repository=unit_of_work.users,
+        unit_of_work=unit_of_work,
+        password_hasher=InlinePasswordHasher(PasswordHashPolicy('pbkdf2', 1000))
+    )
+
+def bulk_requests(*emails):
+    """一括登録のリクエストを作成"""
+    return [
+        AdminRegistrationRequest(email=email, password=TEST_ADMIN_PASSWORD, name=f"Admin {i}")
+        for i, email in enumerate(emails)
+    ]
+
+def test_bulk_registration_in_one_transaction(super_admin):
+    """
+    正常系: 複数の管理者が1つのトランザクションで登録されるケース
+    """
+    store = InMemoryUserStore()
+
+    admins = make_bulk_use_case(store).execute_many(
+        bulk_requests("a@example.com", "b@example.com"), requested_by=super_admin
+    )
+
+    assert [str(admin.email) for admin in admins] == ["a@example.com", "b@example.com"]
+    repository = InMemoryUserRepository(store)
+    saved = repository.find_credentials_by_email(Email("b@example.com"))
+    assert saved.role.role_type == RoleType.ADMIN
+    assert saved.verify_password(TEST_ADMIN_PASSWORD)
+
+@pytest.mark.parametrize('emails, error', [
+    (("a@example.com", "A@example.com"), UserAlreadyExistsError),
+    (("a@example.com", "existing@example.com"), UserAlreadyExistsError),
+    (("a@example.com", "invalid-email"), ValidationError),
+])
+def test_bulk_registration_is_all_or_nothing(super_admin, emails, error):
+    """
+    異常系: 1件でも重複・不正があれば1件も登録されないケース
+    """
+    store = InMemoryUserStore()
+    make_bulk_use_case(store).execute_many(bulk_requests("existing@example.com"), requested_by=super_admin)
+
+    with pytest.raises(error):
+        make_bulk_use_case(store).execute_many(bulk_requests(*emails), requested_by=super_admin)
+
+    assert InMemoryUserRepository(store).find_existing_emails(["a@example.com"]) == set()
@@ -0,0 +1,80 @@
+"""
+ユーザー一括登録ユースケースのテストモジュール
+
+データベースの代わりにメモリ内のリポジトリを使う
+"""
+import pytest
+
+from app.application.usecases.bulk_user_import import BulkUserImportRecord, BulkUserImportUseCase
+from app.domain.services.password_hasher import InlinePasswordHasher, PasswordHashPolicy
+from app.domain.value_objects.email import Email
+from app.infrastructure.repositories.in_memory_user_repository import (
+    InMemoryUnitOfWork,
+    InMemoryUserRepository,
+    InMemoryUserStore
+)
+from conftest import TEST_PASSWORD_HASH
+
+# テストデータ
+TEST_PASSWORD = "Password123!"
+
+@pytest.fixture
+def store():
+    """ユーザーのストア"""
+    return InMemoryUserStore()
+
+def make_use_case(store, batch_size=None, rejected=None):
+    """一括登録ユースケースを作成"""
+    unit_of_work = InMemoryUnitOfWork(store, batch_size=batch_size)
+    use_case = BulkUserImportUseCase(
+        user_repository=unit_of_work.users,
+        unit_of_work=unit_of_work,
+        password_hasher=InlinePasswordHasher(PasswordHashPolicy('pbkdf2', 1000)),
+        chunk_size=2,
+        on_reject=rejected.append if rejected is not None else None
+    )
+    return use_case, unit_of_work
+
+def test_import_rejects_duplicates_ignoring_case(store):
+    """
+    正常系: 既存ユーザー・ファイル内と大文字小文字だけが異なるメールアドレスが除外されるケース
+    """
+    make_use_case(store)[0].execute([
+        BulkUserImportRecord(line=2, email="existing@example.com", name="E", password_hash=TEST_PASSWORD_HASH),
+    ])
+    rejected = []
+    use_case, _ = make_use_case(store, rejected=rejected)
+
+    result = use_case.execute([
+        BulkUserImportRecord(line=2, email="a@example.com", name="A", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=3, email="A@Example.com", name="A2", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=4, email="EXISTING@example.com", name="E2", password=TEST_PASSWORD),
+        BulkUserImportRecord(line=5, email="b@example.com", name="B", password_hash=TEST_PASSWORD_HASH),
+    ])
+
+    assert (result.processed, result.imported, result.rejected) == (4, 2, 2)
+    assert [r.line for r in rejected] == [3, 4]
+    repository = InMemoryUserRepository(store)
+    assert repository.find_credentials_by_email(Email("a@example.com")).verify_password(TEST_PASSWORD)
+    assert repository.find_by_email(Email("b@example.com")).name == "B"
+
+def test_import_failure_rolls_back_uncommitted_chunks(store):
+    """
+    異常系: 途中で失敗した場合、確定していないチャンクだけが取り消されるケース
+    """
+    use_case, unit_of_work = make_use_case(store, batch_size=2)
+
+    def records():
+        yield BulkUserImportRecord(line=2, email="a@example.com", name="A", password_hash=TEST_PASSWORD_HASH)
+        yield BulkUserImportRecord(line=3, email="b@example.com", name="B", password_hash=TEST_PASSWORD_HASH)
+        yield BulkUserImportRecord(line=4, email="c@example.com", name="C", password_hash=TEST_PASSWORD_HASH)
+        raise RuntimeError("読み込みに失敗しました")
+
+    with pytest.raises(RuntimeError):
+        use_case.execute(records())
+
+    repository = InMemoryUserRepository(store)
+    assert unit_of_work.commit_count == 1
+    assert repository.find_existing_emails(["a@example.com", "b@example.com", "c@example.com"]) == {
+        "a@example.com", "b@example.com"
+    }
@@ -28,7 +28,7 @@ def test_successful_logout(user_logout_usecase, mock_auth_service):
     user_logout_usecase.execute(request=LogoutRequest(token=test_token))
 
     # 認証サービスのメソッドが正しく呼び出されたことを確認
-    mock_auth_service.invalidate_token.assert_called_once_with(test_token)
+    mock_auth_service.invalidate_token.assert_called_once_with(test_token, claims=None)
 
 def test_logout_with_invalid_token(user_logout_usecase, mock_auth_service):
     """
@@ -46,4 +46,4 @@ def test_logout_with_invalid_token(user_logout_usecase, mock_auth_service):
     user_logout_usecase.execute(request=LogoutRequest(token=test_token))
 
     # 認証サービスのメソッドが正しく呼び出されたことを確認
-    mock_auth_service.invalidate_token.assert_called_once_with(test_token) 
\ No newline at end of file
+    mock_auth_service.invalidate_token.assert_called_once_with(test_token, claims=None) 
\ No newline at end of file
@@ -10,7 +10,7 @@ from app.domain.entities.user import User
 from app.domain.value_objects.email import Email
 from app.domain.value_objects.password import Password
 from app.domain.value_objects.role import Role, RoleType
-from app.domain.exceptions import UserAlreadyExistsError
+from app.domain.exceptions import UserAlreadyExistsError, ValidationError
 
 # テストデータ
 TEST_EMAIL = "test@example.com"
@@ -36,9 +36,6 @@ def test_successful_user_registration(user_registration_usecase, mock_user_repos
     """
     正常系: ユーザー登録が成功するケース
     """
-    # モックの設定
-    mock_user_repository.find_by_email.return_value = None
-    
     # 保存されるユーザーオブジェクトを作成
     expected_user = User(
         id="test-id",
@@ -69,29 +66,19 @@ def test_successful_user_registration(user_registration_usecase, mock_user_repos
     assert result.role == Role(RoleType.USER)
     assert result.is_active is True
 
-    # リポジトリのメソッドが正しく呼び出されたことを確認
-    mock_user_repository.find_by_email.assert_called_once_with(Email(TEST_EMAIL))
+    # 重複の事前確認は行わず、保存の1回だけであることを確認
+    mock_user_repository.find_by_email.assert_not_called()
     mock_user_repository.save.assert_called_once()
     
     # メールサービスが呼び出されたことを確認
     mock_email_service.send_confirmation_email.assert_called_once_with(result)
 
-def test_duplicate_email_registration(user_registration_usecase, mock_user_repository):
+def test_duplicate_email_registration(user_registration_usecase, mock_user_repository, mock_email_service):
     """
-    異常系: 既存のメールアドレスで登録を試みるケース
+    異常系: 既存のメールアドレスで登録を試みるケース（保存時の一意制約違反）
     """
     # モックの設定
-    existing_user = User(
-        id="existing-id",
-        _email=Email(TEST_EMAIL),
-        _password=Password.create(TEST_PASSWORD),
-        name=TEST_NAME,
-        role=Role(RoleType.USER),
-        is_active=True,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
-    mock_user_repository.find_by_email.return_value = existing_user
+    mock_user_repository.save.side_effect = UserAlreadyExistsError("このメールアドレスは既に登録されています")
 
     # 例外が発生することを確認
     with pytest.raises(UserAlreadyExistsError):
@@ -103,6 +90,23 @@ def test_duplicate_email_registration(user_registration_usecase, mock_user_repos
             )
         )
 
-    # リポジトリのメソッドが正しく呼び出されたことを確認
-    mock_user_repository.find_by_email.assert_called_once_with(Email(TEST_EMAIL))
-    mock_user_repository.save.assert_not_called() 
\ No newline at end of file
+    # 事前の検索は行わず、確認メールも送信しないことを確認
+    mock_user_repository.find_by_email.assert_not_called()
+    mock_email_service.send_confirmation_email.assert_not_called()
+
+def test_invalid_input_is_rejected_before_hashing(user_registration_usecase, mock_user_repository):
+    """
+    異常系: 入力が不正な場合、パスワードをハッシュ化せず保存もしないケース
+    """
+    with patch('app.domain.value_objects.password.get_password_hasher') as get_hasher:
+        with pytest.raises(ValidationError):
+            user_registration_usecase.execute(
+                UserRegistrationRequest(email="invalid-email", password=TEST_PASSWORD, name=TEST_NAME)
+            )
+        with pytest.raises(ValidationError):
+            user_registration_usecase.execute(
+                UserRegistrationRequest(email=TEST_EMAIL, password="weak", name=TEST_NAME)
+            )
+
+    get_hasher.assert_not_called()
+    mock_user_repository.save.assert_not_called()
@@ -20,6 +20,15 @@ class TestAuthToken:
         user_id = token.decode(secret_key)
         assert user_id == test_user.id
 
+    def test_token_has_unique_id(self, test_user, secret_key):
+        """トークンIDの付与テスト"""
+        token1 = AuthToken.create(test_user.id, secret_key)
+        token2 = AuthToken.create(test_user.id, secret_key)
+        token_id1 = token1.token_id(token1.decode_payload(secret_key))
+        token_id2 = token2.token_id(token2.decode_payload(secret_key))
+        assert token_id1 != token_id2
+        assert len(token_id1) == 32
+
     def test_decode_invalid_token(self, secret_key):
         """無効なトークンのデコードテスト"""
         invalid_token = AuthToken("invalid.token.string")
@@ -44,4 +44,14 @@ class TestEmail:
     def test_email_string_representation(self):
         """メールアドレスの文字列表現テスト"""
         email = Email("test@example.com")
-        assert str(email) == "test@example.com" 
\ No newline at end of file
+        assert str(email) == "test@example.com"
+
+    def test_email_normalization(self):
+        """大文字・小文字と前後の空白を区別しない正規化のテスト"""
+        email = Email("  Foo.Bar@Example.COM ")
+
+        assert email.value == "Foo.Bar@Example.COM"
+        assert str(email) == "Foo.Bar@Example.COM"
+        assert email.normalized == "foo.bar@example.com"
+        assert email == Email("foo.bar@example.com")
+        assert hash(email) == hash(Email("foo.bar@example.com"))
@@ -0,0 +1,63 @@
+"""
+IDの生成のテストモジュール
+"""
+import uuid
+
+from app.domain.services.id_generator import UUIDv7Generator, new_id
+
+
+class FrozenClock:
+    """テストで進める時計（ナノ秒）"""
+
+    def __init__(self, millis):
+        self.millis = millis
+
+    def __call__(self):
+        return self.millis * 1_000_000
+
+
+class TestUUIDv7Generator:
+    """UUIDv7の生成のテストクラス"""
+
+    def test_layout(self):
+        """先頭48ビットがミリ秒の時刻で、バージョン7・RFCのバリアントになるテスト"""
+        generator = UUIDv7Generator(clock=FrozenClock(1_700_000_000_123))
+
+        value = uuid.UUID(generator.new_id())
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert value.int >> 80 == 1_700_000_000_123
+
+    def test_ids_are_ordered_within_same_millisecond(self):
+        """同じミリ秒内でも、カウンターを使い切った後でも、生成順に大きくなるテスト"""
+        clock = FrozenClock(1_700_000_000_000)
+        generator = UUIDv7Generator(clock=clock)
+
+        ids = [generator.new_id() for _ in range(5000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        # 12ビットのカウンターを使い切ると次のミリ秒を先取りする
+        assert uuid.UUID(ids[-1]).int >> 80 > clock.millis
+
+    def test_clock_going_backwards_keeps_order(self):
+        """時計が戻っても直前のIDより大きいIDを生成するテスト"""
+        clock = FrozenClock(1_700_000_000_000)
+        generator = UUIDv7Generator(clock=clock)
+        first = generator.new_id()
+
+        clock.millis -= 1000
+        second = generator.new_id()
+        clock.millis += 2000
+        third = generator.new_id()
+
+        assert first < second < third
+
+    def test_default_generator(self):
+        """既定のIDの生成が36文字のUUIDv7文字列を返すテスト"""
+        first, second = new_id(), new_id()
+
+        assert len(first) == 36
+        assert uuid.UUID(first).version == 7
+        assert first < second
@@ -0,0 +1,67 @@
+import pytest
+from app.domain.services.password_hasher import (
+    InlinePasswordHasher,
+    PasswordHashPolicy,
+    get_password_hasher,
+    set_password_hasher
+)
+from app.domain.value_objects.password import Password
+
+
+@pytest.fixture
+def use_policy():
+    """Passwordが使用するハッシュ方針を一時的に差し替えるフィクスチャ"""
+    original = get_password_hasher()
+
+    def apply(policy):
+        set_password_hasher(InlinePasswordHasher(policy))
+
+    yield apply
+    set_password_hasher(original)
+
+
+class TestPasswordHashPolicy:
+    """パスワードハッシュ方針のテストクラス"""
+
+    def test_default_policy_matches_werkzeug_default(self):
+        """既定の方針がwerkzeugの既定値と一致するテスト"""
+        policy = PasswordHashPolicy()
+        assert policy.method == "scrypt:32768:8:1"
+        assert policy.needs_rehash(policy.hash("Password123!")) is False
+
+    @pytest.mark.parametrize("policy", [
+        PasswordHashPolicy('pbkdf2', 1000),
+        PasswordHashPolicy('scrypt', 10),
+        PasswordHashPolicy('bcrypt', 4),
+    ])
+    def test_hash_and_verify(self, policy):
+        """各アルゴリズムでのハッシュ化と検証のテスト"""
+        hashed = policy.hash("Password123!")
+        assert policy.verify(hashed, "Password123!") is True
+        assert policy.verify(hashed, "WrongPassword123!") is False
+        assert policy.needs_rehash(hashed) is False
+
+    def test_needs_rehash_when_cost_or_algorithm_changes(self):
+        """コストやアルゴリズムが変わった場合に再ハッシュが必要と判定されるテスト"""
+        hashed = PasswordHashPolicy('pbkdf2', 1000).hash("Password123!")
+        assert PasswordHashPolicy('pbkdf2', 2000).needs_rehash(hashed) is True
+        assert PasswordHashPolicy('bcrypt', 4).needs_rehash(hashed) is True
+
+        bcrypt_hashed = PasswordHashPolicy('bcrypt', 4).hash("Password123!")
+        assert PasswordHashPolicy('bcrypt', 5).needs_rehash(bcrypt_hashed) is True
+
+    def test_unknown_algorithm(self):
+        """未対応のアルゴリズムを指定した場合のテスト"""
+        with pytest.raises(ValueError):
+            PasswordHashPolicy('md5')
+
+    def test_password_follows_configured_policy(self, use_policy):
+        """Passwordが設定された方針に従うテスト"""
+        use_policy(PasswordHashPolicy('pbkdf2', 1000))
+        password = Password.create("Password123!")
+        assert password._hashed_password.startswith("pbkdf2:sha256:1000$")
+        assert password.needs_rehash() is False
+
+        use_policy(PasswordHashPolicy('bcrypt', 4))
+        assert password.needs_rehash() is True
+        assert password.verify("Password123!") is True
@@ -0,0 +1,30 @@
+import pytest
+from app.domain.value_objects.principal import Principal
+from app.domain.value_objects.role import RoleType
+
+
+class TestPrincipal:
+    """認証済み主体のテストクラス"""
+
+    def test_round_trip_through_claims(self, test_super_admin):
+        """ユーザーから生成したクレームで主体を復元するテスト"""
+        payload = dict(Principal.claims_for(test_super_admin), user_id=test_super_admin.id)
+        principal = Principal.from_claims(payload)
+
+        assert principal == Principal.from_user(test_super_admin)
+        assert principal.role.role_type == RoleType.SUPER_ADMIN
+        assert principal.is_super_admin() is True
+        assert principal.is_admin() is True
+
+    def test_has_claims(self, test_user):
+        """クレームの有無の判定テスト"""
+        assert Principal.has_claims(Principal.claims_for(test_user)) is True
+        assert Principal.has_claims({'user_id': test_user.id}) is False
+
+    def test_security_version_is_bumped(self, test_user):
+        """認証情報の変更でセキュリティバージョンが加算されるテスト"""
+        version = test_user.security_version
+        test_user.deactivate()
+
+        assert test_user.security_version == version + 1
+        assert Principal.from_user(test_user).is_active is False
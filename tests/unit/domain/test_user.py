@@ -74,6 +74,22 @@ class TestUser:
         assert user.verify_password("Password123!") is True
         assert user.verify_password("WrongPassword123!") is False
 
+    def test_verify_password_without_credentials(self):
+        """パスワードのハッシュを読み込んでいないユーザーのパスワード検証テスト"""
+        user = User(
+            id="test-id",
+            _email=Email("test@example.com"),
+            _password=None,
+            name="Test User",
+            role=Role(RoleType.USER),
+            is_active=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        assert user.has_credentials is False
+        with pytest.raises(ValueError):
+            user.verify_password("Password123!")
+
     def test_update_profile(self):
         """プロフィール更新テスト"""
         user = User(
@@ -0,0 +1,57 @@
+"""
+プロセスプールによるパスワードハッシュ化サービスのテストモジュール
+"""
+import time
+import pytest
+
+from app.infrastructure.services.password_hasher import ProcessPoolPasswordHasher
+from app.domain.exceptions import ServiceUnavailableError
+
+TEST_PASSWORD = "Password123!"
+
+
+@pytest.fixture
+def hasher():
+    """ワーカー1つのハッシュ化サービスのフィクスチャ"""
+    hasher = ProcessPoolPasswordHasher(max_workers=1, max_pending=1, timeout_seconds=10.0)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify_in_worker(hasher):
+    """
+    正常系: ワーカープロセスでハッシュ化と検証が行われるケース
+    """
+    hashed = hasher.hash(TEST_PASSWORD)
+
+    assert hashed != TEST_PASSWORD
+    assert hasher.verify(hashed, TEST_PASSWORD) is True
+    assert hasher.verify(hashed, "WrongPassword123!") is False
+
+
+def test_rejects_immediately_when_saturated(hasher):
+    """
+    異常系: 待ち行列が上限に達している場合は待たずに拒否されるケース
+    """
+    busy = hasher._submit(time.sleep, 1)
+
+    started = time.monotonic()
+    with pytest.raises(ServiceUnavailableError):
+        hasher.hash(TEST_PASSWORD)
+    assert time.monotonic() - started < 0.5
+
+    busy.result()
+    assert hasher.verify(hasher.hash(TEST_PASSWORD), TEST_PASSWORD) is True
+
+
+def test_times_out():
+    """
+    異常系: ワーカーの処理が制限時間内に終わらないケース
+    """
+    hasher = ProcessPoolPasswordHasher(max_workers=1, max_pending=2, timeout_seconds=0.2)
+    try:
+        hasher._submit(time.sleep, 1)
+        with pytest.raises(ServiceUnavailableError):
+            hasher.hash(TEST_PASSWORD)
+    finally:
+        hasher.shutdown()
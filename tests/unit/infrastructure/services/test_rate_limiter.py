@@ -0,0 +1,75 @@
+"""
+レートリミッターのテストモジュール
+"""
+import pytest
+
+from app.infrastructure.services.rate_limiter import (
+    InMemoryTokenBucketStore,
+    RateLimiter,
+    RateLimitRule,
+    SQLiteTokenBucketStore
+)
+
+RULE = RateLimitRule(capacity=3, refill_per_second=0.5)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    """各実装のトークンバケットのフィクスチャ"""
+    if request.param == 'memory':
+        return InMemoryTokenBucketStore(shards=4)
+    return SQLiteTokenBucketStore(str(tmp_path / 'rate_limit.db'))
+
+
+def test_bucket_rejects_after_capacity(store):
+    """
+    正常系: 容量分は許可され、超過した要求には再試行までの秒数が返るケース
+    """
+    assert [store.consume('key', RULE) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    wait = store.consume('key', RULE)
+    assert 0 < wait <= 2.0
+    assert store.consume('other-key', RULE) == 0.0
+
+
+def test_sqlite_buckets_are_shared(tmp_path):
+    """
+    正常系: 同じファイルを使う別インスタンス（別ワーカー）とカウンターを共有するケース
+    """
+    db_path = str(tmp_path / 'rate_limit.db')
+    first = SQLiteTokenBucketStore(db_path)
+    second = SQLiteTokenBucketStore(db_path)
+
+    for _ in range(3):
+        assert first.consume('key', RULE) == 0.0
+    assert second.consume('key', RULE) > 0
+
+
+def test_memory_store_evicts_oldest_keys():
+    """
+    正常系: シャードの上限を超えると古いキーから追い出されるケース
+    """
+    store = InMemoryTokenBucketStore(shards=1, max_keys_per_shard=2)
+    for _ in range(3):
+        store.consume('old', RULE)
+    store.consume('key-1', RULE)
+    store.consume('key-2', RULE)
+
+    # 追い出されたキーは満タンのバケットとして扱われる
+    assert store.consume('old', RULE) == 0.0
+
+
+def test_limiter_checks_ip_and_email_separately():
+    """
+    正常系: 同じメールアドレスへの要求はIPアドレスが異なっても制限されるケース
+    """
+    limiter = RateLimiter(
+        InMemoryTokenBucketStore(),
+        ip_rule=RateLimitRule(capacity=10, refill_per_second=1),
+        email_rule=RateLimitRule(capacity=2, refill_per_second=0.01)
+    )
+
+    assert limiter.check('login', '10.0.0.1', 'victim@example.com') == 0.0
+    assert limiter.check('login', '10.0.0.2', 'Victim@Example.com') == 0.0
+    assert limiter.check('login', '10.0.0.3', 'victim@example.com') > 0
+    assert limiter.check('login', '10.0.0.3', 'other@example.com') == 0.0
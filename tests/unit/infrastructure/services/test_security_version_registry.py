@@ -0,0 +1,58 @@
+"""
+セキュリティバージョンの記録のテスト
+"""
+from app.infrastructure.services.security_version_registry import SecurityVersionRegistry
+
+
+class FakeClock:
+    """進めることのできる時計（秒）"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_latest_returns_recorded_version_until_expired():
+    """
+    正常系: 記録したバージョンが max_age_seconds の間だけ返り、期限切れのエントリは削除されるケース
+    """
+    clock = FakeClock()
+    registry = SecurityVersionRegistry(max_age_seconds=60, clock=clock)
+    registry.record("user-1", 3)
+
+    assert registry.latest("user-1") == 3
+    clock.now += 61
+    assert registry.latest("user-1") is None
+    assert len(registry) == 0
+    assert registry.latest("missing") is None
+
+def test_size_stays_bounded():
+    """
+    正常系: 大量に記録しても max_entries を超えず、古い記録から捨てられるケース
+    """
+    registry = SecurityVersionRegistry(max_entries=100, clock=FakeClock())
+
+    for i in range(10_000):
+        registry.record(f"user-{i}", i)
+
+    assert len(registry) == 100
+    assert registry.latest("user-0") is None
+    assert registry.latest("user-9999") == 9999
+
+def test_record_purges_expired_entries():
+    """
+    正常系: 記録の際に期限切れのエントリが削除され、記録し直したエントリは残るケース
+    """
+    clock = FakeClock()
+    registry = SecurityVersionRegistry(max_age_seconds=60, clock=clock)
+    registry.record("stale", 1)
+    registry.record("renewed", 1)
+    clock.now += 30
+    registry.record("renewed", 2)
+
+    clock.now += 31
+    registry.record("fresh", 1)
+
+    assert len(registry) == 2
+    assert registry.latest("renewed") == 2
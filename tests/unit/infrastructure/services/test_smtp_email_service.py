@@ -0,0 +1,163 @@
+"""
+SMTPによるメールサービスのテストモジュール
+
+SMTPサーバーの代わりに送信内容を記録する接続を使う
+"""
+import smtplib
+import pytest
+from datetime import datetime
+
+from app.domain.entities.user import User
+from app.domain.value_objects.email import Email
+from app.domain.value_objects.role import Role, RoleType
+from app.infrastructure.services.smtp_email_service import (
+    EmailTemplates,
+    SMTPConnectionPool,
+    SMTPEmailService
+)
+
+
+class FakeSMTP:
+    """送信内容を記録する smtplib.SMTP の代わり"""
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.fail_on = {}
+        self.alive = True
+        self.closed = False
+
+    def send_message(self, message):
+        error = self.fail_on.get(message['To'])
+        if error is not None:
+            raise error
+        self.sent.append(message)
+
+    def noop(self):
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected("切断されました")
+        return 250, b"OK"
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections():
+    """作成された接続の一覧"""
+    return []
+
+@pytest.fixture
+def pool(connections):
+    """記録用の接続を作るプール"""
+    def factory(host, port, timeout=None):
+        connection = FakeSMTP(host, port, timeout)
+        connections.append(connection)
+        return connection
+    return SMTPConnectionPool("smtp.example.com", size=2, connection_factory=factory)
+
+@pytest.fixture
+def service(pool):
+    """バッチを2件ずつ送るメールサービス"""
+    service = SMTPEmailService(pool, sender_address="no-reply@example.com", batch_size=2)
+    yield service
+    service.shutdown()
+
+def make_user(index=0):
+    """テストユーザーを作成"""
+    return User(
+        id=f"user-{index}",
+        _email=Email(f"user{index}@example.com"),
+        _password=None,
+        name=f"User {index}",
+        role=Role(RoleType.USER),
+        is_active=True,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1)
+    )
+
+def test_send_reuses_connection(service, connections):
+    """
+    正常系: 確認メールが組み立てられ、送信ごとに同じ接続が再利用されるケース
+    """
+    service.send_confirmation_email(make_user(0))
+    service.send_confirmation_email(make_user(1))
+
+    assert len(connections) == 1
+    message = connections[0].sent[0]
+    assert (message['From'], message['To'], message['Subject']) == (
+        "no-reply@example.com", "user0@example.com", "アカウント登録確認"
+    )
+    body = message.get_content()
+    assert "User 0 様" in body
+    assert "http://example.com/activate/user-0" in body
+
+def test_send_many_batches_per_connection(service, connections):
+    """
+    正常系: まとめての送信がバッチごとに1つの接続で行われ、接続数がプールの上限を超えないケース
+    """
+    users = [make_user(i) for i in range(5)]
+
+    failures = service.send_confirmation_emails(users)
+
+    assert failures == {}
+    assert 1 <= len(connections) <= 2
+    sent = sorted(message['To'] for connection in connections for message in connection.sent)
+    assert sent == sorted(str(user.email) for user in users)
+
+def test_refused_recipient_keeps_connection(service, connections):
+    """
+    異常系: 宛先を拒否された場合、そのユーザーだけが失敗し接続は再利用されるケース
+    """
+    service.send_confirmation_email(make_user(9))
+    connections[0].fail_on["user0@example.com"] = smtplib.SMTPRecipientsRefused({})
+
+    failures = service.send_confirmation_emails([make_user(0), make_user(1)])
+
+    assert list(failures) == ["user-0"]
+    assert isinstance(failures["user-0"], smtplib.SMTPRecipientsRefused)
+    assert len(connections) == 1
+    assert [message['To'] for message in connections[0].sent] == ["user9@example.com", "user1@example.com"]
+
+def test_disconnect_fails_rest_of_batch_and_discards_connection(service, connections):
+    """
+    異常系: 送信中に切断された場合、バッチの未送信分が失敗となり、次の送信では新しい接続を開くケース
+    """
+    service.send_confirmation_email(make_user(9))
+    connections[0].fail_on["user1@example.com"] = smtplib.SMTPServerDisconnected("切断されました")
+
+    failures = service.send_confirmation_emails([make_user(0), make_user(1)])
+    service.send_confirmation_email(make_user(2))
+
+    assert list(failures) == ["user-1"]
+    assert connections[0].closed
+    assert len(connections) == 2
+    assert [message['To'] for message in connections[1].sent] == ["user2@example.com"]
+
+def test_idle_connection_is_checked_before_reuse(pool, connections):
+    """
+    異常系: 長く使われていない接続が切れていた場合、取り出す際に新しい接続に置き換えられるケース
+    """
+    pool.max_idle_seconds = 0
+    with pool.connection():
+        pass
+    connections[0].alive = False
+
+    with pool.connection() as connection:
+        assert connection is connections[1]
+    assert connections[0].closed
+    assert pool.opened == 2
+
+def test_templates_are_compiled_once(tmp_path):
+    """
+    正常系: ディレクトリのテンプレートが初期化時に読み込まれ、後から変更しても影響しないケース
+    """
+    (tmp_path / "confirmation_email.subject").write_text("Welcome {{ name }}")
+    templates = EmailTemplates(directory=str(tmp_path))
+    (tmp_path / "confirmation_email.subject").write_text("Changed")
+
+    assert templates.render("confirmation_email.subject", name="Taro") == "Welcome Taro"
+    with pytest.raises(LookupError):
+        templates.render("missing.txt")
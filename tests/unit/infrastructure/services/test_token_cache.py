@@ -0,0 +1,82 @@
+"""
+検証済みトークンキャッシュのテストモジュール
+"""
+import time
+
+from app.infrastructure.services.token_cache import VerifiedTokenCache
+
+
+def test_hit_and_miss_counters(test_user):
+    """
+    正常系: ヒット・ミスが計測されるケース
+    """
+    cache = VerifiedTokenCache()
+    assert cache.get('token') is None
+
+    cache.put('token', test_user, 'jti', time.time() + 60)
+    assert cache.get('token') == (test_user, 'jti')
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_ratio'] == 0.5
+
+
+def test_cached_user_is_not_shared_between_callers(test_user):
+    """
+    正常系: 取得したユーザーを変更しても、キャッシュや他の取得結果に影響しないケース
+    """
+    cache = VerifiedTokenCache()
+    cache.put('token', test_user, 'jti', time.time() + 60)
+    test_user.update_profile(name="Changed Before Hit")
+
+    first, _ = cache.get('token')
+    first.deactivate()
+    second, _ = cache.get('token')
+
+    assert first is not second
+    assert second.is_active is True
+    assert second.name != "Changed Before Hit"
+
+
+def test_entry_is_capped_at_token_expiration(test_user):
+    """
+    正常系: トークンのexpを過ぎたエントリはTTL内でもヒットしないケース
+    """
+    cache = VerifiedTokenCache(ttl_seconds=600)
+    cache.put('token', test_user, 'jti', time.time() - 1)
+
+    assert cache.get('token') is None
+
+
+def test_least_recently_used_entry_is_evicted(test_user, test_admin):
+    """
+    正常系: 上限件数を超えると最も使われていないエントリが追い出されるケース
+    """
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    cache.put('token-1', test_user, 'jti-1', exp)
+    cache.put('token-2', test_admin, 'jti-2', exp)
+    cache.get('token-1')
+    cache.put('token-3', test_user, 'jti-3', exp)
+
+    assert cache.get('token-2') is None
+    assert cache.get('token-1') is not None
+    assert cache.get('token-3') is not None
+
+
+def test_user_saved_invalidates_all_tokens_of_user(test_user, test_admin):
+    """
+    正常系: ユーザー保存時にそのユーザーのエントリだけが削除されるケース
+    """
+    cache = VerifiedTokenCache()
+    exp = time.time() + 60
+    cache.put('token-1', test_user, 'jti-1', exp)
+    cache.put('token-2', test_user, 'jti-2', exp)
+    cache.put('token-3', test_admin, 'jti-3', exp)
+
+    cache.on_user_saved(test_user)
+
+    assert cache.get('token-1') is None
+    assert cache.get('token-2') is None
+    assert cache.get('token-3') is not None
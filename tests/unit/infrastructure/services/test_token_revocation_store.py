@@ -0,0 +1,105 @@
+"""
+トークン失効ストアのテストモジュール
+"""
+import threading
+import time
+import pytest
+
+from app.domain.exceptions import ServiceUnavailableError
+from app.infrastructure.services.token_revocation_store import (
+    InMemoryTokenRevocationStore,
+    SQLiteTokenRevocationStore
+)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    """各実装の失効ストアのフィクスチャ"""
+    if request.param == 'memory':
+        return InMemoryTokenRevocationStore(max_entries=100)
+    return SQLiteTokenRevocationStore(str(tmp_path / 'revoked.db'))
+
+
+def test_revoke_and_lookup(store):
+    """
+    正常系: 失効登録したトークンIDが失効済みと判定されるケース
+    """
+    store.revoke('jti-1', time.time() + 60)
+
+    assert store.is_revoked('jti-1') is True
+    assert store.is_revoked('jti-2') is False
+
+
+def test_expired_entries_are_purged(store):
+    """
+    正常系: 有効期限を過ぎたエントリが削除されるケース
+    """
+    store.revoke('expired', time.time() - 1)
+    store.revoke('alive', time.time() + 60)
+
+    assert store.is_revoked('expired') is False
+    store.purge_expired()
+    assert store.is_revoked('alive') is True
+
+
+def test_memory_store_refuses_when_full_of_live_entries():
+    """
+    異常系: 有効期限内のエントリで上限に達した場合は登録を拒否し、既存の失効を取り消さないケース
+    """
+    store = InMemoryTokenRevocationStore(max_entries=3)
+    now = time.time()
+    for i in range(3):
+        store.revoke(f'jti-{i}', now + 60 + i)
+
+    with pytest.raises(ServiceUnavailableError):
+        store.revoke('jti-3', now + 60)
+    # 登録済みのトークンの再登録は件数が増えないため受け付ける
+    store.revoke('jti-0', now + 120)
+
+    assert len(store) == 3
+    assert all(store.is_revoked(f'jti-{i}') for i in range(3))
+    assert store.is_revoked('jti-3') is False
+
+
+def test_memory_store_makes_room_by_purging_expired():
+    """
+    正常系: 上限に達していても期限切れのエントリを削除して登録できるケース
+    """
+    store = InMemoryTokenRevocationStore(max_entries=2)
+    now = time.time()
+    store.revoke('expired', now - 1)
+    store.revoke('alive', now + 60)
+
+    store.revoke('new', now + 60)
+
+    assert len(store) == 2
+    assert store.is_revoked('alive') and store.is_revoked('new')
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    """
+    正常系: 同じファイルを使う別インスタンス（別ワーカー）と失効情報を共有するケース
+    """
+    db_path = str(tmp_path / 'revoked.db')
+    SQLiteTokenRevocationStore(db_path).revoke('shared', time.time() + 60)
+
+    assert SQLiteTokenRevocationStore(db_path).is_revoked('shared') is True
+
+
+def test_concurrent_revocations(store):
+    """
+    正常系: 複数スレッドから同時に失効登録しても取りこぼしがないケース
+    """
+    expires_at = time.time() + 60
+
+    def worker(offset):
+        for i in range(20):
+            store.revoke(f'jti-{offset}-{i}', expires_at)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(store.is_revoked(f'jti-{n}-{i}') for n in range(4) for i in range(20))
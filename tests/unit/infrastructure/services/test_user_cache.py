@@ -0,0 +1,82 @@
+"""
+ユーザーエンティティキャッシュのテスト
+"""
+from app.domain.value_objects.email import Email
+from app.infrastructure.services.user_cache import UserCacheStats, UserEntityCache
+from conftest import make_user as make_test_user
+
+def make_user(user_id="user-1", email="user@example.com"):
+    """テスト用のユーザーを作成"""
+    return make_test_user(user_id, email)
+
+def test_get_by_id_and_normalized_email_returns_copies():
+    """
+    正常系: IDと正規化したメールアドレスで取得でき、取得のたびに別のインスタンスが返るケース
+    """
+    cache = UserEntityCache()
+    user = make_user()
+    cache.put(user)
+
+    first = cache.get_by_id("user-1")
+    second = cache.get_by_email(" USER@example.com ")
+
+    assert first == user and second == user
+    assert first is not user and first is not second
+    first.name = "Changed"
+    assert cache.get_by_id("user-1").name == "Test User"
+
+def test_entries_expire_after_ttl(monkeypatch):
+    """
+    正常系: TTLを過ぎたエントリが返されないケース
+    """
+    now = [1000.0]
+    monkeypatch.setattr('app.infrastructure.services.user_cache.time.monotonic', lambda: now[0])
+    cache = UserEntityCache(ttl_seconds=5.0)
+    cache.put(make_user())
+
+    now[0] += 5.0
+
+    assert cache.get_by_id("user-1") is None
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    正常系: 上限を超えた場合に最も使われていないエントリが追い出されるケース
+    """
+    cache = UserEntityCache(max_entries=2)
+    cache.put(make_user("user-1", "one@example.com"))
+    cache.put(make_user("user-2", "two@example.com"))
+    cache.get_by_id("user-1")
+
+    cache.put(make_user("user-3", "three@example.com"))
+
+    assert cache.get_by_id("user-2") is None
+    assert cache.get_by_email("two@example.com") is None
+    assert cache.get_by_id("user-1") is not None
+
+def test_write_through_replaces_old_email_key():
+    """
+    正常系: 保存後のユーザーで置き換えると、古いメールアドレスでは引けなくなるケース
+    """
+    cache = UserEntityCache()
+    user = make_user()
+    cache.put(user)
+
+    user.update_profile(email=Email("new@example.com"))
+    cache.on_user_saved(user)
+
+    assert cache.get_by_email("user@example.com") is None
+    assert cache.get_by_email("new@example.com").email == Email("new@example.com")
+
+def test_stats_hit_ratios():
+    """
+    正常系: 識別子マップ・キャッシュのヒット率が集計されるケース
+    """
+    stats = UserCacheStats()
+    for kind in ('identity_map_hits', 'cache_hits', 'misses', 'misses'):
+        stats.record(kind)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot['identity_map_hit_ratio'] == 0.25
+    assert snapshot['hit_ratio'] == 0.5
@@ -0,0 +1,92 @@
+"""
+ユーザーファイルの読み込み・書き出しのテスト
+"""
+import io
+import json
+import pytest
+from datetime import datetime
+
+from app.domain.read_models.user_summary import UserSummary
+from app.domain.value_objects.role import RoleType
+from app.infrastructure.services.user_records import (
+    detect_format,
+    read_user_records,
+    write_user_records
+)
+
+def make_summary(index):
+    """テスト用のユーザー情報を作成"""
+    return UserSummary(
+        id=f"id-{index}",
+        email=f"user{index}@example.com",
+        name=f"User, {index}",
+        role=RoleType.USER,
+        is_active=True,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 2)
+    )
+
+def test_read_csv():
+    """
+    正常系: CSVの各行が行番号付きで読み込まれ、パスワード以外の空白が除去されるケース
+    """
+    stream = io.StringIO("email,name,password\n user@example.com , User , Pass word1! \n")
+
+    records = list(read_user_records(stream, 'csv'))
+
+    assert len(records) == 1
+    assert records[0].line == 2
+    assert records[0].email == "user@example.com"
+    assert records[0].name == "User"
+    assert records[0].password == " Pass word1! "
+    assert records[0].password_hash is None
+
+def test_read_ndjson_with_broken_lines():
+    """
+    異常系: 解析できない行がエラー付きで返され、空行は読み飛ばされるケース
+    """
+    stream = io.StringIO(
+        '{"email": "a@example.com", "name": "A", "password_hash": "scrypt:32768:8:1$s$h"}\n'
+        '\n'
+        '{broken\n'
+        '[1, 2]\n'
+    )
+
+    records = list(read_user_records(stream, 'ndjson'))
+
+    assert [record.line for record in records] == [1, 3, 4]
+    assert records[0].password_hash == "scrypt:32768:8:1$s$h"
+    assert records[1].error == "JSONとして解析できません"
+    assert records[2].error == "JSONオブジェクトではありません"
+
+def test_detect_format():
+    """
+    正常系/異常系: 拡張子からファイル形式が判定されるケース
+    """
+    assert detect_format("users.CSV") == 'csv'
+    assert detect_format("users.jsonl") == 'ndjson'
+    with pytest.raises(ValueError):
+        detect_format("users.xlsx")
+
+def test_write_ndjson_in_chunks():
+    """
+    正常系: 指定件数ごとにまとめてNDJSONが書き出されるケース
+    """
+    chunks = list(write_user_records((make_summary(i) for i in range(5)), 'ndjson', rows_per_chunk=2))
+
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [row['id'] for row in rows] == [f"id-{i}" for i in range(5)]
+    assert rows[0]['role'] == 'user'
+    assert rows[0]['created_at'] == '2024-01-01T00:00:00'
+
+def test_write_csv_quotes_values():
+    """
+    正常系: ヘッダー付きでCSVが書き出され、カンマを含む値が引用符で囲まれるケース
+    """
+    output = "".join(write_user_records([make_summary(1)], 'csv'))
+
+    assert output.splitlines() == [
+        "id,email,name,role,is_active,created_at,updated_at",
+        'id-1,user1@example.com,"User, 1",user,True,2024-01-01T00:00:00,2024-01-02T00:00:00'
+    ]